@@ -0,0 +1,230 @@
+import gc
+import getopt
+import json
+import math
+import random
+import sys
+import time
+from functools import partial
+from dictionary.word_frequency import WordFrequency
+from dictionary.array_dictionary import ArrayDictionary
+from dictionary.compact_array_dictionary import CompactArrayDictionary
+from dictionary.buffered_array_dictionary import BufferedArrayDictionary
+from dictionary.linkedlist_dictionary import LinkedListDictionary
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.topk_trie_dictionary import TopKTrieDictionary
+from dictionary.radix_trie_dictionary import RadixTrieDictionary
+from dictionary.dawg_dictionary import DawgDictionary
+from dictionary.skiplist_dictionary import SkipListDictionary
+from dictionary.concurrent_trie_dictionary import ConcurrentTrieDictionary
+from dictionary.double_array_trie_dictionary import DoubleArrayTrieDictionary
+from dictionary.loader import load_words_frequencies
+
+# -------------------------------------------------------------------
+# Benchmark suite: times build_dictionary, search, add_word_frequency,
+# delete_word and autocomplete separately, for every approach on data
+# files of increasing size, all in this one process.
+#
+# Each repetition builds a fresh dictionary (timing the build), then
+# times every call of each operation on its own: searches for words in
+# and not in the dictionary, autocompletes of 1 to 4 letter prefixes,
+# adds of new words, and deletes of those same words, which leaves the
+# dictionary as built. All approaches get the same calls. The first
+# repetitions are warmup and are not recorded.
+#
+# Prints, per operation, the median time against n with the slope of
+# log(time) against log(n) between the smallest and largest data file:
+# about 0 for constant or logarithmic operations, 1 for linear ones, so
+# an asymptotic regression shows as a jump in the slope. The full
+# figures (mean, min, max, p50, p90, p99 of every operation) can be
+# written as JSON.
+#
+# Run from the repository root:
+#   python3 -m benchmark.backend_benchmark [-a approach,...] [-d data fileName,...]
+#       [-r repetitions] [-w warmup repetitions] [-q calls per operation] [-j JSON fileName]
+# -------------------------------------------------------------------
+
+APPROACHES = {
+    'array': ArrayDictionary,
+    'compactarray': CompactArrayDictionary,
+    'linkedlist': LinkedListDictionary,
+    'trie': TrieDictionary,
+    'topktrie': TopKTrieDictionary,
+    'radixtrie': RadixTrieDictionary,
+    'dawg': DawgDictionary,
+    'skiplist': SkipListDictionary,
+    'concurrenttrie': ConcurrentTrieDictionary,
+    'doublearray': DoubleArrayTrieDictionary,
+    'bufferedarray': BufferedArrayDictionary,
+    # the same structures, with a hash index answering exact searches
+    'indexed-array': partial(ArrayDictionary, hash_index=True),
+    'indexed-linkedlist': partial(LinkedListDictionary, hash_index=True),
+    'indexed-trie': partial(TrieDictionary, hash_index=True),
+}
+
+DATA_FILES = ['data500.txt', 'data1k.txt', 'data5k.txt', 'data10k.txt', 'data50k.txt', 'data100k.txt',
+              'sampleData200k.txt']
+
+OPERATIONS = ['build', 'search', 'add', 'delete', 'autocomplete']
+
+
+def make_calls(words_frequencies: [WordFrequency], num_calls: int, seed: int = 0) -> dict:
+    """
+    arguments of the timed calls, the same for every approach
+    @return: dict of operation -> list of arguments
+    """
+    rng = random.Random(seed)
+    words = [word_freq.word for word_freq in words_frequencies]
+    known = set(words)
+    sampled = [rng.choice(words) for _ in range(num_calls)]
+
+    # Half the searches miss
+    searches = [word if index % 2 else word + 'qz' for index, word in enumerate(sampled)]
+    prefixes = [word[:rng.randint(1, 4)] for word in sampled]
+    new_words = []
+    for word in sampled:
+        while word in known:
+            word += rng.choice('qxz')
+        known.add(word)
+        new_words.append(word)
+
+    return {
+        'search': searches,
+        'autocomplete': prefixes,
+        'add': [WordFrequency(word, rng.randint(1, 100000)) for word in new_words],
+        'delete': new_words,
+    }
+
+
+def time_calls(function, arguments: list) -> [float]:
+    """
+    @return: the time of each call of function, in seconds
+    """
+    timer = time.perf_counter
+    times = []
+    for argument in arguments:
+        start = timer()
+        function(argument)
+        times.append(timer() - start)
+    return times
+
+
+def run(approach_class, words_frequencies: [WordFrequency], calls: dict, repetitions: int, warmup: int) -> dict:
+    """
+    time every operation of one approach on one data file
+    @return: dict of operation -> list of recorded times, in seconds
+    """
+    times = {operation: [] for operation in OPERATIONS}
+    for repetition in range(warmup + repetitions):
+        gc.collect()
+        agent = approach_class()
+        start = time.perf_counter()
+        agent.build_dictionary(list(words_frequencies))
+        build_time = time.perf_counter() - start
+
+        results = {
+            'build': [build_time],
+            'search': time_calls(agent.search, calls['search']),
+            'autocomplete': time_calls(agent.autocomplete, calls['autocomplete']),
+            'add': time_calls(agent.add_word_frequency, calls['add']),
+            'delete': time_calls(agent.delete_word, calls['delete']),
+        }
+        if repetition >= warmup:
+            for operation in OPERATIONS:
+                times[operation] += results[operation]
+    return times
+
+
+def summarise(times: [float]) -> dict:
+    """
+    count, mean, min, max and percentiles of a list of times
+    """
+    times = sorted(times)
+
+    def percentile(fraction: float) -> float:
+        return times[min(len(times) - 1, int(fraction * len(times)))]
+
+    return {
+        'count': len(times),
+        'mean': sum(times) / len(times),
+        'min': times[0],
+        'max': times[-1],
+        'p50': percentile(0.5),
+        'p90': percentile(0.9),
+        'p99': percentile(0.99),
+    }
+
+
+def print_scaling_table(results: [dict], sizes: [int]):
+    """
+    per operation, the median time of each approach against n, and its log-log slope
+    """
+    for operation in OPERATIONS:
+        unit, scale = ('ms', 1e3) if operation == 'build' else ('us', 1e6)
+        print()
+        print(f"{operation} (p50, {unit})")
+        print(f"{'n':<20}" + ''.join(f"{size:>10}" for size in sizes) + f"{'slope':>8}")
+
+        for approach in dict.fromkeys(result['approach'] for result in results):
+            medians = {result['n']: result['operations'][operation]['p50'] for result in results
+                       if result['approach'] == approach}
+            row = ''.join(f"{medians[size] * scale:>10.1f}" if size in medians else f"{'':>10}" for size in sizes)
+            measured = [size for size in sizes if size in medians]
+            slope = ''
+            if len(measured) > 1 and medians[measured[0]] > 0:
+                slope = f"{math.log(medians[measured[-1]] / medians[measured[0]]) / math.log(measured[-1] / measured[0]):.2f}"
+            print(f"{approach:<20}" + row + f"{slope:>8}")
+
+
+def usage():
+    print('python3 -m benchmark.backend_benchmark', '[-a approach,...] [-d data fileName,...] '
+          '[-r repetitions] [-w warmup repetitions] [-q calls per operation] [-j JSON fileName]')
+    print('<approach> = <' + ' | '.join(APPROACHES) + '>')
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    try:
+        options, arguments = getopt.gnu_getopt(sys.argv[1:], 'a:d:r:w:q:j:')
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+    options = dict(options)
+
+    approaches = options['-a'].split(',') if '-a' in options else list(APPROACHES)
+    data_filenames = options['-d'].split(',') if '-d' in options else DATA_FILES
+    repetitions = int(options.get('-r', 5))
+    warmup = int(options.get('-w', 1))
+    num_calls = int(options.get('-q', 200))
+    if arguments or any(approach not in APPROACHES for approach in approaches):
+        usage()
+
+    results = []
+    sizes = []
+    for data_filename in data_filenames:
+        words_frequencies = load_words_frequencies(data_filename)
+        sizes.append(len(words_frequencies))
+        calls = make_calls(words_frequencies, num_calls)
+        for approach in approaches:
+            times = run(APPROACHES[approach], words_frequencies, calls, repetitions, warmup)
+            results.append({
+                'approach': approach,
+                'data_file': data_filename,
+                'n': len(words_frequencies),
+                'operations': {operation: summarise(times[operation]) for operation in OPERATIONS},
+            })
+            print(f"{data_filename} {approach}: " +
+                  ', '.join(f"{operation} {results[-1]['operations'][operation]['p50'] * 1e6:.1f} us"
+                            for operation in OPERATIONS), file=sys.stderr)
+
+    print_scaling_table(results, sorted(set(sizes)))
+
+    if '-j' in options:
+        with open(options['-j'], 'w') as json_file:
+            json.dump({
+                'repetitions': repetitions,
+                'warmup': warmup,
+                'calls_per_operation': num_calls,
+                'unit': 'seconds',
+                'results': results,
+            }, json_file, indent=2)
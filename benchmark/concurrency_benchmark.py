@@ -0,0 +1,105 @@
+import random
+import sys
+import threading
+import time
+from dictionary.word_frequency import WordFrequency
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.concurrent_trie_dictionary import ConcurrentTrieDictionary
+from dictionary.loader import load_words_frequencies
+
+# -------------------------------------------------------------------
+# Throughput benchmark: reader threads run autocomplete and search on
+# prefixes taken from the data file while one writer thread adds and
+# deletes words, for an increasing number of readers. Compares the
+# copy-on-write concurrent trie, whose readers take no lock, with the
+# plain trie behind a single lock held by every operation.
+#
+# Run from the repository root:
+#   python3 -m benchmark.concurrency_benchmark [data fileName] [seconds]
+# -------------------------------------------------------------------
+
+READER_COUNTS = [1, 2, 4, 8]
+
+
+class LockedDictionary:
+    """
+    the simple alternative: every call to a plain trie holds one lock
+    """
+
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+        self.lock = threading.Lock()
+
+    def search(self, word: str) -> int:
+        with self.lock:
+            return self.dictionary.search(word)
+
+    def autocomplete(self, word: str, k: int = 3) -> [WordFrequency]:
+        with self.lock:
+            return self.dictionary.autocomplete(word, k)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        with self.lock:
+            return self.dictionary.add_word_frequency(word_frequency)
+
+    def delete_word(self, word: str) -> bool:
+        with self.lock:
+            return self.dictionary.delete_word(word)
+
+
+def run(agent, words: [str], num_readers: int, seconds: float) -> (float, float):
+    """
+    run the readers and the writer for a while
+    @return: reads per second (all readers together) and writes per second
+    """
+    stop = threading.Event()
+    reads = [0] * num_readers
+    writes = [0]
+
+    def reader(index: int):
+        rng = random.Random(index)
+        while not stop.is_set():
+            word = rng.choice(words)
+            agent.autocomplete(word[:rng.randint(1, 4)])
+            agent.search(word)
+            reads[index] += 2
+
+    def writer():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            word = rng.choice(words) + rng.choice('xyz')
+            if not agent.add_word_frequency(WordFrequency(word, rng.randint(1, 1000))):
+                agent.delete_word(word)
+            writes[0] += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(num_readers)]
+    threads.append(threading.Thread(target=writer))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(reads) / elapsed, writes[0] / elapsed
+
+
+if __name__ == '__main__':
+    data_filename = sys.argv[1] if len(sys.argv) > 1 else 'sampleData.txt'
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    words_frequencies = load_words_frequencies(data_filename)
+    words = [word_freq.word for word_freq in words_frequencies]
+
+    print(f"{data_filename}, {seconds:g} s per run, one writer thread")
+    print(f"{'readers':>8}{'locked reads/s':>18}{'writes/s':>12}{'cow reads/s':>18}{'writes/s':>12}")
+    for num_readers in READER_COUNTS:
+        locked = LockedDictionary(TrieDictionary())
+        locked.dictionary.build_dictionary(words_frequencies)
+        cow = ConcurrentTrieDictionary()
+        cow.build_dictionary(words_frequencies)
+
+        locked_reads, locked_writes = run(locked, words, num_readers, seconds)
+        cow_reads, cow_writes = run(cow, words, num_readers, seconds)
+        print(f"{num_readers:>8}{locked_reads:>18.0f}{locked_writes:>12.0f}{cow_reads:>18.0f}{cow_writes:>12.0f}")
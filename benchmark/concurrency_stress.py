@@ -0,0 +1,144 @@
+import random
+import sys
+import threading
+import time
+from dictionary.word_frequency import WordFrequency
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.concurrent_trie_dictionary import ConcurrentTrieDictionary
+from dictionary.loader import load_words_frequencies
+
+# -------------------------------------------------------------------
+# Multithreaded stress test for the concurrent trie: reader threads
+# autocomplete random prefixes while a writer thread adds and deletes
+# words. Every answer is checked against a brute-force scan of the same
+# version of the trie, and the final contents against a model of the
+# writes. The thread switch interval is made tiny so that readers are
+# interrupted in the middle of their walks as often as possible.
+#
+# Run from the repository root:
+#   python3 -m benchmark.concurrency_stress [seconds] [readers] [trie]
+# Passing 'trie' runs the same test on the plain, unsafe trie, where it
+# is expected to fail.
+# -------------------------------------------------------------------
+
+ALPHABET = 'abcde'
+
+
+def expected_autocomplete(root, prefix_word: str, k: int) -> [(str, int)]:
+    """
+    k most-frequent words with the prefix, by collecting the whole subtree and
+    sorting it stably, the way the original trie did
+    """
+    node = root
+    for letter in prefix_word:
+        if not node.children or letter not in node.children:
+            return []
+        node = node.children[letter]
+
+    words = []
+    stack = [(node, prefix_word)]
+    while stack:
+        node, word = stack.pop()
+        if node.is_last:
+            words.append((word, node.frequency))
+        if node.children:
+            for letter, child_node in reversed(list(node.children.items())):
+                stack.append((child_node, word + letter))
+    words.sort(key=lambda x: x[1], reverse=True)
+    return words[:k]
+
+
+def check_bounds(root) -> bool:
+    """
+    whether every node's max_frequency is the highest frequency in its subtree
+    """
+    def subtree_max(node) -> int:
+        best = node.frequency if node.is_last else 0
+        for child_node in (node.children or {}).values():
+            best = max(best, subtree_max(child_node))
+        if best != node.max_frequency:
+            raise AssertionError('bad bound')
+        return best
+
+    try:
+        subtree_max(root)
+    except AssertionError:
+        return False
+    return True
+
+
+def random_word(rng: random.Random) -> str:
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 6)))
+
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    num_readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    unsafe = len(sys.argv) > 3 and sys.argv[3] == 'trie'
+
+    agent = TrieDictionary() if unsafe else ConcurrentTrieDictionary()
+    initial = load_words_frequencies('sampleDataToy.txt')
+    rng = random.Random(0)
+    initial += [WordFrequency(random_word(rng), rng.randint(1, 100)) for _ in range(2000)]
+    agent.build_dictionary(initial)
+    model = {word_freq.word: word_freq.frequency for word_freq in agent._iter_words()}
+
+    stop = threading.Event()
+    failures = []
+    reads = [0] * num_readers
+    writes = [0]
+
+    def reader(index: int):
+        reader_rng = random.Random(index + 1)
+        while not stop.is_set():
+            prefix_word = random_word(reader_rng)[:reader_rng.randint(0, 3)]
+            k = reader_rng.choice((1, 3, 10))
+            try:
+                # The concurrent trie answers from one version; check against that version
+                view = agent if unsafe else agent.snapshot()
+                got = [(word_freq.word, word_freq.frequency) for word_freq in view.autocomplete(prefix_word, k)]
+                if not unsafe and got != expected_autocomplete(view.root, prefix_word, k):
+                    failures.append(f"autocomplete('{prefix_word}', {k}) = {got}")
+                elif any(not word.startswith(prefix_word) for word, _ in got) or \
+                        any(a[1] < b[1] for a, b in zip(got, got[1:])):
+                    failures.append(f"autocomplete('{prefix_word}', {k}) = {got}")
+            except Exception as e:
+                failures.append(f"autocomplete('{prefix_word}', {k}) raised {e!r}")
+            reads[index] += 1
+
+    def writer():
+        writer_rng = random.Random(0)
+        while not stop.is_set():
+            word = random_word(writer_rng)
+            if writer_rng.random() < 0.5:
+                frequency = writer_rng.randint(1, 100)
+                if agent.add_word_frequency(WordFrequency(word, frequency)) != (word not in model):
+                    failures.append(f"add '{word}' disagrees with the model")
+                model.setdefault(word, frequency)
+            else:
+                if agent.delete_word(word) != (word in model):
+                    failures.append(f"delete '{word}' disagrees with the model")
+                model.pop(word, None)
+            writes[0] += 1
+
+    sys.setswitchinterval(1e-6)
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(num_readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    final = {word_freq.word: word_freq.frequency for word_freq in agent._iter_words()}
+    if final != model:
+        failures.append('final contents differ from the model')
+    if not check_bounds(agent.root):
+        failures.append('subtree bounds are wrong')
+
+    print(f"{type(agent).__name__}: {sum(reads)} reads by {num_readers} threads, {writes[0]} writes, "
+          f"{len(failures)} failures")
+    for failure in failures[:10]:
+        print('  ' + failure)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,67 @@
+import random
+import sys
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.loader import load_words_frequencies
+from dictionary.snapshot import gc_paused
+from benchmark.backend_benchmark import summarise, time_calls
+
+# -------------------------------------------------------------------
+# Latency of typo-tolerant autocomplete: autocomplete_fuzzy() with 0, 1
+# and 2 edits allowed, on prefixes of 1 to 8 letters taken from the
+# words of the data file (popular words more often, as users type them)
+# with one random typo each: a letter replaced, dropped or doubled.
+# Exact autocomplete of the same prefixes is timed as the baseline.
+#
+# Prints the median, p99 and worst time per call for each prefix length,
+# which shows how far the walk spreads as more edits are allowed.
+# Garbage collection is paused while timing: a full collection scans the
+# whole trie, over a second at 200k words, whichever call it lands in.
+#
+# Run from the repository root:
+#   python3 -m benchmark.fuzzy_benchmark [data fileName] [calls per prefix length]
+# -------------------------------------------------------------------
+
+PREFIX_LENGTHS = [1, 2, 3, 4, 5, 6, 8]
+MAX_EDITS = [0, 1, 2]
+
+
+def mistype(word: str, rng: random.Random) -> str:
+    """
+    the word with one letter replaced, dropped or doubled
+    """
+    position = rng.randrange(len(word))
+    typo = rng.choice(('replace', 'drop', 'double'))
+    if typo == 'replace':
+        return word[:position] + rng.choice('abcdefghijklmnopqrstuvwxyz') + word[position + 1:]
+    if typo == 'drop' and len(word) > 1:
+        return word[:position] + word[position + 1:]
+    return word[:position + 1] + word[position:]
+
+
+if __name__ == '__main__':
+    data_filename = sys.argv[1] if len(sys.argv) > 1 else 'sampleData200k.txt'
+    num_calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    words_frequencies = load_words_frequencies(data_filename)
+    agent = TrieDictionary()
+    agent.build_dictionary(words_frequencies)
+
+    rng = random.Random(0)
+    words = [word_freq.word for word_freq in words_frequencies]
+    weights = [word_freq.frequency for word_freq in words_frequencies]
+
+    print(f"{data_filename}: {len(words)} words, {num_calls} calls per prefix length (us per call)")
+    print(f"{'length':>6}{'exact p50':>11}" +
+          ''.join(f"{f'{edits} edits p50':>14}{'p99':>9}{'max':>9}" for edits in MAX_EDITS))
+    for length in PREFIX_LENGTHS:
+        candidates = [word for word in rng.choices(words, weights, k=20 * num_calls) if len(word) >= length]
+        prefixes = [mistype(word[:length], rng) for word in candidates[:num_calls]]
+
+        with gc_paused():
+            exact = summarise(time_calls(agent.autocomplete, prefixes))
+            row = f"{length:>6}{exact['p50'] * 1e6:>11.0f}"
+            for edits in MAX_EDITS:
+                fuzzy = summarise(time_calls(lambda prefix_word: agent.autocomplete_fuzzy(prefix_word, edits),
+                                             prefixes))
+                row += f"{fuzzy['p50'] * 1e6:>14.0f}{fuzzy['p99'] * 1e6:>9.0f}{fuzzy['max'] * 1e6:>9.0f}"
+        print(row)
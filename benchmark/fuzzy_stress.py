@@ -0,0 +1,124 @@
+import random
+import sys
+from dictionary.word_frequency import WordFrequency
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.topk_trie_dictionary import TopKTrieDictionary
+from dictionary.concurrent_trie_dictionary import ConcurrentTrieDictionary
+
+# -------------------------------------------------------------------
+# Regression test for typo-tolerant autocomplete: autocomplete_fuzzy()
+# of the trie, and of the tries that inherit it, checked against a
+# brute-force reference that computes the edit distance between the typed
+# word and every prefix of every word. Random dictionaries over a small
+# alphabet, so that frequencies and distances tie often, are queried with
+# 0, 1 and 2 edits allowed, k from 0 to 10 and words from empty to longer
+# than any word, and changed by adds and deletes between queries. An
+# empty dictionary is checked too.
+#
+# Run from the repository root:
+#   python3 -m benchmark.fuzzy_stress [dictionaries] [queries per dictionary]
+# -------------------------------------------------------------------
+
+ALPHABET = 'abcd'
+
+DICTIONARIES = {
+    'trie': TrieDictionary,
+    'indexed-trie': lambda: TrieDictionary(hash_index=True),
+    'topktrie': TopKTrieDictionary,
+    'concurrenttrie': ConcurrentTrieDictionary,
+}
+
+
+def prefix_distance(word: str, other: str) -> int:
+    """
+    the fewest edits (letters inserted, deleted or replaced) that turn 'word' into a prefix of 'other'
+    """
+    # row[i]: edits between word[:i] and the prefix of 'other' so far
+    row = list(range(len(word) + 1))
+    best = row[-1]
+    for letter in other:
+        next_row = [row[0] + 1]
+        for i in range(1, len(word) + 1):
+            next_row.append(min(row[i] + 1, next_row[i - 1] + 1, row[i - 1] + (word[i - 1] != letter)))
+        row = next_row
+        best = min(best, row[-1])
+    return best
+
+
+def expected_fuzzy(agent, word: str, max_edits: int, k: int) -> [(str, int)]:
+    """
+    what autocomplete_fuzzy() must return: the closest words first, then the most
+    frequent, then in the depth-first order of the trie
+    """
+    candidates = []
+    for order, word_freq in enumerate(agent._iter_words()):
+        edits = prefix_distance(word, word_freq.word)
+        if edits <= max_edits:
+            candidates.append((edits, -word_freq.frequency, order, word_freq.word))
+    candidates.sort()
+    return [(other, -neg_frequency) for _, neg_frequency, _, other in candidates[:k]]
+
+
+def random_word(rng: random.Random, max_length: int = 6) -> str:
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, max_length)))
+
+
+def check(agent, word: str, max_edits: int, k: int) -> str:
+    """
+    @return: a description of the disagreement with the reference, None if there is none
+    """
+    expected = expected_fuzzy(agent, word, max_edits, k)
+    try:
+        got = [(word_freq.word, word_freq.frequency) for word_freq in agent.autocomplete_fuzzy(word, max_edits, k)]
+    except Exception as e:
+        return f"autocomplete_fuzzy('{word}', {max_edits}, {k}) raised {e!r}"
+    if got != expected:
+        return f"autocomplete_fuzzy('{word}', {max_edits}, {k}) = {got} instead of {expected}"
+    return None
+
+
+def run(name: str, num_dictionaries: int, num_queries: int) -> [str]:
+    """
+    query fresh random dictionaries of one kind, updating them between queries
+    @return: a description of each disagreement with the reference
+    """
+    failures = []
+    rng = random.Random(0)
+
+    # Nothing to find in an empty dictionary, whatever the query
+    agent = DICTIONARIES[name]()
+    agent.build_dictionary([])
+    for word in ('', 'a', 'abcd'):
+        for max_edits in (0, 1, 2):
+            failures.append(check(agent, word, max_edits, 3))
+
+    for _ in range(num_dictionaries):
+        agent = DICTIONARIES[name]()
+        agent.build_dictionary([WordFrequency(random_word(rng), rng.randint(1, 10))
+                                for _ in range(rng.randint(1, 60))])
+        for _ in range(num_queries):
+            # Empty words and k = 0 on purpose, now and then
+            word = '' if rng.random() < 0.05 else random_word(rng, 8)
+            k = rng.choice((0, 1, 3, 3, 10))
+            failures.append(check(agent, word, rng.choice((0, 1, 2)), k))
+
+            update = random_word(rng)
+            if rng.random() < 0.5:
+                agent.add_word_frequency(WordFrequency(update, rng.randint(1, 10)))
+            else:
+                agent.delete_word(update)
+    return [failure for failure in failures if failure is not None]
+
+
+if __name__ == '__main__':
+    num_dictionaries = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    total_failures = 0
+    for name in DICTIONARIES:
+        failures = run(name, num_dictionaries, num_queries)
+        total_failures += len(failures)
+        print(f"{name}: {num_dictionaries * num_queries} queries, {len(failures)} failures")
+        for failure in failures[:5]:
+            print('  ' + failure)
+    sys.exit(1 if total_failures else 0)
@@ -0,0 +1,61 @@
+import sys
+import timeit
+from dictionary.word_frequency import WordFrequency
+from dictionary.compact_array_dictionary import CompactArrayDictionary
+from dictionary.loader import iter_words_frequencies, load_columns, load_words_frequencies
+
+# -------------------------------------------------------------------
+# Loader benchmark: time to turn a data file into what the dictionaries
+# are built from, with the line-by-line loop dictionary_file_based.py used
+# to run against the chunked loader. Each figure is the best of several
+# runs, in milliseconds.
+#
+# Run from the repository root:
+#   python3 -m benchmark.loader_benchmark [data fileName] [repetitions]
+# -------------------------------------------------------------------
+
+
+def line_loop(data_filename: str) -> [WordFrequency]:
+    """
+    the original loading loop, one split() and int() per line
+    """
+    words_frequencies_from_file = []
+    data_file = open(data_filename, 'r')
+    for line in data_file:
+        values = line.split()
+        word = values[0]
+        frequency = int(values[1])
+        word_frequency = WordFrequency(word, frequency)
+        words_frequencies_from_file.append(word_frequency)
+    data_file.close()
+    return words_frequencies_from_file
+
+
+def build_from_list(data_filename: str):
+    agent = CompactArrayDictionary()
+    agent.build_dictionary(line_loop(data_filename))
+
+
+def build_from_columns(data_filename: str):
+    agent = CompactArrayDictionary()
+    agent.build_from_columns(*load_columns(data_filename))
+
+
+LOADERS = {
+    'line loop': line_loop,
+    'iter_words_frequencies': lambda data_filename: sum(1 for _ in iter_words_frequencies(data_filename)),
+    'load_words_frequencies': load_words_frequencies,
+    'load_columns': load_columns,
+    'compactarray, line loop': build_from_list,
+    'compactarray, columns': build_from_columns,
+}
+
+
+if __name__ == '__main__':
+    data_filename = sys.argv[1] if len(sys.argv) > 1 else 'sampleData200k.txt'
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"{data_filename}, best of {repetitions}")
+    for name, loader in LOADERS.items():
+        seconds = min(timeit.repeat(lambda: loader(data_filename), number=1, repeat=repetitions))
+        print(f"{name:<28}{seconds * 1000:>10.1f} ms")
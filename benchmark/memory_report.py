@@ -0,0 +1,71 @@
+import gc
+import sys
+import tracemalloc
+from functools import partial
+from dictionary.array_dictionary import ArrayDictionary
+from dictionary.compact_array_dictionary import CompactArrayDictionary
+from dictionary.buffered_array_dictionary import BufferedArrayDictionary
+from dictionary.linkedlist_dictionary import LinkedListDictionary
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.topk_trie_dictionary import TopKTrieDictionary
+from dictionary.radix_trie_dictionary import RadixTrieDictionary
+from dictionary.dawg_dictionary import DawgDictionary
+from dictionary.skiplist_dictionary import SkipListDictionary
+from dictionary.double_array_trie_dictionary import DoubleArrayTrieDictionary
+from dictionary.loader import load_words_frequencies
+
+# -------------------------------------------------------------------
+# Memory report: bytes held by each dictionary approach once built from
+# each data file. Measured with tracemalloc, so it counts every Python
+# allocation the structure keeps alive, including the WordFrequency
+# objects it was built from.
+#
+# Run from the repository root:
+#   python3 -m benchmark.memory_report [data fileName ...]
+# -------------------------------------------------------------------
+
+APPROACHES = {
+    'array': ArrayDictionary,
+    'compactarray': CompactArrayDictionary,
+    'linkedlist': LinkedListDictionary,
+    'trie': TrieDictionary,
+    'topktrie': TopKTrieDictionary,
+    'radixtrie': RadixTrieDictionary,
+    'dawg': DawgDictionary,
+    'skiplist': SkipListDictionary,
+    'doublearray': DoubleArrayTrieDictionary,
+    'bufferedarray': BufferedArrayDictionary,
+    # the same structures, with a hash index answering exact searches
+    'indexed-array': partial(ArrayDictionary, hash_index=True),
+    'indexed-linkedlist': partial(LinkedListDictionary, hash_index=True),
+    'indexed-trie': partial(TrieDictionary, hash_index=True),
+}
+
+DATA_FILES = ['sampleDataToy.txt', 'data500.txt', 'data1k.txt', 'data5k.txt', 'data10k.txt',
+              'sampleData.txt', 'data50k.txt', 'data100k.txt', 'sampleData200k.txt']
+
+
+def measure(approach_class, data_filename: str) -> int:
+    """
+    build one dictionary and return the number of bytes it keeps allocated
+    """
+    gc.collect()
+    tracemalloc.start()
+    words_frequencies = load_words_frequencies(data_filename)
+    agent = approach_class()
+    agent.build_dictionary(words_frequencies)
+    del words_frequencies
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del agent
+    return size
+
+
+if __name__ == '__main__':
+    data_filenames = sys.argv[1:] or DATA_FILES
+
+    print(f"{'data file':<20}" + ''.join(f"{name:>20}" for name in APPROACHES))
+    for data_filename in data_filenames:
+        sizes = [measure(approach_class, data_filename) for approach_class in APPROACHES.values()]
+        print(f"{data_filename:<20}" + ''.join(f"{size / 1024:>17.0f} KB" for size in sizes))
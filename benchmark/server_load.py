@@ -0,0 +1,114 @@
+import random
+import socket
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+from dictionary.loader import load_words_frequencies
+
+# -------------------------------------------------------------------
+# Load generator for dictionary_server.py. Client processes connect to
+# the server's socket and keep a window of pipelined commands in flight
+# for a while; every response is timed from the moment its command was
+# sent. Reports throughput and latency percentiles over all clients.
+#
+# The commands are either the lines of a command file (.in), replayed in
+# a loop, or generated from the words of a data file: mostly S and AC
+# (on prefixes of 1 to 4 letters), with some A and D.
+#
+# Start a server, then run from the repository root:
+#   python3 dictionary_server.py trie sampleData200k.txt /tmp/dictionary.sock 4
+#   python3 -m benchmark.server_load /tmp/dictionary.sock [data or command fileName] [clients] [seconds] [depth]
+# -------------------------------------------------------------------
+
+# share of each generated command
+COMMAND_MIX = [('S', 0.45), ('AC', 0.45), ('A', 0.05), ('D', 0.05)]
+
+
+def generate_commands(words: [str], count: int, seed: int) -> [str]:
+    """
+    random command lines over the given words
+    """
+    rng = random.Random(seed)
+    commands = []
+    for command in rng.choices([c for c, _ in COMMAND_MIX], [w for _, w in COMMAND_MIX], k=count):
+        word = rng.choice(words)
+        if command == 'S':
+            commands.append(f"S {word}\n")
+        elif command == 'AC':
+            commands.append(f"AC {word[:rng.randint(1, 4)]}\n")
+        elif command == 'A':
+            commands.append(f"A {word}{rng.choice('xyz')} {rng.randint(1, 100000)}\n")
+        else:
+            commands.append(f"D {word}{rng.choice('xyz')}\n")
+    return commands
+
+
+def run_client(socket_path: str, commands: [str], seconds: float, depth: int) -> [float]:
+    """
+    send commands, keeping depth of them unanswered, until time is up
+    @return: latency of every answered command, in seconds
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    commands = [command.encode() for command in commands]
+    sent_times = deque()
+    latencies = []
+    position = 0
+    received = b''
+    deadline = time.perf_counter() + seconds
+
+    while True:
+        now = time.perf_counter()
+        if now < deadline and len(sent_times) < depth:
+            # Top the window up in one write
+            batch = []
+            while len(sent_times) < depth:
+                batch.append(commands[position])
+                position = (position + 1) % len(commands)
+                sent_times.append(now)
+            client.sendall(b''.join(batch))
+        elif not sent_times:
+            break
+
+        received += client.recv(1 << 16)
+        now = time.perf_counter()
+        end = received.rfind(b'\n') + 1
+        for _ in range(received.count(b'\n', 0, end)):
+            latencies.append(now - sent_times.popleft())
+        received = received[end:]
+
+    client.close()
+    return latencies
+
+
+def percentile(sorted_values: [float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('python3 -m benchmark.server_load', '<socket path> [data or command fileName] [clients] [seconds] [depth]')
+        sys.exit(1)
+    socket_path = sys.argv[1]
+    filename = sys.argv[2] if len(sys.argv) > 2 else 'sampleData.txt'
+    num_clients = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    seconds = float(sys.argv[4]) if len(sys.argv) > 4 else 5.0
+    depth = int(sys.argv[5]) if len(sys.argv) > 5 else 32
+
+    if filename.endswith('.in'):
+        with open(filename, 'r') as command_file:
+            client_commands = [[line for line in command_file if line.strip()]] * num_clients
+    else:
+        words = [word_freq.word for word_freq in load_words_frequencies(filename)]
+        client_commands = [generate_commands(words, 100000, seed) for seed in range(num_clients)]
+
+    start = time.perf_counter()
+    with Pool(num_clients) as pool:
+        results = pool.starmap(run_client, [(socket_path, commands, seconds, depth) for commands in client_commands])
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for client_latencies in results for latency in client_latencies)
+    print(f"{filename}: {num_clients} clients, {depth} commands in flight each, {elapsed:.1f} s")
+    print(f"{len(latencies)} commands, {len(latencies) / elapsed:.0f} QPS, "
+          f"p50 {percentile(latencies, 0.5) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
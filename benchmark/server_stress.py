@@ -0,0 +1,145 @@
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.loader import load_words_frequencies
+from dictionary_server import AUTOCOMPLETE_K, format_response
+
+# -------------------------------------------------------------------
+# Disconnect test for dictionary_server.py: clients that go away while
+# the server still has responses for them. One sends more commands than
+# the socket can hold the responses of, reads nothing, and closes while
+# the rest wait in the server, so that the server finds it readable and
+# writable at once. The other closes with its responses unread, which
+# makes the server's next read fail with a connection reset. A third
+# sends lines that are not UTF-8, or have a frequency in digits int()
+# does not take, which must be answered as unknown commands. The server
+# must drop the clients that went away and keep serving: after each round
+# a well-behaved client checks its answers against a trie built from the
+# same data file.
+#
+# Run from the repository root:
+#   python3 -m benchmark.server_stress [data fileName] [rounds]
+# -------------------------------------------------------------------
+
+# seconds to wait for the server to start listening
+START_TIMEOUT = 60
+
+# seconds a client waits for the server to answer before it closes
+SETTLE_TIME = 0.5
+
+# command lines no dictionary_file_based.py command can be made of, and their answers
+INVALID_COMMANDS = [b'S \xff\n', b'AC ab\xe2\x82\n', 'A word \u00b2\n'.encode()]
+INVALID_RESPONSES = ["Unknown command 'S \ufffd'\n", "Unknown command 'AC ab\ufffd'\n",
+                     "Unknown command 'A word \u00b2'\n"]
+
+
+def close_with_output_pending(socket_path: str, commands: [bytes], repeat: int):
+    """
+    send the commands repeat times without reading, so that part of the responses
+    is left waiting in the server, then close
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    client.sendall(b''.join(commands) * repeat)
+    time.sleep(SETTLE_TIME)
+    client.close()
+
+
+def close_unread(socket_path: str, commands: [bytes]):
+    """
+    send the commands and close once their responses have arrived, without reading them
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    client.sendall(b''.join(commands))
+    time.sleep(SETTLE_TIME)
+    client.close()
+
+
+def check_client(socket_path: str, commands: [bytes], expected: bytes) -> bool:
+    """
+    send commands and read their responses in full
+    @return: whether they are the expected ones
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    client.settimeout(10)
+    client.sendall(b''.join(commands))
+    received = b''
+    try:
+        while len(received) < len(expected):
+            data = client.recv(1 << 16)
+            if not data:
+                break
+            received += data
+    except socket.timeout:
+        pass
+    client.close()
+    return received == expected
+
+
+if __name__ == '__main__':
+    data_filename = sys.argv[1] if len(sys.argv) > 1 else 'sampleData.txt'
+    num_rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    words_frequencies = load_words_frequencies(data_filename)
+    reference = TrieDictionary()
+    reference.build_dictionary(words_frequencies)
+
+    # Queries only, so that every round expects the same answers
+    rng = random.Random(0)
+    words = [word_freq.word for word_freq in words_frequencies]
+    commands = []
+    expected = []
+    for _ in range(200):
+        word = rng.choice(words)
+        if rng.random() < 0.5:
+            commands.append(f"S {word}\n".encode())
+            expected.append(format_response(('S', word), reference.search(word)))
+        else:
+            prefix_word = word[:rng.randint(1, 3)]
+            completions = [(wf.word, wf.frequency) for wf in reference.autocomplete(prefix_word, AUTOCOMPLETE_K)]
+            commands.append(f"AC {prefix_word}\n".encode())
+            expected.append(format_response(('AC', prefix_word), completions))
+    expected = ''.join(expected).encode()
+
+    socket_path = os.path.join(tempfile.mkdtemp(), 'dictionary.sock')
+    server = subprocess.Popen([sys.executable, 'dictionary_server.py', 'trie', data_filename, socket_path, '2'],
+                              stdout=subprocess.DEVNULL)
+    failures = 0
+    try:
+        deadline = time.monotonic() + START_TIMEOUT
+        while not os.path.exists(socket_path):
+            if server.poll() is not None or time.monotonic() > deadline:
+                print('FAILED: the server did not start')
+                sys.exit(1)
+            time.sleep(0.1)
+
+        invalid_expected = ''.join(INVALID_RESPONSES).encode() + expected
+        for round_number in range(num_rounds):
+            if round_number % 3 == 0:
+                close_with_output_pending(socket_path, commands, 50)
+            elif round_number % 3 == 1:
+                close_unread(socket_path, commands)
+            elif not check_client(socket_path, INVALID_COMMANDS + commands, invalid_expected):
+                failures += 1
+                print(f"FAILED: wrong answers to invalid commands in round {round_number}")
+            time.sleep(SETTLE_TIME)
+            if server.poll() is not None:
+                print(f"FAILED: the server exited in round {round_number}")
+                sys.exit(1)
+            if not check_client(socket_path, commands, expected):
+                failures += 1
+                print(f"FAILED: wrong answers after round {round_number}")
+    finally:
+        if server.poll() is None:
+            server.terminate()
+        server.wait()
+
+    print(f"{num_rounds} rounds, {failures} failed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,91 @@
+import random
+import sys
+from dictionary.word_frequency import WordFrequency
+from dictionary.array_dictionary import ArrayDictionary
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.topk_trie_dictionary import TopKTrieDictionary
+from dictionary.concurrent_trie_dictionary import ConcurrentTrieDictionary
+from dictionary.loader import load_words_frequencies
+
+# -------------------------------------------------------------------
+# Regression test for the type-ahead sessions of the array and trie
+# dictionaries. Two sessions per dictionary type letters, backspace, and
+# autocomplete, while words are added and deleted in between, mostly
+# words under one of the typed prefixes so that the kept ranges and nodes
+# are the ones that go stale. After every step, each session must answer
+# exactly what autocomplete() gives for its prefix.
+#
+# Run from the repository root:
+#   python3 -m benchmark.session_stress [steps] [seed]
+# -------------------------------------------------------------------
+
+ALPHABET = 'abcde'
+
+DICTIONARIES = {
+    'array': ArrayDictionary,
+    'indexed-array': lambda: ArrayDictionary(hash_index=True),
+    'trie': TrieDictionary,
+    'indexed-trie': lambda: TrieDictionary(hash_index=True),
+    'topktrie': TopKTrieDictionary,
+    'concurrenttrie': ConcurrentTrieDictionary,
+}
+
+
+def random_word(rng: random.Random, prefix_word: str = '') -> str:
+    return prefix_word + ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0 if prefix_word else 1, 4)))
+
+
+def run(name: str, initial: [WordFrequency], steps: int, seed: int) -> [str]:
+    """
+    drive two sessions of a fresh dictionary through random steps
+    @return: a description of each disagreement with autocomplete()
+    """
+    agent = DICTIONARIES[name]()
+    agent.build_dictionary(initial)
+    sessions = [agent.session(), agent.session()]
+    rng = random.Random(seed)
+    failures = []
+
+    for step in range(steps):
+        session = rng.choice(sessions)
+        action = rng.random()
+        if action < 0.35:
+            session.append(''.join(rng.choice(ALPHABET) for _ in range(rng.choice((1, 1, 2)))))
+        elif action < 0.55:
+            session.backspace(rng.choice((1, 1, 2, 3, len(session.prefix))))
+        elif action < 0.8:
+            agent.add_word_frequency(WordFrequency(random_word(rng, session.prefix), rng.randint(1, 50)))
+        else:
+            agent.delete_word(random_word(rng, session.prefix))
+
+        for index, checked in enumerate(sessions):
+            k = rng.choice((1, 3, 10))
+            expected = [(word_freq.word, word_freq.frequency) for word_freq in agent.autocomplete(checked.prefix, k)]
+            try:
+                got = [(word_freq.word, word_freq.frequency) for word_freq in checked.autocomplete(k)]
+            except Exception as e:
+                failures.append(f"step {step}, session {index}, prefix '{checked.prefix}', k {k}: raised {e!r}")
+                continue
+            if got != expected:
+                failures.append(f"step {step}, session {index}, prefix '{checked.prefix}', k {k}: "
+                                f"{got} instead of {expected}")
+    return failures
+
+
+if __name__ == '__main__':
+    num_steps = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    # A small alphabet, so that words share prefixes and frequencies tie often
+    initial = load_words_frequencies('sampleDataToy.txt')
+    rng = random.Random(seed)
+    initial += [WordFrequency(random_word(rng), rng.randint(1, 50)) for _ in range(500)]
+
+    total_failures = 0
+    for name in DICTIONARIES:
+        failures = run(name, initial, num_steps, seed)
+        total_failures += len(failures)
+        print(f"{name}: {num_steps} steps, {len(failures)} failures")
+        for failure in failures[:5]:
+            print('  ' + failure)
+    sys.exit(1 if total_failures else 0)
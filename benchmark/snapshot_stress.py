@@ -0,0 +1,154 @@
+import os
+import random
+import sys
+import tempfile
+from dictionary.word_frequency import WordFrequency
+from dictionary.array_dictionary import ArrayDictionary
+from dictionary.compact_array_dictionary import CompactArrayDictionary
+from dictionary.buffered_array_dictionary import BufferedArrayDictionary
+from dictionary.linkedlist_dictionary import LinkedListDictionary
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.topk_trie_dictionary import TopKTrieDictionary
+from dictionary.radix_trie_dictionary import RadixTrieDictionary
+from dictionary.dawg_dictionary import DawgDictionary
+from dictionary.skiplist_dictionary import SkipListDictionary
+from dictionary.concurrent_trie_dictionary import ConcurrentTrieDictionary
+
+# -------------------------------------------------------------------
+# Round-trip test for save() and load() of every backend that has them.
+# Random dictionaries, with non-ASCII words and frequencies from one to
+# several varint bytes long, are changed by adds and deletes, saved,
+# and loaded into a fresh dictionary of the same kind. That dictionary
+# must hold exactly the words and frequencies of a model of the changes,
+# which it is checked against through search, autocomplete and a second
+# save. An empty dictionary must round-trip too, and a negative frequency,
+# which snapshots cannot hold, must either round-trip or fail with a
+# ValueError that leaves the file untouched.
+#
+# Run from the repository root:
+#   python3 -m benchmark.snapshot_stress [dictionaries per backend]
+# -------------------------------------------------------------------
+
+ALPHABET = 'abcé'
+
+DICTIONARIES = {
+    'array': ArrayDictionary,
+    'indexed-array': lambda: ArrayDictionary(hash_index=True),
+    'compactarray': CompactArrayDictionary,
+    'bufferedarray': BufferedArrayDictionary,
+    'linkedlist': LinkedListDictionary,
+    'indexed-linkedlist': lambda: LinkedListDictionary(hash_index=True),
+    'trie': TrieDictionary,
+    'indexed-trie': lambda: TrieDictionary(hash_index=True),
+    'topktrie': TopKTrieDictionary,
+    'concurrenttrie': ConcurrentTrieDictionary,
+    'radixtrie': RadixTrieDictionary,
+    'skiplist': SkipListDictionary,
+    'dawg': DawgDictionary,
+}
+
+
+def random_word(rng: random.Random) -> str:
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 5)))
+
+
+def random_frequency(rng: random.Random) -> int:
+    return rng.randint(1, rng.choice((100, 1 << 14, 1 << 40)))
+
+
+def round_trip(name: str, agent, path: str):
+    """
+    save a dictionary and load the file into a fresh dictionary of the same kind
+    @return: the fresh dictionary
+    """
+    agent.save(path)
+    loaded = DICTIONARIES[name]()
+    loaded.load(path)
+    return loaded
+
+
+def check(loaded, model: dict) -> [str]:
+    """
+    compare a loaded dictionary with the words and frequencies it should hold
+    @return: a description of each disagreement
+    """
+    failures = []
+    for word, frequency in model.items():
+        if loaded.search(word) != frequency:
+            failures.append(f"search('{word}') = {loaded.search(word)} instead of {frequency}")
+    for word in ('d', 'abcéa', 'éééééé'):
+        if word not in model and loaded.search(word) != 0:
+            failures.append(f"search('{word}') found a word that is not there")
+
+    # Ties may come back in another order, so answers are checked against the model
+    for prefix_word in [''] + list(ALPHABET) + [a + b for a in ALPHABET for b in ALPHABET]:
+        got = [(word_freq.word, word_freq.frequency) for word_freq in loaded.autocomplete(prefix_word, 5)]
+        best = sorted((frequency for word, frequency in model.items() if word.startswith(prefix_word)),
+                      reverse=True)[:5]
+        if [frequency for _, frequency in got] != best or \
+                any(not word.startswith(prefix_word) or model.get(word) != frequency for word, frequency in got):
+            failures.append(f"autocomplete('{prefix_word}') = {got}, best frequencies {best}")
+    return failures
+
+
+def run(name: str, num_dictionaries: int, directory: str) -> [str]:
+    """
+    round-trip random dictionaries of one kind
+    @return: a description of each failure
+    """
+    failures = []
+    rng = random.Random(0)
+    path = os.path.join(directory, name + '.snapshot')
+
+    # An empty dictionary
+    agent = DICTIONARIES[name]()
+    agent.build_dictionary([])
+    failures += check(round_trip(name, agent, path), {})
+
+    for _ in range(num_dictionaries):
+        model = {random_word(rng): random_frequency(rng) for _ in range(rng.randint(1, 80))}
+        agent = DICTIONARIES[name]()
+        agent.build_dictionary([WordFrequency(word, frequency) for word, frequency in model.items()])
+        for _ in range(rng.randint(0, 40)):
+            word = random_word(rng)
+            if rng.random() < 0.5:
+                frequency = random_frequency(rng)
+                agent.add_word_frequency(WordFrequency(word, frequency))
+                model.setdefault(word, frequency)
+            else:
+                agent.delete_word(word)
+                model.pop(word, None)
+
+        loaded = round_trip(name, agent, path)
+        failures += check(loaded, model)
+        # Saving what was loaded gives the same words back again
+        failures += check(round_trip(name, loaded, path), model)
+
+    # A negative frequency either round-trips or is refused before the file is touched
+    agent = DICTIONARIES[name]()
+    agent.build_dictionary([WordFrequency('a', 3), WordFrequency('b', -2)])
+    with open(path, 'wb') as snapshot_file:
+        snapshot_file.write(b'previous')
+    try:
+        loaded = round_trip(name, agent, path)
+        if (loaded.search('a'), loaded.search('b')) != (3, -2):
+            failures.append('a negative frequency did not round-trip')
+    except ValueError:
+        with open(path, 'rb') as snapshot_file:
+            if snapshot_file.read() != b'previous':
+                failures.append('a refused save changed the file')
+    return failures
+
+
+if __name__ == '__main__':
+    num_dictionaries = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    total_failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for name in DICTIONARIES:
+            failures = run(name, num_dictionaries, directory)
+            total_failures += len(failures)
+            print(f"{name}: {num_dictionaries} dictionaries, {len(failures)} failures")
+            for failure in failures[:5]:
+                print('  ' + failure)
+    sys.exit(1 if total_failures else 0)
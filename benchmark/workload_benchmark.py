@@ -0,0 +1,89 @@
+import getopt
+import io
+import sys
+import time
+from dictionary.loader import load_words_frequencies
+from dictionary.snapshot import gc_paused
+from dictionary_file_based import make_agent, process_commands
+from generation.generate_workload import WorkloadGenerator, DEFAULT_PREFIX_LENGTHS, DEFAULT_EXPONENT, parse_weights
+
+# -------------------------------------------------------------------
+# Workload benchmark: runs one generated command file through the
+# file-based command loop with several approaches, the dictionary built
+# from the data file beforehand and not timed. The commands come from
+# generation.generate_workload, by default in a write-heavy mix where
+# adds and deletes are most of the traffic, which is where approaches
+# that keep one sorted list pay for moving its entries on every update.
+#
+# Every approach must write the same output as the first one. Prints the
+# best time of each approach over the repetitions, in total and per
+# command. Garbage collection is paused while timing.
+#
+# Run from the repository root:
+#   python3 -m benchmark.workload_benchmark [-a approach,...] [-m mix] [-n number of commands]
+#       [-r repetitions] [data fileName]
+# -------------------------------------------------------------------
+
+DEFAULT_APPROACHES = ['array', 'compactarray', 'bufferedarray', 'skiplist', 'trie']
+WRITE_HEAVY_MIX = {'S': 15, 'AC': 15, 'A': 45, 'D': 25}
+
+
+def run(approach: str, data_filename: str, commands: str, repetitions: int) -> (float, str):
+    """
+    run the commands on a fresh dictionary of an approach, repetitions times
+    @return: the best time in seconds, and the output of the commands
+    """
+    best = None
+    for _ in range(repetitions):
+        agent = make_agent(approach, data_filename)
+        output_file = io.StringIO()
+        with gc_paused():
+            start = time.perf_counter()
+            process_commands(agent, [commands], output_file)
+            elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, output_file.getvalue()
+
+
+def usage():
+    print('python3 -m benchmark.workload_benchmark', '[-a approach,...] [-m mix] [-n number of commands] '
+          '[-r repetitions] [data fileName]')
+    print('<mix> = comma-separated kind=weight, kinds S, AC, session, A and D (default ' +
+          ','.join(f"{kind}={weight}" for kind, weight in WRITE_HEAVY_MIX.items()) + ')')
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    try:
+        options, arguments = getopt.gnu_getopt(sys.argv[1:], 'a:m:n:r:')
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+    options = dict(options)
+    if len(arguments) > 1:
+        usage()
+
+    data_filename = arguments[0] if arguments else 'sampleData200k.txt'
+    approaches = options['-a'].split(',') if '-a' in options else DEFAULT_APPROACHES
+    mix = parse_weights(options['-m']) if '-m' in options else WRITE_HEAVY_MIX
+    num_commands = int(options.get('-n', 20000))
+    repetitions = int(options.get('-r', 3))
+
+    # The generator follows the adds and deletes on its own model of the dictionary
+    words_frequencies = load_words_frequencies(data_filename)
+    generator = WorkloadGenerator(words_frequencies, make_agent('trie', data_filename), mix,
+                                  DEFAULT_PREFIX_LENGTHS, DEFAULT_EXPONENT)
+    commands = ''.join(generator.generate(num_commands))
+    print(f"{data_filename}: {len(words_frequencies)} words, {num_commands} commands, mix " +
+          ','.join(f"{kind}={weight:g}" for kind, weight in mix.items()))
+
+    print(f"{'approach':<16}{'total (ms)':>12}{'per command (us)':>18}")
+    expected = None
+    for approach in approaches:
+        elapsed, output = run(approach, data_filename, commands, repetitions)
+        if expected is None:
+            expected = output
+        elif output != expected:
+            print(f"{approach}: output differs from {approaches[0]}", file=sys.stderr)
+        print(f"{approach:<16}{elapsed * 1e3:>12.1f}{elapsed / num_commands * 1e6:>18.1f}")
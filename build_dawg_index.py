@@ -0,0 +1,38 @@
+import sys
+from dictionary.dawg_dictionary import DawgDictionary
+from dictionary.loader import load_words_frequencies
+
+
+# -------------------------------------------------------------------
+# Compiles a data file into a DAWG index file, which the 'dawg' approach
+# of dictionary_file_based.py accepts in place of the data file and
+# memory-maps instead of parsing and building.
+# -------------------------------------------------------------------
+
+def usage():
+    """
+    Print help/usage message.
+    """
+    print('python3 build_dawg_index.py', '<data fileName> <index fileName>')
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    # Fetch the command line arguments
+    args = sys.argv
+
+    if len(args) != 3:
+        print('Incorrect number of arguments.')
+        usage()
+
+    # read from data file to get the set of words & frequencies
+    data_filename = args[1]
+    try:
+        words_frequencies_from_file = load_words_frequencies(data_filename)
+    except FileNotFoundError as e:
+        print("Data file doesn't exist.")
+        usage()
+
+    agent = DawgDictionary()
+    agent.build_dictionary(words_frequencies_from_file)
+    agent.save(args[2])
@@ -1,6 +1,11 @@
 from dictionary.word_frequency import WordFrequency
 from dictionary.base_dictionary import BaseDictionary
+from dictionary.range_max import RangeMaxIndex
+from dictionary.snapshot import gc_paused, read_snapshot, write_snapshot
+from operator import attrgetter
 import bisect
+import heapq
+import sys
 
 # ------------------------------------------------------------------------
 # This class is required TO BE IMPLEMENTED
@@ -12,9 +17,26 @@ import bisect
 
 class ArrayDictionary(BaseDictionary):
 
-    def __init__(self):
+    # prefix ranges up to this size are sorted directly instead of using the frequency index
+    SCAN_LIMIT = 64
+
+    # the frequency index is rebuilt once the ranges scanned since the list last changed add up
+    # to this many times its length, about what a rebuild costs against a scan
+    REBUILD_SCANS = 3
+
+    def __init__(self, hash_index: bool = False):
+        """
+        @param hash_index: also keep a word -> frequency hashtable, which answers exact
+            searches in constant time while the sorted list still serves autocomplete
+        """
         # TO BE IMPLEMENTED
         self.words = []
+        # range-max index over the frequencies, None after the list changes until it is rebuilt
+        self.frequency_index = None
+        self.scanned = 0        # words scanned by autocompletes since the list last changed
+        # word -> frequency of every word in the list, None when not kept
+        self.word_index: dict[str, int] = {} if hash_index else None
+        self.version = 0        # bumped by every change, so that sessions know their ranges may be stale
 
 
     def build_dictionary(self, words_frequencies: [WordFrequency]):
@@ -26,6 +48,9 @@ class ArrayDictionary(BaseDictionary):
         # TO BE IMPLEMENTED
         # Need to sort this list
         self.words = sorted(words_frequencies, key=lambda wf: wf.word)
+        self._changed()
+        self._rebuild_word_index()
+        self.version += 1
 
 
     def search(self, word: str) -> int:
@@ -36,6 +61,8 @@ class ArrayDictionary(BaseDictionary):
         @return: frequency > 0 if found and 0 if NOT found
         """
         # TO BE IMPLEMENTED
+        if self.word_index is not None:
+            return self.word_index.get(word, 0)
 
         # Create a dummy WordFrequency object for the searched word
         dummy_word = WordFrequency(word, 0)
@@ -55,12 +82,18 @@ class ArrayDictionary(BaseDictionary):
         :return: True whether succeeded, False when word is already in the dictionary
         """
         # TO BE IMPLEMENTED
+        if self.word_index is not None and word_frequency.word in self.word_index:
+            return False  # Word already exists, no need to look for its position
 
         index = bisect.bisect_left(self.words, word_frequency)
 
         if index < len(self.words) and self.words[index].word == word_frequency.word:
             return False  # Word already exists
         self.words.insert(index, word_frequency)
+        self._changed()
+        if self.word_index is not None:
+            self.word_index[word_frequency.word] = word_frequency.frequency
+        self.version += 1
         return True
 
     def delete_word(self, word: str) -> bool:
@@ -71,6 +104,9 @@ class ArrayDictionary(BaseDictionary):
         """
         # find the position of 'word' in the list, if exists, will be at idx-1
         # TO BE IMPLEMENTED
+        if self.word_index is not None and word not in self.word_index:
+            return False
+
         # Create a dummy WordFrequency object for the deleted word
         dummy_word = WordFrequency(word, 0)
 
@@ -78,36 +114,185 @@ class ArrayDictionary(BaseDictionary):
         index = bisect.bisect_left(self.words, dummy_word)
         if index < len(self.words) and self.words[index].word == word:
             del self.words[index]
+            self._changed()
+            if self.word_index is not None:
+                # a word built in twice is still there, with its next frequency
+                if index < len(self.words) and self.words[index].word == word:
+                    self.word_index[word] = self.words[index].frequency
+                else:
+                    del self.word_index[word]
+            self.version += 1
             return True
         return False
 
 
-    def autocomplete(self, prefix_word: str) -> [WordFrequency]:
+    def autocomplete(self, prefix_word: str, k: int = 3) -> [WordFrequency]:
         """
-        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'prefix_word' as a prefix
         @param prefix_word: word to be autocompleted
-        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'prefix_word'
         """
+        return self._complete(*self._prefix_range(prefix_word), k)
 
-        # Create a dummy WordFrequency object for the prefix word
-        dummy_word = WordFrequency(prefix_word, 0)
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        if self.word_index is not None:
+            return [self.word_index.get(word, 0) for word in words]
 
-        # Caclulate the index to insert prefix word
-        index = bisect.bisect_left(self.words, dummy_word)
+        # In sorted order each binary search starts where the previous one ended
+        found = {}
+        index = 0
+        for word in sorted(set(words)):
+            index = bisect.bisect_left(self.words, WordFrequency(word, 0), index)
+            if index < len(self.words) and self.words[index].word == word:
+                found[word] = self.words[index].frequency
+        return [found.get(word, 0) for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        # In sorted order each prefix range starts at or after the previous one
+        completions = {}
+        lo = 0
+        for prefix_word in sorted(set(prefixes)):
+            lo, hi = self._prefix_range(prefix_word, lo)
+            completions[prefix_word] = self._complete(lo, hi, k)
+        return [completions[prefix_word] for prefix_word in prefixes]
+
+    def _complete(self, lo: int, hi: int, k: int) -> [WordFrequency]:
+        # k most-frequent words among self.words[lo:hi], equal frequencies in alphabetical order
+
+        # Small ranges: sort them directly
+        if hi - lo <= self.SCAN_LIMIT:
+            autocomplete_list = self.words[lo:hi]
+            autocomplete_list.sort(key=lambda x: x.frequency, reverse=True)
+            return autocomplete_list[:k]
+
+        # Large ranges: pull the k best out of the range-max index. Changes drop
+        # the index, and until the scans since then have cost about as much as
+        # rebuilding it, each range is scanned once for its k best instead, so
+        # that changes between autocompletes never pay for a rebuild
+        if self.frequency_index is None:
+            self.scanned += hi - lo
+            if self.scanned < self.REBUILD_SCANS * len(self.words):
+                return heapq.nlargest(k, self.words[lo:hi], key=attrgetter('frequency'))
+            self.frequency_index = RangeMaxIndex([word_freq.frequency for word_freq in self.words])
+        return [self.words[index] for index in self.frequency_index.top_k(lo, hi, k)]
+
+    def _changed(self):
+        # The list changed: the frequency index no longer matches it
+        self.frequency_index = None
+        self.scanned = 0
+
+    def save(self, path: str):
+        """
+        write the words and frequencies to a binary snapshot file
+        @param path: the snapshot file
+        """
+        write_snapshot(path, self.words)
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        # Snapshots are written in sorted order, no need to sort again
+        with gc_paused():
+            self.words = read_snapshot(path)
+        self._changed()
+        self._rebuild_word_index()
+        self.version += 1
+
+    def session(self) -> 'ArraySession':
+        """
+        start a type-ahead session, which autocompletes a prefix typed a letter at a time
+        @return: the session, with an empty prefix
+        """
+        return ArraySession(self)
+
+    def _rebuild_word_index(self):
+        # Index the whole list again, when kept. Where the list holds a word
+        # twice, searches find its first entry, so that one is indexed.
+        if self.word_index is not None:
+            self.word_index = {word_freq.word: word_freq.frequency for word_freq in reversed(self.words)}
+
+    def _prefix_range(self, prefix_word: str, lo: int = 0, hi: int = None) -> (int, int):
+        # Words starting with the prefix sit between the prefix itself and its
+        # successor, the smallest string greater than every word with the prefix.
+        # The search is limited to [lo, hi), which must contain the whole range.
+        if hi is None:
+            hi = len(self.words)
+        lo = bisect.bisect_left(self.words, WordFrequency(prefix_word, 0), lo, hi)
+
+        successor = prefix_word
+        while successor and successor[-1] == chr(sys.maxunicode):
+            successor = successor[:-1]
+        if not successor:
+            return lo, hi
+        successor = successor[:-1] + chr(ord(successor[-1]) + 1)
+
+        hi = bisect.bisect_left(self.words, WordFrequency(successor, 0), lo, hi)
+        return lo, hi
+
+
+# Type-ahead session over a sorted array. It keeps the range of words matched
+# by each prefix typed so far, so typing a letter only bisects inside the last
+# range and backspace pops the stack, instead of searching the whole array.
+class ArraySession:
+
+    def __init__(self, dictionary: ArrayDictionary):
+        self.dictionary = dictionary
+        self.prefix = ''
+        self.ranges = [(0, len(dictionary.words))]     # (lo, hi) of the words matching each prefix of 'prefix'
+        self.version = dictionary.version
+
+    def append(self, letters: str):
+        """
+        type one or more letters at the end of the prefix
+        @param letters: letters typed
+        """
+        if self.version != self.dictionary.version:
+            self._sync()
+        lo, hi = self.ranges[-1]
+        for letter in letters:
+            self.prefix += letter
+            if lo < hi:
+                lo, hi = self.dictionary._prefix_range(self.prefix, lo, hi)
+            self.ranges.append((lo, hi))
+
+    def backspace(self, count: int = 1):
+        """
+        remove letters from the end of the prefix
+        @param count: number of letters to remove, at most the length of the prefix
+        """
+        count = min(count, len(self.prefix))
+        if count:
+            del self.ranges[-count:]
+            self.prefix = self.prefix[:-count]
+
+    def autocomplete(self, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have the typed prefix
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with the typed prefix
+        """
+        if self.version != self.dictionary.version:
+            self._sync()
+        return self.dictionary._complete(*self.ranges[-1], k)
 
-        # Create a list of possible words having that prefix
-        autocomplete_list = []
-        
-        
-        # Scan part of the list (starting from the position to insert prefix word) 
-        for word_freq in self.words[index:]:
-            # If a word starts with the prefix, append it to the possible word list
-            if word_freq.word.startswith(prefix_word):
-                autocomplete_list.append(word_freq)
-                    
-
-        # Sort the list of possible words in descending order based on the word frequency
-        autocomplete_list.sort(key=lambda x: x.frequency, reverse=True)
-
-        # Return the top 3 most possible word
-        return autocomplete_list[:3]
+    def _sync(self):
+        # Search the prefix again, the array changed since the ranges were found
+        prefix = self.prefix
+        self.prefix = ''
+        self.ranges = [(0, len(self.dictionary.words))]
+        self.version = self.dictionary.version
+        self.append(prefix)
@@ -47,3 +47,20 @@ class BaseDictionary:
         @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
         """
         pass
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        return [self.search(word) for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        return [self.autocomplete(prefix_word, k) for prefix_word in prefixes]
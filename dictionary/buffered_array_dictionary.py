@@ -0,0 +1,264 @@
+from dictionary.word_frequency import WordFrequency
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.range_max import RangeMaxIndex
+from dictionary.snapshot import gc_paused, read_snapshot, write_snapshot
+import bisect
+import sys
+
+# ------------------------------------------------------------------------
+# Array-based dictionary with a log-structured layout
+#
+# Inserting into or deleting from one sorted list moves every entry after
+# the position, so a run of updates on a large dictionary costs O(n) each.
+# Here the bulk of the words sit in a large sorted base list that updates
+# never modify. Added words go to a small sorted buffer, and words deleted
+# from the base are only recorded as tombstones. Searches and autocompletes
+# look at both and skip the tombstones. Once the buffer and the tombstones
+# outgrow a threshold, a 16th of the base size, they are merged into a new
+# base list in one pass that copies the runs of the old base between changes
+# as whole slices. A merge, with the rebuild of the frequency index that
+# follows it, costs O(n), so the threshold grows with n to keep its share of
+# each update constant; an update of the buffer moves at most a 16th as many
+# entries as one of the base would.
+# ------------------------------------------------------------------------
+
+class BufferedArrayDictionary(BaseDictionary):
+
+    # prefix ranges of the base up to this size are filtered directly instead of using the frequency index
+    SCAN_LIMIT = 64
+
+    # pending changes (buffered words and tombstones) a merge waits for, as a
+    # fraction of the base size, and at the least
+    PENDING_RATIO = 1 / 16
+    MIN_PENDING = 256
+
+    def __init__(self, merge_threshold: int = None):
+        """
+        @param merge_threshold: number of pending changes that triggers a merge, by default
+            PENDING_RATIO of the base size (at least MIN_PENDING)
+        """
+        self.base: [WordFrequency] = []         # sorted words as of the last merge, replaced whole by the next one
+        self.buffer: [WordFrequency] = []       # sorted words added since the last merge
+        self.tombstones: set[str] = set()       # words of the base deleted since the last merge
+        self.merge_threshold = merge_threshold
+        # range-max index over the frequencies of the base, rebuilt lazily after a merge
+        self.frequency_index = None
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        # A repeated word keeps its last frequency
+        latest = {word_freq.word: word_freq for word_freq in words_frequencies}
+        self._reset(sorted(latest.values(), key=lambda wf: wf.word))
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        # A buffered word is never live in the base as well, so the buffer is looked at first
+        index = self._find(self.buffer, word)
+        if index >= 0:
+            return self.buffer[index].frequency
+        if word in self.tombstones:
+            return 0
+        index = self._find(self.base, word)
+        if index >= 0:
+            return self.base[index].frequency
+        return 0
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word = word_frequency.word
+        index = bisect.bisect_left(self.buffer, word_frequency)
+        if index < len(self.buffer) and self.buffer[index].word == word:
+            return False
+        if word not in self.tombstones and self._find(self.base, word) >= 0:
+            return False
+
+        # A word deleted from the base and added again keeps its tombstone, the
+        # buffered entry replaces the old one at the next merge
+        self.buffer.insert(index, word_frequency)
+        self._pending_changed()
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when word not found
+        """
+        index = self._find(self.buffer, word)
+        if index >= 0:
+            del self.buffer[index]
+            return True
+        if word in self.tombstones or self._find(self.base, word) < 0:
+            return False
+
+        self.tombstones.add(word)
+        self._pending_changed()
+        return True
+
+    def autocomplete(self, prefix_word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'prefix_word'
+        """
+        return self._complete(self._prefix_range(self.base, prefix_word),
+                              self._prefix_range(self.buffer, prefix_word), k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        # In sorted order each binary search, in the base and in the buffer,
+        # starts where the previous one ended
+        found = {}
+        base_index = buffer_index = 0
+        for word in sorted(set(words)):
+            dummy_word = WordFrequency(word, 0)
+            buffer_index = bisect.bisect_left(self.buffer, dummy_word, buffer_index)
+            base_index = bisect.bisect_left(self.base, dummy_word, base_index)
+            if buffer_index < len(self.buffer) and self.buffer[buffer_index].word == word:
+                found[word] = self.buffer[buffer_index].frequency
+            elif base_index < len(self.base) and self.base[base_index].word == word and word not in self.tombstones:
+                found[word] = self.base[base_index].frequency
+        return [found.get(word, 0) for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        # In sorted order each prefix range starts at or after the previous one
+        completions = {}
+        base_lo = buffer_lo = 0
+        for prefix_word in sorted(set(prefixes)):
+            base_range = self._prefix_range(self.base, prefix_word, base_lo)
+            buffer_range = self._prefix_range(self.buffer, prefix_word, buffer_lo)
+            base_lo, buffer_lo = base_range[0], buffer_range[0]
+            completions[prefix_word] = self._complete(base_range, buffer_range, k)
+        return [completions[prefix_word] for prefix_word in prefixes]
+
+    def merge(self):
+        """
+        fold the buffer and the tombstones into a new base list, which can also be
+        called ahead of the threshold, e.g. while the dictionary is idle
+        """
+        if not self.buffer and not self.tombstones:
+            return
+
+        # Drop the tombstoned words, then put the buffered ones in their places.
+        # Either pass copies the words between two changes as one slice.
+        base = self.base
+        if self.tombstones:
+            live = []
+            start = 0
+            for index in sorted(self._find(base, word) for word in self.tombstones):
+                live += base[start:index]
+                start = index + 1
+            live += base[start:]
+            base = live
+
+        merged = []
+        start = 0
+        for word_freq in self.buffer:
+            index = bisect.bisect_left(base, word_freq, start)
+            merged += base[start:index]
+            merged.append(word_freq)
+            start = index
+        merged += base[start:]
+
+        # The old base is left as it was, for anyone still reading it
+        self._reset(merged)
+
+    def save(self, path: str):
+        """
+        write the words and frequencies to a binary snapshot file
+        @param path: the snapshot file
+        """
+        self.merge()
+        write_snapshot(path, self.base)
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        # Snapshots are written in sorted order, no need to sort again
+        with gc_paused():
+            self._reset(read_snapshot(path))
+
+    def _reset(self, base: [WordFrequency]):
+        # Start over from a new sorted base, with no pending changes
+        self.base = base
+        self.buffer = []
+        self.tombstones = set()
+        self.frequency_index = None
+
+    def _pending_changed(self):
+        # Merge once the buffer and the tombstones together reach the threshold
+        threshold = self.merge_threshold or max(self.MIN_PENDING, int(len(self.base) * self.PENDING_RATIO))
+        if len(self.buffer) + len(self.tombstones) >= threshold:
+            self.merge()
+
+    def _complete(self, base_range: (int, int), buffer_range: (int, int), k: int) -> [WordFrequency]:
+        # k most-frequent words among the live words of base[lo:hi] and buffer[lo:hi]
+        lo, hi = base_range
+        tombstones = self.tombstones
+
+        # Small ranges: filter them directly, larger ones: pull the best words out
+        # of the range-max index until k of them are live
+        if hi - lo <= self.SCAN_LIMIT:
+            candidates = [word_freq for word_freq in self.base[lo:hi] if word_freq.word not in tombstones]
+        else:
+            if self.frequency_index is None:
+                self.frequency_index = RangeMaxIndex([word_freq.frequency for word_freq in self.base])
+            candidates = []
+            for index in self.frequency_index.iter_top(lo, hi):
+                if self.base[index].word not in tombstones:
+                    candidates.append(self.base[index])
+                    if len(candidates) == k:
+                        break
+
+        # The buffered words join in, equal frequencies stay in alphabetical order
+        candidates += self.buffer[buffer_range[0]:buffer_range[1]]
+        candidates.sort(key=lambda x: (-x.frequency, x.word))
+        return candidates[:k]
+
+    @staticmethod
+    def _find(words: [WordFrequency], word: str) -> int:
+        # Position of 'word' in the sorted list 'words', -1 if it is not there
+        index = bisect.bisect_left(words, WordFrequency(word, 0))
+        if index < len(words) and words[index].word == word:
+            return index
+        return -1
+
+    @staticmethod
+    def _prefix_range(words: [WordFrequency], prefix_word: str, lo: int = 0) -> (int, int):
+        # Words of the sorted list 'words' starting with the prefix sit between the
+        # prefix itself and its successor, the smallest string greater than every
+        # word with the prefix. The search starts at lo, which must not be past the range.
+        lo = bisect.bisect_left(words, WordFrequency(prefix_word, 0), lo)
+
+        successor = prefix_word
+        while successor and successor[-1] == chr(sys.maxunicode):
+            successor = successor[:-1]
+        if not successor:
+            return lo, len(words)
+        successor = successor[:-1] + chr(ord(successor[-1]) + 1)
+
+        return lo, bisect.bisect_left(words, WordFrequency(successor, 0), lo)
@@ -0,0 +1,155 @@
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from collections import OrderedDict
+
+# ------------------------------------------------------------------------
+# Autocomplete cache in front of any dictionary implementation
+#
+# Keystroke traffic asks for the same short prefixes over and over, so the
+# results of autocomplete are kept in a bounded LRU cache keyed by prefix.
+# Only the words a prefix can complete to can change its result, so adding
+# or deleting a word evicts exactly the cached prefixes of that word: the
+# word itself and every prefix of it down to the empty string.
+# ------------------------------------------------------------------------
+
+class CachedDictionary(BaseDictionary):
+
+    def __init__(self, dictionary: BaseDictionary, max_size: int = 1024):
+        """
+        @param dictionary: the dictionary whose autocomplete results are cached
+        @param max_size: maximum number of prefixes kept in the cache
+        """
+        self.dictionary = dictionary
+        self.max_size = max_size
+        # prefix -> {k: autocomplete list}, least recently used first
+        self.cache: OrderedDict[str, dict[int, list[WordFrequency]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0          # prefixes dropped to stay within max_size
+        self.invalidations = 0      # prefixes dropped because a word below them changed
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self.dictionary.build_dictionary(words_frequencies)
+        self.cache.clear()
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        return self.dictionary.search(word)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        return self.dictionary.search_many(words)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        if not self.dictionary.add_word_frequency(word_frequency):
+            return False
+        self._invalidate(word_frequency.word)
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        if not self.dictionary.delete_word(word):
+            return False
+        self._invalidate(word)
+        return True
+
+    def autocomplete(self, prefix_word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'prefix_word'
+        """
+        autocomplete_list = self._lookup(prefix_word, k)
+        if autocomplete_list is None:
+            autocomplete_list = self.dictionary.autocomplete(prefix_word, k)
+            self._store(prefix_word, k, autocomplete_list)
+        return list(autocomplete_list)
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        # Cached prefixes are answered here, the rest in one batch by the dictionary
+        completions = {}
+        missing = []
+        for prefix_word in prefixes:
+            if prefix_word in completions:
+                continue
+            autocomplete_list = self._lookup(prefix_word, k)
+            if autocomplete_list is None:
+                missing.append(prefix_word)
+            completions[prefix_word] = autocomplete_list
+
+        for prefix_word, autocomplete_list in zip(missing, self.dictionary.autocomplete_many(missing, k)):
+            completions[prefix_word] = autocomplete_list
+            self._store(prefix_word, k, autocomplete_list)
+        return [list(completions[prefix_word]) for prefix_word in prefixes]
+
+    def stats(self) -> dict:
+        """
+        cache size and counters
+        @return: dict with size, max_size, hits, misses, hit_rate, evictions and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.cache),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def _lookup(self, prefix_word: str, k: int) -> [WordFrequency]:
+        # Cached result for (prefix, k), None on a miss; a hit makes the prefix most recently used
+        results = self.cache.get(prefix_word)
+        if results is not None and k in results:
+            self.cache.move_to_end(prefix_word)
+            self.hits += 1
+            return results[k]
+        self.misses += 1
+        return None
+
+    def _store(self, prefix_word: str, k: int, autocomplete_list: [WordFrequency]):
+        results = self.cache.get(prefix_word)
+        if results is None:
+            results = self.cache[prefix_word] = {}
+        else:
+            self.cache.move_to_end(prefix_word)
+        results[k] = list(autocomplete_list)
+
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def _invalidate(self, word: str):
+        # Only the prefixes of a word can have it among their completions
+        for end in range(len(word) + 1):
+            if self.cache.pop(word[:end], None) is not None:
+                self.invalidations += 1
@@ -0,0 +1,277 @@
+from dictionary.word_frequency import WordFrequency
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.range_max import RangeMaxIndex
+from dictionary.snapshot import gc_paused, read_snapshot, write_snapshot
+from array import array
+import bisect
+import heapq
+
+# ------------------------------------------------------------------------
+# Array-based dictionary with a columnar layout
+#
+# Instead of a list of WordFrequency objects, the sorted dictionary is kept
+# in flat columns: the UTF-8 bytes of all words in one bytearray, plus
+# start offsets, lengths and frequencies in typed arrays. UTF-8 preserves
+# code point order, so binary searches compare raw byte slices directly
+# instead of building a dummy WordFrequency per lookup.
+# New words are appended to the end of the buffer and only the columns are
+# kept in sorted order; deleted words leave dead bytes that are compacted
+# away once they make up half of the buffer.
+# One more column holds the first 8 bytes of each word as a number, in the
+# same order as the words, so a binary search runs in C over the numbers
+# and only compares byte slices among the words that start alike. It costs
+# 8 bytes per word, and keeps lookups as fast as in the list of objects.
+# ------------------------------------------------------------------------
+
+class CompactArrayDictionary(BaseDictionary):
+
+    # prefix ranges up to this size are sorted directly instead of using the frequency index
+    SCAN_LIMIT = 64
+
+    # words with the same head looked for in a window of this size before the rest of the columns
+    HEAD_RUN = 8
+
+    # the frequency index is rebuilt once the ranges scanned since the columns last changed
+    # add up to this many times their length, about what a rebuild costs against a scan
+    REBUILD_SCANS = 3
+
+    def __init__(self):
+        self.buffer = bytearray()       # UTF-8 bytes of every word, in insertion order
+        self.starts = array('q')        # offset of each word in the buffer, in sorted order
+        self.lengths = array('q')       # byte length of each word, in sorted order
+        self.frequencies = array('q')   # frequency of each word, in sorted order
+        self.heads = array('Q')         # _head() of each word, in sorted order
+        self.dead_bytes = 0             # bytes in the buffer that belong to deleted words
+        # range-max index over the frequencies, None after the columns change until it is rebuilt
+        self.frequency_index = None
+        self.scanned = 0                # positions scanned by autocompletes since the columns last changed
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self._fill_columns(sorted((wf.word.encode(), wf.frequency) for wf in words_frequencies))
+
+    def build_from_columns(self, words: [str], frequencies):
+        """
+        construct the dictionary from columns, such as those of loader.load_columns(), without any WordFrequency
+        @param words: list of words to be stored
+        @param frequencies: frequency of each word, in the same order
+        """
+        self._fill_columns(sorted(zip(map(str.encode, words), frequencies)))
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        index = self._find(word.encode())
+        if index < 0:
+            return 0
+        return self.frequencies[index]
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        key = word_frequency.word.encode()
+        index = self._bisect_left(key)
+        if index < len(self.starts) and self._word_bytes(index) == key:
+            return False  # Word already exists
+
+        self.starts.insert(index, len(self.buffer))
+        self.lengths.insert(index, len(key))
+        self.frequencies.insert(index, word_frequency.frequency)
+        self.heads.insert(index, self._head(key))
+        self.buffer += key
+        self._changed()
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        index = self._find(word.encode())
+        if index < 0:
+            return False
+
+        self.dead_bytes += self.lengths[index]
+        del self.starts[index]
+        del self.lengths[index]
+        del self.frequencies[index]
+        del self.heads[index]
+        self._changed()
+
+        # Reclaim the buffer once it is mostly dead
+        if self.dead_bytes * 2 > len(self.buffer):
+            self._fill_columns([(self._word_bytes(i), self.frequencies[i]) for i in range(len(self.starts))])
+        return True
+
+    def autocomplete(self, prefix_word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'prefix_word'
+        """
+        return self._complete(*self._prefix_range(prefix_word.encode()), k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        # In sorted order each binary search starts where the previous one ended.
+        # UTF-8 keeps code point order, so sorting the str keys sorts the bytes too.
+        found = {}
+        index = 0
+        for word in sorted(set(words)):
+            key = word.encode()
+            index = self._bisect_left(key, index)
+            if index < len(self.starts) and self._word_bytes(index) == key:
+                found[word] = self.frequencies[index]
+        return [found.get(word, 0) for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        # In sorted order each prefix range starts at or after the previous one
+        completions = {}
+        lo = 0
+        for prefix_word in sorted(set(prefixes)):
+            lo, hi = self._prefix_range(prefix_word.encode(), lo)
+            completions[prefix_word] = self._complete(lo, hi, k)
+        return [completions[prefix_word] for prefix_word in prefixes]
+
+    def _complete(self, lo: int, hi: int, k: int) -> [WordFrequency]:
+        # k most-frequent words among the sorted positions [lo, hi)
+
+        # Small ranges: sort the positions directly, ties stay in alphabetical order
+        if hi - lo <= self.SCAN_LIMIT:
+            positions = sorted(range(lo, hi), key=lambda i: self.frequencies[i], reverse=True)[:k]
+        # Large ranges: pull the k best out of the range-max index, or, until the
+        # scans since the last change have cost about as much as rebuilding it,
+        # scan the range once for them (ties again in alphabetical order)
+        else:
+            if self.frequency_index is None:
+                self.scanned += hi - lo
+                if self.scanned >= self.REBUILD_SCANS * len(self.frequencies):
+                    self.frequency_index = RangeMaxIndex(self.frequencies)
+            if self.frequency_index is None:
+                positions = heapq.nlargest(k, range(lo, hi), key=self.frequencies.__getitem__)
+            else:
+                positions = self.frequency_index.top_k(lo, hi, k)
+
+        # Only the returned words are turned back into objects
+        return [WordFrequency(self._word_bytes(i).decode(), self.frequencies[i]) for i in positions]
+
+    def save(self, path: str):
+        """
+        write the words and frequencies to a binary snapshot file
+        @param path: the snapshot file
+        """
+        write_snapshot(path, (WordFrequency(self._word_bytes(i).decode(), self.frequencies[i])
+                              for i in range(len(self.starts))))
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        # Snapshots are written in sorted order, no need to sort again
+        with gc_paused():
+            self._fill_columns([(wf.word.encode(), wf.frequency) for wf in read_snapshot(path)])
+
+    def _fill_columns(self, sorted_words_frequencies):
+        # Lay out (bytes, frequency) pairs, already in sorted order, in fresh columns
+        self.buffer = bytearray(b''.join(key for key, _ in sorted_words_frequencies))
+        self.lengths = array('q', [len(key) for key, _ in sorted_words_frequencies])
+        self.frequencies = array('q', [frequency for _, frequency in sorted_words_frequencies])
+        self.heads = array('Q', [self._head(key) for key, _ in sorted_words_frequencies])
+        self.starts = array('q', [0]) * len(self.lengths)
+        offset = 0
+        for index, length in enumerate(self.lengths):
+            self.starts[index] = offset
+            offset += length
+        self.dead_bytes = 0
+        self._changed()
+
+    def _changed(self):
+        # The columns changed: the frequency index no longer matches them
+        self.frequency_index = None
+        self.scanned = 0
+
+    def _word_bytes(self, index: int) -> bytes:
+        # UTF-8 bytes of the word at a sorted position
+        start = self.starts[index]
+        return self.buffer[start:start + self.lengths[index]]
+
+    @staticmethod
+    def _head(key: bytes) -> int:
+        # The first 8 bytes of a word as a big-endian number, padded with zero
+        # bytes: words in sorted order have their heads in sorted order too
+        return int.from_bytes(key[:8].ljust(8, b'\0'), 'big')
+
+    def _bisect_left(self, key: bytes, lo: int = 0) -> int:
+        # bisect.bisect_left over the words. The heads narrow it down to the
+        # words that start with the same 8 bytes as the key, and only those
+        # are compared in full, each probe a plain slice of the buffer
+        heads = self.heads
+        head = self._head(key)
+        lo = bisect.bisect_left(heads, head, lo)
+        # Few words start alike, a short window is usually enough to find the last of them
+        hi = bisect.bisect_right(heads, head, lo, min(lo + self.HEAD_RUN, len(heads)))
+        if hi == lo + self.HEAD_RUN:
+            hi = bisect.bisect_right(heads, head, hi)
+        buffer, starts, lengths = self.buffer, self.starts, self.lengths
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = starts[mid]
+            if buffer[start:start + lengths[mid]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, key: bytes) -> int:
+        # Position of the word in the columns, -1 if it is not there
+        buffer, starts, lengths, heads = self.buffer, self.starts, self.lengths, self.heads
+        head = self._head(key)
+        index = bisect.bisect_left(heads, head)
+        # The words with the same head as the key are usually few: walk them in
+        # order, and only bisect the rest of them if there are more than HEAD_RUN
+        end = min(index + self.HEAD_RUN, len(heads))
+        while index < end and heads[index] == head:
+            start = starts[index]
+            word = buffer[start:start + lengths[index]]
+            if word >= key:
+                return index if word == key else -1
+            index += 1
+        if index == end and index < len(heads) and heads[index] == head:
+            index = self._bisect_left(key, index)
+            if index < len(starts) and self._word_bytes(index) == key:
+                return index
+        return -1
+
+    def _prefix_range(self, prefix: bytes, lo: int = 0) -> (int, int):
+        # Words starting with the prefix sit between the prefix and its successor.
+        # 0xFF never occurs in UTF-8, so bumping the last byte is always possible.
+        # The search starts at lo, which must not be past the prefix.
+        lo = self._bisect_left(prefix, lo)
+        if not prefix:
+            return lo, len(self.starts)
+
+        successor = prefix[:-1] + bytes([prefix[-1] + 1])
+        hi = self._bisect_left(successor, lo)
+        return lo, hi
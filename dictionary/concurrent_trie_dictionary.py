@@ -0,0 +1,148 @@
+from dictionary.word_frequency import WordFrequency
+from dictionary.trie_dictionary import TrieNode, TrieDictionary
+import threading
+
+# ------------------------------------------------------------------------
+# Trie-based dictionary that readers can use while another thread updates it
+#
+# Nodes reachable from the published root are never modified. An update
+# copies the nodes along the path of its word (with their children tables),
+# changes the copies, and then publishes them by assigning the new root,
+# which is a single atomic reference store. A reader picks up the root once
+# per call and only ever sees one complete version of the trie, without
+# taking any lock; the nodes off the updated path are shared between versions.
+# Writers are serialised by a lock so that no update is lost.
+# ------------------------------------------------------------------------
+
+
+class ConcurrentTrieDictionary(TrieDictionary):
+
+    def __init__(self):
+        super().__init__()
+        self.write_lock = threading.Lock()
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        # The new trie is built aside and published whole
+        with self.write_lock:
+            super().build_dictionary(words_frequencies)
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        with self.write_lock:
+            super().load(path)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word = word_frequency.word
+        frequency = word_frequency.frequency
+
+        with self.write_lock:
+            node = self._traverse_word(word)
+            if node and node.is_last:
+                return False
+
+            # Copy the existing part of the path and create the rest of it
+            path = self._copy_path(word)
+            while len(path) <= len(word):
+                path.append(self.node_class())
+                self._link(path, len(path) - 1, word)
+
+            path[-1].is_last = True
+            path[-1].frequency = frequency
+            for node in path:
+                if frequency > node.max_frequency:
+                    node.max_frequency = frequency
+
+            self._publish(path[0])
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        with self.write_lock:
+            node = self._traverse_word(word)
+            if not node or not node.is_last:
+                return False
+
+            path = self._copy_path(word)
+            path[-1].is_last = False
+            path[-1].frequency = None
+            self._prune(path, word)
+
+            # Every node on the path is a private copy, recompute all their bounds
+            for node in reversed(path):
+                max_frequency = node.frequency if node.is_last else 0
+                for child_node in (node.children or {}).values():
+                    if child_node.max_frequency > max_frequency:
+                        max_frequency = child_node.max_frequency
+                node.max_frequency = max_frequency
+
+            self._publish(path[0])
+        return True
+
+    def compact(self) -> dict:
+        """
+        rebuild the trie into fresh nodes, laid out in depth-first order with children
+        tables sized to what they hold, dropping every node that leads to no word.
+        Readers carry on with the current version meanwhile, so this can run in a
+        background thread; updates wait for it.
+        @return: dict of nodes, live_nodes, dead_nodes, bytes_before, bytes_after, bytes_reclaimed
+        """
+        with self.write_lock:
+            return super().compact()
+
+    def snapshot(self) -> TrieDictionary:
+        """
+        read-only view of the dictionary as it is now, unaffected by later updates,
+        for readers that need several calls to agree with each other
+        @return: a TrieDictionary sharing the current version's nodes, which must not be modified
+        """
+        view = TrieDictionary()
+        view.root = self.root
+        return view
+
+    def _copy_path(self, word: str) -> [TrieNode]:
+        # Private copies of the nodes along the existing part of the word's path,
+        # each linked to the copy of its child
+        current = self.root
+        path = [self._copy_node(current)]
+        for letter in word:
+            if not current.children or letter not in current.children:
+                break
+            current = current.children[letter]
+            path.append(self._copy_node(current))
+            self._link(path, len(path) - 1, word)
+        return path
+
+    def _copy_node(self, node: TrieNode) -> TrieNode:
+        copy = self.node_class(node.frequency, node.is_last)
+        copy.max_frequency = node.max_frequency
+        if node.children:
+            copy.children = dict(node.children)
+        return copy
+
+    def _link(self, path: [TrieNode], depth: int, word: str):
+        # Hang path[depth] under its (copied) parent, in place of the published node
+        parent = path[depth - 1]
+        if parent.children is None:
+            parent.children = {}
+        parent.children[word[depth - 1]] = path[depth]
+
+    def _publish(self, root: TrieNode):
+        # The single store that makes an update visible to readers
+        self.root = root
+        self.version += 1
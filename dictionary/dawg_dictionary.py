@@ -0,0 +1,427 @@
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from dictionary.range_max import RangeMaxIndex
+from array import array
+import bisect
+import mmap
+import os
+import struct
+import sys
+
+# ------------------------------------------------------------------------
+# Read-only DAWG (minimised word graph) dictionary backed by an index file
+#
+# compile_dawg() turns a word list into a minimal acyclic automaton over the
+# UTF-8 bytes of the words and lays it out, together with the frequencies,
+# as flat little-endian arrays in a single binary image. DawgDictionary
+# serves search and autocomplete straight from that image, which load()
+# memory-maps: there is no parsing and no per-node Python object, and
+# processes that load the same file share its pages. Big-endian machines
+# read the same files, but copy each array to swap its bytes.
+#
+# Suffixes are shared between words, so frequencies cannot live on the
+# states. Instead every arc stores how many words of the state sort before
+# it (a minimal perfect hash): walking a word sums them into the word's rank
+# in sorted order, which indexes the frequency array. The words below a
+# prefix are a contiguous rank range, so their top k comes from a
+# range-max index over the frequencies stored in the same image.
+#
+# The image itself never changes. Words added or deleted afterwards are
+# kept in a small in-memory overlay and merged into every answer.
+#
+# Image layout, every section padded to 8 bytes:
+#   header        magic, number of states, arcs and words
+#   first_arc     int32[states + 1]  arcs of state s are first_arc[s]:first_arc[s + 1]
+#   counts        int32[states]      number of words below each state
+#   finals        uint8[states]      1 if a word ends at the state
+#   labels        uint8[arcs]        byte on each arc, ascending within a state
+#   targets       int32[arcs]        state each arc leads to
+#   offsets       int32[arcs]        words of the state that sort before the arc
+#   frequencies   int64[words]       frequency of each word, by rank
+#   tree          int32[2 * words]   RangeMaxIndex tree over the frequencies
+# ------------------------------------------------------------------------
+
+MAGIC = b'DAWGIDX1'
+_HEADER = struct.Struct('<8sqqq')
+
+
+# Automaton state, only used while compiling
+class _State:
+
+    __slots__ = ('final', 'arcs')
+
+    def __init__(self):
+        self.final = False
+        self.arcs: dict[int, _State] = {}     # byte -> next state, in ascending byte order
+
+
+def compile_dawg(words_frequencies: [WordFrequency]) -> bytes:
+    """
+    compile words and frequencies into a DAWG index image
+    @param words_frequencies: list of (word, frequency) to be stored
+    @return: the image, as written to an index file
+    """
+    pairs = sorted({wf.word.encode(): wf.frequency for wf in words_frequencies}.items())
+
+    # Incremental construction from sorted input (Daciuk et al.): once the next
+    # word leaves a branch, the states of that branch are final and are merged
+    # with an equivalent registered state if there is one.
+    root = _State()
+    register = {}
+    unchecked = []      # (parent, byte, child) along the path of the previous word
+
+    def minimise(down_to: int):
+        while len(unchecked) > down_to:
+            parent, label, child = unchecked.pop()
+            signature = (child.final, tuple((byte, id(target)) for byte, target in child.arcs.items()))
+            equivalent = register.get(signature)
+            if equivalent is None:
+                register[signature] = child
+            else:
+                parent.arcs[label] = equivalent
+
+    previous = b''
+    for key, _ in pairs:
+        common = 0
+        limit = min(len(key), len(previous))
+        while common < limit and key[common] == previous[common]:
+            common += 1
+        minimise(common)
+
+        current = unchecked[-1][2] if unchecked else root
+        for label in key[common:]:
+            child = _State()
+            current.arcs[label] = child
+            unchecked.append((current, label, child))
+            current = child
+        current.final = True
+        previous = key
+    minimise(0)
+
+    # Number the states depth-first from the root and count the words below each
+    numbers = {id(root): 0}
+    states = [root]
+    stack = [root]
+    while stack:
+        state = stack.pop()
+        for target in state.arcs.values():
+            if id(target) not in numbers:
+                numbers[id(target)] = len(states)
+                states.append(target)
+                stack.append(target)
+
+    counts = array('i', [0]) * len(states)
+    for state in _post_order(root):
+        counts[numbers[id(state)]] = state.final + sum(counts[numbers[id(target)]] for target in state.arcs.values())
+
+    first_arc = array('i')
+    finals = array('B')
+    labels = array('B')
+    targets = array('i')
+    offsets = array('i')
+    for state in states:
+        first_arc.append(len(targets))
+        finals.append(state.final)
+        before = state.final
+        for label, target in state.arcs.items():
+            labels.append(label)
+            targets.append(numbers[id(target)])
+            offsets.append(before)
+            before += counts[numbers[id(target)]]
+    first_arc.append(len(targets))
+
+    frequencies = array('q', [frequency for _, frequency in pairs])
+    tree = array('i', RangeMaxIndex(frequencies).tree)
+
+    sections = [_HEADER.pack(MAGIC, len(states), len(targets), len(frequencies))]
+    for section in (first_arc, counts, finals, labels, targets, offsets, frequencies, tree):
+        if sys.byteorder != 'little':
+            section.byteswap()
+        data = section.tobytes()
+        sections.append(data + bytes(_padding(len(data))))
+    return b''.join(sections)
+
+
+def _post_order(root: _State) -> [_State]:
+    # Every state once, each after all the states it leads to
+    order = []
+    seen = {id(root)}
+    stack = [(root, iter(root.arcs.values()))]
+    while stack:
+        state, targets = stack[-1]
+        for target in targets:
+            if id(target) not in seen:
+                seen.add(id(target))
+                stack.append((target, iter(target.arcs.values())))
+                break
+        else:
+            stack.pop()
+            order.append(state)
+    return order
+
+
+def _padding(length: int) -> int:
+    return -length % 8
+
+
+class DawgDictionary(BaseDictionary):
+
+    def __init__(self):
+        self.image = None
+        self.added = {}         # word -> frequency, words added since the image was built
+        self.deleted = set()    # words of the image deleted since it was built
+        self._attach(compile_dawg([]))
+
+    @staticmethod
+    def is_index_file(path: str) -> bool:
+        """
+        tell whether a file is a DAWG index rather than a text data file
+        @param path: file to check
+        """
+        with open(path, 'rb') as index_file:
+            return index_file.read(len(MAGIC)) == MAGIC
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self._attach(compile_dawg(words_frequencies))
+
+    def load(self, path: str):
+        """
+        serve the dictionary from an index file written by save(), without reading it in
+        @param path: the index file
+        """
+        with open(path, 'rb') as index_file:
+            self._attach(mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path: str):
+        """
+        write the dictionary, including added and deleted words, as an index file
+        @param path: the index file
+        """
+        image = self.image
+        if self.added or self.deleted:
+            live_words = [WordFrequency(word, self.frequencies[rank])
+                          for word, rank in self._iter_words() if word not in self.deleted]
+            live_words.extend(WordFrequency(word, frequency) for word, frequency in self.added.items())
+            image = compile_dawg(live_words)
+
+        # The image may be mapped from this very file, by this dictionary or another
+        # process: write a new file and move it into place, the mapping keeps the old one
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as index_file:
+                index_file.write(image)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        if word in self.added:
+            return self.added[word]
+        if word in self.deleted:
+            return 0
+
+        state, rank = self._traverse_word(word.encode())
+        if state < 0 or not self.finals[state]:
+            return 0
+        return self.frequencies[rank]
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        if self.search(word_frequency.word) > 0:
+            return False
+        self.added[word_frequency.word] = word_frequency.frequency
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        if word in self.added:
+            del self.added[word]
+            return True
+        if self.search(word) > 0:
+            self.deleted.add(word)
+            return True
+        return False
+
+    def autocomplete(self, prefix_word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'prefix_word'
+        """
+        prefix = prefix_word.encode()
+        return self._complete(prefix_word, prefix, *self._traverse_word(prefix), k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        found = {}
+        for key, (state, rank) in self._traverse_many(word.encode() for word in words):
+            if state >= 0 and self.finals[state]:
+                found[key.decode()] = self.frequencies[rank]
+
+        # The overlay takes precedence over the image
+        search_results = []
+        for word in words:
+            if word in self.added:
+                search_results.append(self.added[word])
+            elif word in self.deleted:
+                search_results.append(0)
+            else:
+                search_results.append(found.get(word, 0))
+        return search_results
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        completions = {}
+        for prefix, (state, lo) in self._traverse_many(prefix_word.encode() for prefix_word in prefixes):
+            prefix_word = prefix.decode()
+            completions[prefix_word] = self._complete(prefix_word, prefix, state, lo, k)
+        return [completions[prefix_word] for prefix_word in prefixes]
+
+    def _complete(self, prefix_word: str, prefix: bytes, state: int, lo: int, k: int) -> [WordFrequency]:
+        # k most-frequent words with the prefix, given the state the prefix
+        # reaches in the image and the rank of the first word below it
+        autocomplete_list = []
+
+        # Best words of the image, skipping deleted ones
+        if state >= 0 and k > 0:
+            for rank in self.frequency_index.iter_top(lo, lo + self.counts[state]):
+                word = self._word_at(rank - lo, state, prefix)
+                if word not in self.deleted:
+                    autocomplete_list.append(WordFrequency(word, self.frequencies[rank]))
+                    if len(autocomplete_list) == k:
+                        break
+
+        # Merge in the added words, ties in alphabetical order like the image
+        autocomplete_list.extend(WordFrequency(word, frequency) for word, frequency in self.added.items()
+                                 if word.startswith(prefix_word))
+        autocomplete_list.sort(key=lambda x: (-x.frequency, x.word))
+        return autocomplete_list[:k]
+
+    def _attach(self, image):
+        # Point the array views at an image; nothing is copied, except on
+        # big-endian machines, where each section is copied and swapped
+        magic, num_states, num_arcs, num_words = _HEADER.unpack_from(image, 0)
+        if magic != MAGIC:
+            raise ValueError('not a DAWG index')
+
+        view = memoryview(image)
+        position = _HEADER.size
+
+        def section(typecode: str, length: int):
+            nonlocal position
+            size = array(typecode).itemsize * length
+            data = view[position:position + size]
+            position += size + _padding(size)
+            if sys.byteorder == 'little':
+                return data.cast(typecode)
+            swapped = array(typecode)
+            swapped.frombytes(data)
+            swapped.byteswap()
+            return swapped
+
+        self.image = image
+        self.first_arc = section('i', num_states + 1)
+        self.counts = section('i', num_states)
+        self.finals = section('B', num_states)
+        self.labels = section('B', num_arcs)
+        self.targets = section('i', num_arcs)
+        self.offsets = section('i', num_arcs)
+        self.frequencies = section('q', num_words)
+        self.frequency_index = RangeMaxIndex(self.frequencies, section('i', 2 * num_words))
+        self.added = {}
+        self.deleted = set()
+
+    def _traverse_word(self, key: bytes) -> (int, int):
+        # State reached by the bytes of a word, and the rank of the first word
+        # below it; state -1 when no word starts with these bytes
+        state = 0
+        rank = 0
+        for byte in key:
+            lo = self.first_arc[state]
+            hi = self.first_arc[state + 1]
+            arc = bisect.bisect_left(self.labels, byte, lo, hi)
+            if arc == hi or self.labels[arc] != byte:
+                return -1, 0
+            rank += self.offsets[arc]
+            state = self.targets[arc]
+        return state, rank
+
+    def _traverse_many(self, keys):
+        # _traverse_word() of each distinct key as (key, (state, rank)), walking
+        # the keys in sorted order so that each one resumes from the states of
+        # the bytes it shares with the previous one
+        path = [(0, 0)]
+        previous = b''
+        for key in sorted(set(keys)):
+            common = 0
+            limit = min(len(key), len(previous), len(path) - 1)
+            while common < limit and key[common] == previous[common]:
+                common += 1
+            del path[common + 1:]
+
+            state, rank = path[-1]
+            for byte in key[common:]:
+                lo = self.first_arc[state]
+                hi = self.first_arc[state + 1]
+                arc = bisect.bisect_left(self.labels, byte, lo, hi)
+                if arc == hi or self.labels[arc] != byte:
+                    state, rank = -1, 0
+                    break
+                rank += self.offsets[arc]
+                state = self.targets[arc]
+                path.append((state, rank))
+
+            yield key, (state, rank)
+            previous = key
+
+    def _word_at(self, rank: int, state: int = 0, prefix: bytes = b'') -> str:
+        # Word with the given rank among the words below a state, whose path from the root spells prefix
+        key = bytearray(prefix)
+        while not (self.finals[state] and rank == 0):
+            # Last arc that starts at or before the rank
+            arc = bisect.bisect_right(self.offsets, rank, self.first_arc[state], self.first_arc[state + 1]) - 1
+            rank -= self.offsets[arc]
+            key.append(self.labels[arc])
+            state = self.targets[arc]
+        return key.decode()
+
+    def _iter_words(self):
+        # Every word of the image with its rank, in sorted order
+        stack = [(0, b'')]
+        rank = 0
+        while stack:
+            state, key = stack.pop()
+            if self.finals[state]:
+                yield key.decode(), rank
+                rank += 1
+            for arc in range(self.first_arc[state + 1] - 1, self.first_arc[state] - 1, -1):
+                stack.append((self.targets[arc], key + bytes((self.labels[arc],))))
@@ -0,0 +1,432 @@
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from array import array
+import bisect
+import heapq
+
+# ------------------------------------------------------------------------
+# Double-array trie dictionary
+#
+# The whole trie lives in a few flat integer arrays indexed by state number
+# (the root is state 0), so there is no Python object per node and nothing
+# for the garbage collector to track. Letters are numbered with small codes,
+# and the child of state s for the letter of code c is state base[s] + c,
+# which is really a child of s only if check[base[s] + c] == s. Following a
+# letter is two array reads, with no hashtable.
+#
+# Arrays, one entry per state:
+#   base            children of the state are at base + letter code
+#   check           parent of the state, -1 if the slot is free
+#   frequency       frequency of the word ending at the state, -1 if none
+#   max_frequency   highest frequency of any word in the subtree, 0 if none
+#   first_child     first child of the state, -1 if none
+#   next_sibling    next child of the same parent, -1 if none
+#
+# Children are listed through first_child / next_sibling in the order they
+# were added, alphabetical after a build, like the children hashtables of
+# TrieDictionary; deleted words prune the states that led only to them.
+# Both tries therefore walk the same words in the same order and give the
+# same answers, ties included.
+#
+# A new child whose slot is taken by another state makes its parent move
+# all of its children to a new base where every one of them fits.
+# ------------------------------------------------------------------------
+
+
+class DoubleArrayTrieDictionary(BaseDictionary):
+
+    # free slots tried by a search for a base before later searches start past them
+    MAX_TRIES = 16
+
+    def __init__(self):
+        self.codes = {}         # letter -> code
+        self.letters = []       # code -> letter
+        self._reset(2)
+        self._take(0, 0)
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        # Words already in the trie are rebuilt along with the new ones, listed
+        # first so that a repeated word keeps the new frequency
+        if self.first_child[0] >= 0 or self.frequency[0] >= 0:
+            words_frequencies = list(self._iter_words()) + list(words_frequencies)
+        pairs = sorted({wf.word: wf.frequency for wf in words_frequencies}.items())
+        words = [word for word, _ in pairs]
+
+        self.letters = sorted(set(''.join(words)))
+        self.codes = {letter: code for code, letter in enumerate(self.letters)}
+        # Most states of a trie have a single child, so the arrays end up about
+        # as long as the total length of the words
+        self._reset(sum(map(len, words)) + len(self.letters) + 2)
+        self._take(0, 0)
+
+        # Breadth-first: each state places all of its children at once. An entry
+        # covers the sorted words [lo, hi) that go through the state at depth.
+        queue = [(0, 0, len(words), 0)]
+        order = []
+        for state, lo, hi, depth in queue:
+            order.append(state)
+            if lo < hi and len(words[lo]) == depth:
+                self.frequency[state] = pairs[lo][1]
+                lo += 1
+
+            # Runs of words sharing their letter at depth, one per child: a run
+            # ends before the first word past the prefix it shares
+            groups = []
+            while lo < hi:
+                letter = words[lo][depth]
+                end = bisect.bisect_left(words, words[lo][:depth] + chr(ord(letter) + 1), lo + 1, hi)
+                groups.append((self.codes[letter], lo, end))
+                lo = end
+            if not groups:
+                continue
+
+            base = self._find_base([code for code, _, _ in groups])
+            self.base[state] = base
+            previous = -1
+            for code, group_lo, group_hi in groups:
+                child = base + code
+                self._take(child, state)
+                if previous < 0:
+                    self.first_child[state] = child
+                else:
+                    self.next_sibling[previous] = child
+                previous = child
+                queue.append((child, group_lo, group_hi, depth + 1))
+
+        # Bounds bottom-up, every state comes after its parent in the order
+        frequency, max_frequency, check = self.frequency, self.max_frequency, self.check
+        for state in reversed(order):
+            if frequency[state] > max_frequency[state]:
+                max_frequency[state] = frequency[state]
+            if state and max_frequency[state] > max_frequency[check[state]]:
+                max_frequency[check[state]] = max_frequency[state]
+        self._trim()
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        state = self._traverse_word(word)
+        if state < 0 or self.frequency[state] < 0:
+            return 0
+        return self.frequency[state]
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word = word_frequency.word
+        frequency = word_frequency.frequency
+        state = self._traverse_word(word)
+        if state >= 0 and self.frequency[state] >= 0:
+            return False
+
+        # Follow the existing part of the path, then add a state per letter
+        state = 0
+        path = [state]
+        for letter in word:
+            code = self.codes.get(letter)
+            if code is None:
+                code = self._add_letter(letter)
+            child = self.base[state] + code
+            if self.check[child] != state:
+                child = self._add_child(state, code)
+            state = child
+            path.append(state)
+
+        self.frequency[state] = frequency
+        for state in path:
+            if frequency > self.max_frequency[state]:
+                self.max_frequency[state] = frequency
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        state = self._traverse_word(word)
+        if state < 0 or self.frequency[state] < 0:
+            return False
+        self.frequency[state] = -1
+
+        # Free the states that led only to the deleted word
+        check, frequency, first_child = self.check, self.frequency, self.first_child
+        while state and frequency[state] < 0 and first_child[state] < 0:
+            parent = check[state]
+            self._unlink(parent, state)
+            state = parent
+
+        # Recompute the subtree bounds bottom-up, an ancestor whose bound does
+        # not change leaves the ones above it unchanged too
+        while True:
+            max_frequency = max(frequency[state], 0)
+            child = first_child[state]
+            while child >= 0:
+                if self.max_frequency[child] > max_frequency:
+                    max_frequency = self.max_frequency[child]
+                child = self.next_sibling[child]
+            if max_frequency == self.max_frequency[state]:
+                break
+            self.max_frequency[state] = max_frequency
+            if not state:
+                break
+            state = check[state]
+        return True
+
+    def autocomplete(self, word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'word' as a prefix
+        @param word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'word'
+        """
+        return self._complete(self._traverse_word(word), word, k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        found = {word: self.search(word) for word in set(words)}
+        return [found[word] for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        completions = {word: self.autocomplete(word, k) for word in set(prefixes)}
+        return [completions[word] for word in prefixes]
+
+    def _complete(self, state: int, word: str, k: int) -> [WordFrequency]:
+        # k most-frequent words below the state reached by 'word', by the same
+        # best-first search as TrieDictionary._complete()
+        if state < 0 or not self.max_frequency[state]:
+            return []
+
+        base, frequency, max_frequency = self.base, self.frequency, self.max_frequency
+        first_child, next_sibling, letters = self.first_child, self.next_sibling, self.letters
+
+        # Entries: (-frequency, path, is_subtree, word, state)
+        heap = [(-max_frequency[state], (), True, word, state)]
+        autocomplete_list = []
+
+        while heap and len(autocomplete_list) < k:
+            neg_frequency, path, is_subtree, word_prefix, current = heapq.heappop(heap)
+
+            if not is_subtree:
+                autocomplete_list.append(WordFrequency(word_prefix, -neg_frequency))
+                continue
+
+            # Expand the subtree into its own word and its children's subtrees
+            if frequency[current] >= 0:
+                heapq.heappush(heap, (-frequency[current], path, False, word_prefix, -1))
+            child = first_child[current]
+            index = 0
+            while child >= 0:
+                if max_frequency[child]:
+                    heapq.heappush(heap, (-max_frequency[child], path + (index,), True,
+                                          word_prefix + letters[child - base[current]], child))
+                child = next_sibling[child]
+                index += 1
+
+        return autocomplete_list
+
+    def _traverse_word(self, word: str) -> int:
+        # State reached by the letters of the word, -1 if there is none
+        base, check, codes = self.base, self.check, self.codes
+        state = 0
+        for letter in word:
+            code = codes.get(letter)
+            if code is None:
+                return -1
+            child = base[state] + code
+            if check[child] != state:
+                return -1
+            state = child
+        return state
+
+    def _iter_words(self):
+        # Every word with its frequency, in depth-first order (a state before its
+        # children, children in the order they were added)
+        stack = [(0, '')]
+        while stack:
+            state, word_prefix = stack.pop()
+            if self.frequency[state] >= 0:
+                yield WordFrequency(word_prefix, self.frequency[state])
+            children = []
+            child = self.first_child[state]
+            while child >= 0:
+                children.append((child, word_prefix + self.letters[child - self.base[state]]))
+                child = self.next_sibling[child]
+            stack.extend(reversed(children))
+
+    def _add_letter(self, letter: str) -> int:
+        # Give a new letter the next code; the arrays grow so that base + code
+        # stays within them for every base
+        code = len(self.letters)
+        self.codes[letter] = code
+        self.letters.append(letter)
+        self._grow(self.max_base + len(self.letters))
+        return code
+
+    def _add_child(self, state: int, code: int) -> int:
+        # Add a child of the given letter code at the end of the state's children,
+        # moving the other children to a new base if its slot is taken
+        children = self._children(state)
+        child = self.base[state] + code
+        if children and self.check[child] < 0:
+            self._take(child, state)
+        else:
+            base = self._find_base([c for c, _ in children] + [code])
+            if children:
+                self._relocate(state, children, base)
+            self.base[state] = base
+            child = base + code
+            self._take(child, state)
+
+        if children:
+            self.next_sibling[self.base[state] + children[-1][0]] = child
+        else:
+            self.first_child[state] = child
+        return child
+
+    def _children(self, state: int) -> [(int, int)]:
+        # (code, state) of each child, in order
+        children = []
+        child = self.first_child[state]
+        while child >= 0:
+            children.append((child - self.base[state], child))
+            child = self.next_sibling[child]
+        return children
+
+    def _relocate(self, state: int, children: [(int, int)], base: int):
+        # Move every child of the state to base + its code, pointing the
+        # grandchildren at their parent's new slot
+        moved = {}
+        for code, old in children:
+            new = base + code
+            self._take(new, state)
+            self.base[new] = self.base[old]
+            self.frequency[new] = self.frequency[old]
+            self.max_frequency[new] = self.max_frequency[old]
+            self.first_child[new] = self.first_child[old]
+            self.next_sibling[new] = self.next_sibling[old]
+            grandchild = self.first_child[old]
+            while grandchild >= 0:
+                self.check[grandchild] = new
+                grandchild = self.next_sibling[grandchild]
+            moved[old] = new
+
+        for old in moved:
+            self._free(old)
+        self.first_child[state] = moved[self.first_child[state]]
+        for new in moved.values():
+            if self.next_sibling[new] >= 0:
+                self.next_sibling[new] = moved[self.next_sibling[new]]
+
+    def _unlink(self, parent: int, state: int):
+        # Take a state with no word and no children out of its parent's children
+        if self.first_child[parent] == state:
+            self.first_child[parent] = self.next_sibling[state]
+        else:
+            child = self.first_child[parent]
+            while self.next_sibling[child] != state:
+                child = self.next_sibling[child]
+            self.next_sibling[child] = self.next_sibling[state]
+        self._free(state)
+
+    def _find_base(self, codes: [int]) -> int:
+        # Lowest base at which every code lands on a free slot, growing the
+        # arrays when there is none. A single child fits in the first free
+        # slot; states with several children start after the slots that
+        # already failed too many such searches, rather than trying them again.
+        check = self.check
+        first = codes[0]
+        position = self.free_start if len(codes) == 1 else max(self.free_start, self.search_start)
+        tried = 0
+        while True:
+            try:
+                slot = check.index(-1, position)
+            except ValueError:
+                slot = len(check)
+            base = slot - first
+            if base >= 1:
+                self._grow(base + len(self.letters))
+                check = self.check
+                for code in codes:
+                    if check[base + code] >= 0:
+                        break
+                else:
+                    self.max_base = max(self.max_base, base)
+                    return base
+            position = slot + 1
+            tried += 1
+            if tried > self.MAX_TRIES and len(codes) > 1:
+                self.search_start = position
+
+    def _take(self, state: int, parent: int):
+        # Mark a free slot as a state, with no word and no children yet
+        self.check[state] = parent
+        if state == self.free_start:
+            try:
+                self.free_start = self.check.index(-1, state)
+            except ValueError:
+                self.free_start = len(self.check)
+
+    def _free(self, state: int):
+        self.check[state] = -1
+        self.base[state] = 0
+        self.frequency[state] = -1
+        self.max_frequency[state] = 0
+        self.first_child[state] = -1
+        self.next_sibling[state] = -1
+        if state < self.free_start:
+            self.free_start = state
+
+    def _reset(self, size: int):
+        # Empty arrays of the given size, every slot free
+        self.base = array('i', [0]) * size
+        self.check = array('i', [-1]) * size
+        self.frequency = array('q', [-1]) * size
+        self.max_frequency = array('q', [0]) * size
+        self.first_child = array('i', [-1]) * size
+        self.next_sibling = array('i', [-1]) * size
+        self.free_start = 0         # no slot before this one is free
+        self.search_start = 0       # where searches for the base of several children start
+        # The root starts with base 1, so that no letter leads from it back to itself
+        self.base[0] = 1
+        self.max_base = 1           # highest base of any state
+
+    def _grow(self, size: int):
+        # Make the arrays at least size long, doubling them to keep appends cheap
+        length = len(self.check)
+        if size <= length:
+            return
+        extra = max(size, 2 * length) - length
+        self.base.extend(array('i', [0]) * extra)
+        self.check.extend(array('i', [-1]) * extra)
+        self.frequency.extend(array('q', [-1]) * extra)
+        self.max_frequency.extend(array('q', [0]) * extra)
+        self.first_child.extend(array('i', [-1]) * extra)
+        self.next_sibling.extend(array('i', [-1]) * extra)
+
+    def _trim(self):
+        # Drop the free slots past the last one any base + code can reach
+        size = self.max_base + len(self.letters) + 1
+        for column in (self.base, self.check, self.frequency, self.max_frequency, self.first_child,
+                       self.next_sibling):
+            del column[size:]
@@ -1,11 +1,15 @@
 from dictionary.base_dictionary import BaseDictionary
 from dictionary.word_frequency import WordFrequency
+from dictionary.snapshot import gc_paused, read_snapshot, write_snapshot
+from operator import attrgetter
 
 class ListNode:
     '''
     Define a node in the linked list
     '''
 
+    __slots__ = ('word_frequency', 'next')
+
     def __init__(self, word_frequency: WordFrequency):
         self.word_frequency = word_frequency
         self.next = None
@@ -20,26 +24,44 @@ class ListNode:
 
 class LinkedListDictionary(BaseDictionary):
 
-    def __init__(self):
+    def __init__(self, hash_index: bool = False):
+        """
+        @param hash_index: also keep a word -> frequency hashtable, which answers exact
+            searches and the existence checks of adds and deletes without walking the list
+        """
         # Initialize the linked list
         self.head = None
+        # word -> frequency of every word in the list, None when not kept
+        self.word_index: dict[str, int] = {} if hash_index else None
 
     def build_dictionary(self, words_frequencies: [WordFrequency]):
         """
         construct the data structure to store nodes
         @param words_frequencies: list of (word, frequency) to be stored
         """
-        # Sort the input list of WordFrequency objects by word
-        # sorted_words_frequencies = sorted(words_frequencies, key=lambda wf: wf.word)
-
-        # Create a linked list of nodes from the sorted list of WordFrequency objects
+        # Words already in the list are rebuilt along with the new ones; a
+        # repeated word keeps its last frequency
+        latest = {word_freq.word: word_freq for word_freq in self._iter_words()}
         for word_freq in words_frequencies:
-            # Create a new node with the given WordFrequency
-            new_node = ListNode(word_freq)
+            latest[word_freq.word] = word_freq
 
-            # Insert the new node at the beginning of the linked list
-            new_node.next = self.head
-            self.head = new_node
+        # Sort the words once and link the nodes in that order, so the list is
+        # kept in alphabetical order and every operation can stop early. Every
+        # entry gets a fresh copy, word string included (encode().decode() makes
+        # a new str), so that what a scan visits is allocated in list order
+        # instead of scattered wherever the input was allocated
+        self.head = None
+        tail = None
+        with gc_paused():
+            for word_freq in sorted(latest.values(), key=attrgetter('word')):
+                new_node = ListNode(WordFrequency(word_freq.word.encode().decode(), word_freq.frequency))
+                if tail:
+                    tail.next = new_node
+                else:
+                    self.head = new_node
+                tail = new_node
+        if self.word_index is not None:
+            self.word_index = {word: word_freq.frequency for word, word_freq in latest.items()}
 
     def search(self, word: str) -> int:
         """
@@ -47,11 +69,12 @@ class LinkedListDictionary(BaseDictionary):
         @param word: the word to be searched
         @return: frequency > 0 if found and 0 if NOT found
         """
-        current = self.head
-        while current:
-            if current.word_frequency.word == word:
-                return current.word_frequency.frequency
-            current = current.next
+        if self.word_index is not None:
+            return self.word_index.get(word, 0)
+
+        _, current = self._find(word)
+        if current and current.word_frequency.word == word:
+            return current.word_frequency.frequency
         return 0
 
     def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
@@ -60,16 +83,24 @@ class LinkedListDictionary(BaseDictionary):
         @param word_frequency: (word, frequency) to be added
         :return: True whether succeeded, False when word is already in the dictionary
         """
+        word = word_frequency.word
+        if self.word_index is not None and word in self.word_index:
+            return False
+        prev, current = self._find(word)
+
         # Check if the word is already in the dictionary
-        if self.search(word_frequency.word) > 0:
+        if current and current.word_frequency.word == word:
             return False
 
-        # Create a new node with the given WordFrequency
+        # Insert the new node in its sorted position
         new_node = ListNode(word_frequency)
-
-        # Insert the new node at the beginning of the linked list
-        new_node.next = self.head
-        self.head = new_node
+        new_node.next = current
+        if prev:
+            prev.next = new_node
+        else:
+            self.head = new_node
+        if self.word_index is not None:
+            self.word_index[word] = word_frequency.frequency
         return True
 
     def delete_word(self, word: str) -> bool:
@@ -78,34 +109,104 @@ class LinkedListDictionary(BaseDictionary):
         @param word: word to be deleted
         @return: whether succeeded, e.g. return False when word not found
         """
-        current = self.head
-        prev = None
+        if self.word_index is not None and word not in self.word_index:
+            return False
+        prev, current = self._find(word)
+        if not current or current.word_frequency.word != word:
+            return False
 
-        while current:
-            if current.word_frequency.word == word:
-                if prev:
-                    prev.next = current.next
-                else:
-                    self.head = current.next
-                return True
-            prev = current
-            current = current.next
-        return False
+        if prev:
+            prev.next = current.next
+        else:
+            self.head = current.next
+        if self.word_index is not None:
+            del self.word_index[word]
+        return True
 
-    def autocomplete(self, prefix_word: str) -> [WordFrequency]:
+    def autocomplete(self, prefix_word: str, k: int = 3) -> [WordFrequency]:
         """
-        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'prefix_word' as a prefix
         @param prefix_word: word to be autocompleted
-        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'prefix_word'
         """
-        current = self.head
+        _, current = self._find(prefix_word)
+        return self._complete(current, prefix_word, k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        if self.word_index is not None:
+            return [self.word_index.get(word, 0) for word in words]
+
+        # In sorted order the whole batch is answered in a single pass over the list
+        found = {}
+        prev = None
+        for word in sorted(set(words)):
+            prev, current = self._find(word, prev)
+            if current and current.word_frequency.word == word:
+                found[word] = current.word_frequency.frequency
+        return [found.get(word, 0) for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        # In sorted order each prefix is looked for from where the previous one started
+        completions = {}
+        prev = None
+        for prefix_word in sorted(set(prefixes)):
+            prev, current = self._find(prefix_word, prev)
+            completions[prefix_word] = self._complete(current, prefix_word, k)
+        return [completions[prefix_word] for prefix_word in prefixes]
+
+    def _complete(self, current: ListNode, prefix_word: str, k: int) -> [WordFrequency]:
+        # Words with the prefix are a contiguous run starting at the first word >= prefix
         autocomplete_list = []
+        while current and current.word_frequency.word.startswith(prefix_word):
+            autocomplete_list.append(current.word_frequency)
+            current = current.next
+
+        # Sort the list of possible words in descending order based on the word
+        # frequency, equal frequencies stay in alphabetical order
+        autocomplete_list.sort(key=lambda x: x.frequency, reverse=True)
+        return autocomplete_list[:k]
+
+    def save(self, path: str):
+        """
+        write the words and frequencies to a binary snapshot file
+        @param path: the snapshot file
+        """
+        write_snapshot(path, self._iter_words())
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        self.head = None
+        with gc_paused():
+            self.build_dictionary(read_snapshot(path))
 
+    def _iter_words(self):
+        # Every word with its frequency, from the head of the list
+        current = self.head
         while current:
-            if current.word_frequency.word.startswith(prefix_word):
-                autocomplete_list.append(current.word_frequency)
+            yield current.word_frequency
             current = current.next
 
-        # Sort the list of possible words in descending order based on the word frequency
-        autocomplete_list.sort(key=lambda x: x.frequency, reverse=True)
-        return autocomplete_list[:3]
+    def _find(self, word: str, prev: ListNode = None) -> (ListNode, ListNode):
+        # First node whose word is not before 'word' (None at the end of the
+        # list), and the node before it (None at the head). The walk starts
+        # after prev when given, which must come before 'word'.
+        current = prev.next if prev else self.head
+        while current and current.word_frequency.word < word:
+            prev = current
+            current = current.next
+        return prev, current
@@ -0,0 +1,99 @@
+from dictionary.word_frequency import WordFrequency
+from dictionary.snapshot import gc_paused
+from array import array
+import re
+
+# ------------------------------------------------------------------------
+# Bulk loader for word-frequency data files
+#
+# A data file has one "word frequency" pair per line. Rather than calling
+# line.split() and int() line by line, the file is read in large chunks and
+# each chunk is split in one call: its tokens alternate word, frequency, so
+# the words and frequencies are two slices of the token list. That only
+# holds when the chunk has no blank line and twice as many tokens as lines;
+# otherwise a blank line could make up for a line with extra values, and
+# the pairs after it would shift. Any other chunk falls back to
+# line-by-line parsing, which skips blank lines and keeps the first two
+# values of each line like the original loader did.
+# ------------------------------------------------------------------------
+
+CHUNK_SIZE = 1 << 20
+
+_BLANK_LINE = re.compile(r'\n[^\S\n]*\n')
+
+
+def iter_words_frequencies(path: str, chunk_size: int = CHUNK_SIZE):
+    """
+    stream the (word, frequency) pairs of a data file
+    @param path: the data file
+    @param chunk_size: number of characters read at a time
+    @return: generator of (word, frequency) tuples, in file order
+    """
+    for words, frequencies in _iter_chunks(path, chunk_size):
+        yield from zip(words, frequencies)
+
+
+def load_words_frequencies(path: str) -> [WordFrequency]:
+    """
+    read a data file into the list build_dictionary() expects
+    @param path: the data file
+    @return: list of (word, frequency), in file order
+    """
+    words_frequencies = []
+    with gc_paused():
+        for words, frequencies in _iter_chunks(path, CHUNK_SIZE):
+            words_frequencies.extend(map(WordFrequency, words, frequencies))
+    return words_frequencies
+
+
+def load_columns(path: str) -> ([str], array):
+    """
+    read a data file as two columns, without any per-word object
+    @param path: the data file
+    @return: list of words and array('q') of their frequencies, in file order
+    """
+    all_words = []
+    all_frequencies = array('q')
+    for words, frequencies in _iter_chunks(path, CHUNK_SIZE):
+        all_words.extend(words)
+        all_frequencies.extend(frequencies)
+    return all_words, all_frequencies
+
+
+def _iter_chunks(path: str, chunk_size: int):
+    # Generate (words, frequencies) lists for successive runs of whole lines
+    with open(path, 'r') as data_file:
+        leftover = ''
+        while True:
+            chunk = data_file.read(chunk_size)
+            if not chunk:
+                break
+
+            # Keep the trailing partial line for the next chunk
+            end = chunk.rfind('\n') + 1
+            if end == 0:
+                leftover += chunk
+                continue
+            lines = leftover + chunk[:end]
+            leftover = chunk[end:]
+            yield _split_lines(lines)
+
+        if leftover.strip():
+            yield _split_lines(leftover)
+
+
+def _split_lines(lines: str) -> ([str], [int]):
+    tokens = lines.split()
+    num_lines = lines.count('\n') + (not lines.endswith('\n'))
+    if len(tokens) == 2 * num_lines and not lines[:1].isspace() and not _BLANK_LINE.search(lines):
+        return tokens[0::2], list(map(int, tokens[1::2]))
+
+    # Blank lines or extra values: parse this chunk line by line
+    words = []
+    frequencies = []
+    for line in lines.split('\n'):
+        values = line.split()
+        if values:
+            words.append(values[0])
+            frequencies.append(int(values[1]))
+    return words, frequencies
@@ -0,0 +1,320 @@
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from dictionary.snapshot import gc_paused, read_snapshot, write_snapshot
+import heapq
+
+# ------------------------------------------------------------------------
+# Radix (compressed) trie-based dictionary implementation
+#
+# Chains of single-child nodes are merged into one node whose incoming edge
+# carries several letters, so a word costs one node per branching point
+# instead of one node per letter. Inserting a word that diverges in the
+# middle of an edge splits it; deleting a word merges a node that is left
+# with a single child back into it.
+# ------------------------------------------------------------------------
+
+
+# Class representing a node in the radix trie
+class RadixTrieNode:
+
+    __slots__ = ('label', 'frequency', 'is_last', 'max_frequency', 'children')
+
+    def __init__(self, label='', frequency=None, is_last=False):
+        self.label = label              # letters on the edge from the parent to this node
+        self.frequency = frequency      # frequency of the word if this node is the end of a word
+        self.is_last = is_last          # True if this node is the end of a word
+        self.max_frequency = 0          # highest frequency of any word in this subtree, 0 if there is none
+        self.children: dict[str, RadixTrieNode] = None  # children keyed by the first letter of their label, None for a leaf
+
+
+class RadixTrieDictionary(BaseDictionary):
+
+    def __init__(self):
+        self.root = RadixTrieNode()
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        for word_freq in words_frequencies:
+            self.add_word_frequency(word_freq)
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        node = self._traverse_word(word)
+        if node and node.is_last:
+            return node.frequency
+        return 0
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word = word_frequency.word
+        current = self.root
+        path = [current]
+        index = 0
+
+        while index < len(word):
+            child = current.children.get(word[index]) if current.children else None
+
+            # No edge starts with the next letter: hang the rest of the word as a leaf
+            if child is None:
+                child = RadixTrieNode(word[index:])
+                if current.children is None:
+                    current.children = {}
+                current.children[word[index]] = child
+                current = child
+                path.append(current)
+                break
+
+            # Length of the common part of the edge label and the rest of the word
+            label = child.label
+            common = 1
+            while common < len(label) and index + common < len(word) and label[common] == word[index + common]:
+                common += 1
+
+            # The word diverges or ends inside the edge: split it at that point
+            if common < len(label):
+                middle = RadixTrieNode(label[:common])
+                middle.max_frequency = child.max_frequency
+                middle.children = {label[common]: child}
+                child.label = label[common:]
+                current.children[word[index]] = middle
+                child = middle
+
+            current = child
+            path.append(current)
+            index += common
+
+        if current.is_last:
+            return False
+
+        current.is_last = True
+        current.frequency = word_frequency.frequency
+
+        # Raise the subtree bounds along the path
+        for node in path:
+            if word_frequency.frequency > node.max_frequency:
+                node.max_frequency = word_frequency.frequency
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        # traverse the trie to find the deleted word, remembering the path
+        current = self.root
+        path = [current]
+        index = 0
+        while index < len(word):
+            current = current.children.get(word[index]) if current.children else None
+            if current is None or not word.startswith(current.label, index):
+                return False
+            index += len(current.label)
+            path.append(current)
+
+        if not current.is_last:
+            return False
+
+        node = path[-1]
+        node.is_last = False
+        node.frequency = None
+
+        # Remove a leaf that no longer holds a word, then merge whichever node
+        # is left with a single child and no word of its own into that child
+        if not node.children:
+            parent = path[-2]
+            del parent.children[node.label[0]]
+            path.pop()
+            node = parent
+        if node is not self.root and not node.is_last and node.children and len(node.children) == 1:
+            (child,) = node.children.values()
+            child.label = node.label + child.label
+            path[-2].children[node.label[0]] = child
+            path[-1] = child
+
+        # Recompute the subtree bounds bottom-up
+        for node in reversed(path):
+            max_frequency = node.frequency if node.is_last else 0
+            for child_node in (node.children or {}).values():
+                if child_node.max_frequency > max_frequency:
+                    max_frequency = child_node.max_frequency
+            node.max_frequency = max_frequency
+        return True
+
+    def autocomplete(self, word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'word' as a prefix
+        @param word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'word'
+        """
+        node, node_word = self._traverse_prefix(word)
+        return self._complete(node, node_word, k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        found = {word: node.frequency for word, node, node_word in self._traverse_many(words)
+                 if node and node_word == word and node.is_last}
+        return [found.get(word, 0) for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        completions = {word: self._complete(node, node_word, k)
+                       for word, node, node_word in self._traverse_many(prefixes)}
+        return [completions[word] for word in prefixes]
+
+    def _complete(self, node: RadixTrieNode, node_word: str, k: int) -> [WordFrequency]:
+        # k most-frequent words below a node whose path from the root spells node_word
+        if not node or not node.max_frequency:
+            return []
+
+        # Best-first search over subtrees keyed by their bound and words keyed by
+        # their frequency; equal frequencies come out in alphabetical order.
+        # Entries: (-frequency, word, is_subtree, node)
+        heap = [(-node.max_frequency, node_word, True, node)]
+        autocomplete_list = []
+
+        while heap and len(autocomplete_list) < k:
+            neg_frequency, node_word, is_subtree, current = heapq.heappop(heap)
+
+            if not is_subtree:
+                autocomplete_list.append(WordFrequency(node_word, -neg_frequency))
+                continue
+
+            if current.is_last:
+                heapq.heappush(heap, (-current.frequency, node_word, False, None))
+            if not current.children:
+                continue
+            for child_node in current.children.values():
+                if child_node.max_frequency:
+                    heapq.heappush(heap, (-child_node.max_frequency, node_word + child_node.label, True, child_node))
+
+        return autocomplete_list
+
+    def save(self, path: str):
+        """
+        write the words and frequencies to a binary snapshot file
+        @param path: the snapshot file
+        """
+        write_snapshot(path, self._iter_words())
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        self.root = RadixTrieNode()
+        with gc_paused():
+            self.build_dictionary(read_snapshot(path))
+
+    def node_count(self) -> int:
+        """
+        number of nodes in the trie, including the root
+        """
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            if node.children:
+                stack.extend(node.children.values())
+        return count
+
+    def _traverse_word(self, word: str) -> RadixTrieNode:
+        # Node spelling exactly 'word', None if there is no such node
+        current = self.root
+        index = 0
+        while index < len(word):
+            current = current.children.get(word[index]) if current.children else None
+            if current is None or not word.startswith(current.label, index):
+                return None
+            index += len(current.label)
+        return current
+
+    def _traverse_prefix(self, word: str) -> (RadixTrieNode, str):
+        # Highest node whose subtree holds every word starting with 'word', and the
+        # letters leading to it, which may run past 'word' inside the last edge
+        current = self.root
+        index = 0
+        while index < len(word):
+            child = current.children.get(word[index]) if current.children else None
+            if child is None:
+                return None, None
+            label = child.label
+            if word.startswith(label, index):
+                index += len(label)
+            elif label.startswith(word[index:]):
+                return child, word[:index] + label
+            else:
+                return None, None
+            current = child
+        return current, word
+
+    def _traverse_many(self, words: [str]):
+        # _traverse_prefix() of each distinct word as (word, node, node_word),
+        # walking the words in sorted order. The nodes along the previous word
+        # are kept with the length of the letters leading to them, so each word
+        # resumes from the deepest one that only spells letters it shares.
+        path = [(self.root, 0)]
+        previous = ''
+        for word in sorted(set(words)):
+            common = 0
+            limit = min(len(word), len(previous))
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            while path[-1][1] > common:
+                path.pop()
+
+            current, index = path[-1]
+            node, node_word = current, word
+            while index < len(word):
+                child = current.children.get(word[index]) if current.children else None
+                if child is None:
+                    node, node_word = None, None
+                    break
+                label = child.label
+                if word.startswith(label, index):
+                    index += len(label)
+                elif label.startswith(word[index:]):
+                    node, node_word = child, word[:index] + label
+                    break
+                else:
+                    node, node_word = None, None
+                    break
+                current = child
+                path.append((current, index))
+                node = current
+
+            yield word, node, node_word
+            previous = word
+
+    def _iter_words(self):
+        # Every word with its frequency, in depth-first order
+        stack = [(self.root, '')]
+        while stack:
+            node, node_word = stack.pop()
+            if node.is_last:
+                yield WordFrequency(node_word, node.frequency)
+            if node.children:
+                for child_node in reversed(node.children.values()):
+                    stack.append((child_node, node_word + child_node.label))
@@ -0,0 +1,102 @@
+import heapq
+
+# ------------------------------------------------------------------------
+# Range-maximum index over a sequence of frequencies
+#
+# Bottom-up segment tree whose nodes hold the position of the highest
+# frequency in their range (leftmost one on ties). Building is O(n), a range
+# query is O(log n), and the k highest frequencies of a range come out in
+# O(k log n) by repeatedly splitting the range around its maximum.
+# ------------------------------------------------------------------------
+
+class RangeMaxIndex:
+
+    def __init__(self, frequencies, tree=None):
+        """
+        build the index
+        @param frequencies: sequence of frequencies, indexed by position
+        @param tree: the 'tree' of an index built earlier over the same frequencies, to reuse instead of building
+        """
+        self.frequencies = frequencies
+        self.size = len(frequencies)
+        if tree is not None:
+            self.tree = tree
+            return
+
+        # Leaves live at [size, 2 * size), internal node i covers its children 2i and 2i + 1
+        tree = [0] * self.size + list(range(self.size))
+        for node in range(self.size - 1, 0, -1):
+            tree[node] = self._best(tree[2 * node], tree[2 * node + 1])
+        self.tree = tree
+
+    def argmax(self, lo: int, hi: int) -> int:
+        """
+        position of the highest frequency in frequencies[lo:hi]
+        @param lo: start of the range (inclusive)
+        @param hi: end of the range (exclusive), must be > lo
+        @return: the position, the leftmost one when several are equally high
+        """
+        tree = self.tree
+        best = lo
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                best = self._best(best, tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = self._best(best, tree[hi])
+            lo >>= 1
+            hi >>= 1
+        return best
+
+    def top_k(self, lo: int, hi: int, k: int) -> [int]:
+        """
+        positions of the k highest frequencies in frequencies[lo:hi]
+        @param lo: start of the range (inclusive)
+        @param hi: end of the range (exclusive)
+        @param k: number of positions wanted
+        @return: up to k positions, highest frequency first and by position on ties
+        """
+        result = []
+        if k <= 0:
+            return result
+        for position in self.iter_top(lo, hi):
+            result.append(position)
+            if len(result) == k:
+                break
+        return result
+
+    def iter_top(self, lo: int, hi: int):
+        """
+        generate the positions of frequencies[lo:hi] from the highest frequency down,
+        for callers that do not know in advance how many they will keep
+        @param lo: start of the range (inclusive)
+        @param hi: end of the range (exclusive)
+        @return: generator of positions, highest frequency first and by position on ties
+        """
+        if lo >= hi:
+            return
+
+        # Each heap entry is a sub-range keyed by its maximum; popping one yields
+        # the next best position and leaves the two sides of it as new sub-ranges
+        best = self.argmax(lo, hi)
+        heap = [(-self.frequencies[best], best, lo, hi)]
+        while heap:
+            _, best, lo, hi = heapq.heappop(heap)
+            yield best
+            if lo < best:
+                left = self.argmax(lo, best)
+                heapq.heappush(heap, (-self.frequencies[left], left, lo, best))
+            if best + 1 < hi:
+                right = self.argmax(best + 1, hi)
+                heapq.heappush(heap, (-self.frequencies[right], right, best + 1, hi))
+
+    def _best(self, i: int, j: int) -> int:
+        # Higher frequency wins, the earlier position wins a tie
+        fi = self.frequencies[i]
+        fj = self.frequencies[j]
+        if fi > fj or (fi == fj and i < j):
+            return i
+        return j
@@ -0,0 +1,235 @@
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from dictionary.snapshot import gc_paused, read_snapshot, write_snapshot
+import heapq
+import random
+
+# ------------------------------------------------------------------------
+# Skip-list-based dictionary implementation
+#
+# An ordered linked list of words where every node also carries links that
+# skip ahead: a node is on level i with probability P ** i, and each level is
+# itself a sorted linked list. Searches start on the highest level and drop
+# down a level whenever the next node would overshoot, which takes expected
+# O(log n) steps; inserting and deleting only relink the nodes found on the
+# way down. The words with a given prefix are a contiguous run at the bottom
+# level, which autocomplete scans from the first of them.
+# ------------------------------------------------------------------------
+
+
+class SkipListNode:
+
+    __slots__ = ('word_frequency', 'next')
+
+    def __init__(self, word_frequency: WordFrequency, level: int):
+        self.word_frequency = word_frequency
+        self.next: [SkipListNode] = [None] * level     # next node on each level, level 0 is the full list
+
+
+class SkipListDictionary(BaseDictionary):
+
+    # probability that a node on one level is also on the next one
+    P = 0.25
+    # highest number of levels, enough for P ** -MAX_LEVEL words
+    MAX_LEVEL = 16
+
+    def __init__(self, seed=None):
+        """
+        @param seed: seed of the generator drawing node levels, for reproducible layouts
+        """
+        self.random = random.Random(seed)
+        self.head = SkipListNode(None, self.MAX_LEVEL)     # sentinel before the first word, on every level
+        self.level = 1                                      # number of levels in use
+
+    def build_dictionary(self, words_frequencies: [WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        # Words already in the list are rebuilt along with the new ones; a
+        # repeated word keeps its last frequency
+        latest = {word_freq.word: word_freq for word_freq in self._iter_words()}
+        for word_freq in words_frequencies:
+            latest[word_freq.word] = word_freq
+
+        # Sort the words once and append each node to the tail of every level it is on
+        self.head = SkipListNode(None, self.MAX_LEVEL)
+        self.level = 1
+        tails = [self.head] * self.MAX_LEVEL
+        with gc_paused():
+            for word in sorted(latest):
+                level = self._random_level()
+                new_node = SkipListNode(latest[word], level)
+                for i in range(level):
+                    tails[i].next[i] = new_node
+                    tails[i] = new_node
+                if level > self.level:
+                    self.level = level
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        node = self._find_first(word)
+        if node and node.word_frequency.word == word:
+            return node.word_frequency.frequency
+        return 0
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word = word_frequency.word
+        update = self._find_predecessors(word)
+        node = update[0].next[0]
+        if node and node.word_frequency.word == word:
+            return False
+
+        # Levels the list did not use yet start from the head
+        level = self._random_level()
+        if level > self.level:
+            self.level = level
+
+        new_node = SkipListNode(word_frequency, level)
+        for i in range(level):
+            new_node.next[i] = update[i].next[i]
+            update[i].next[i] = new_node
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when word not found
+        """
+        update = self._find_predecessors(word)
+        node = update[0].next[0]
+        if not node or node.word_frequency.word != word:
+            return False
+
+        for i in range(len(node.next)):
+            update[i].next[i] = node.next[i]
+
+        # Drop the levels left empty
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        return True
+
+    def autocomplete(self, prefix_word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'prefix_word'
+        """
+        return self._complete(self._find_first(prefix_word), prefix_word, k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        found = {}
+        for word, node in self._find_first_many(words):
+            if node and node.word_frequency.word == word:
+                found[word] = node.word_frequency.frequency
+        return [found.get(word, 0) for word in words]
+
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
+        """
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
+        """
+        completions = {prefix_word: self._complete(node, prefix_word, k)
+                       for prefix_word, node in self._find_first_many(prefixes)}
+        return [completions[prefix_word] for prefix_word in prefixes]
+
+    def save(self, path: str):
+        """
+        write the words and frequencies to a binary snapshot file
+        @param path: the snapshot file
+        """
+        write_snapshot(path, self._iter_words())
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        self.head = SkipListNode(None, self.MAX_LEVEL)
+        self.level = 1
+        with gc_paused():
+            self.build_dictionary(read_snapshot(path))
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and self.random.random() < self.P:
+            level += 1
+        return level
+
+    def _find_predecessors(self, word: str) -> [SkipListNode]:
+        # Last node before 'word' on each level, the head on levels not in use
+        update = [self.head] * self.MAX_LEVEL
+        current = self.head
+        for i in range(self.level - 1, -1, -1):
+            next_node = current.next[i]
+            while next_node and next_node.word_frequency.word < word:
+                current = next_node
+                next_node = current.next[i]
+            update[i] = current
+        return update
+
+    def _find_first(self, word: str) -> SkipListNode:
+        # First node whose word is not before 'word', None if there is none
+        current = self.head
+        for i in range(self.level - 1, -1, -1):
+            next_node = current.next[i]
+            while next_node and next_node.word_frequency.word < word:
+                current = next_node
+                next_node = current.next[i]
+        return current.next[0]
+
+    def _find_first_many(self, words: [str]):
+        # _find_first() of each distinct word as (word, node), in sorted order.
+        # The predecessors of the previous word all come before the next one, so
+        # on each level the walk resumes from whichever of the node reached from
+        # the level above and the previous predecessor on this level is further.
+        update = [self.head] * self.MAX_LEVEL
+        for word in sorted(set(words)):
+            current = self.head
+            for i in range(self.level - 1, -1, -1):
+                finger = update[i]
+                if finger is not self.head and (current is self.head or
+                                                finger.word_frequency.word > current.word_frequency.word):
+                    current = finger
+                next_node = current.next[i]
+                while next_node and next_node.word_frequency.word < word:
+                    current = next_node
+                    next_node = current.next[i]
+                update[i] = current
+            yield word, current.next[0]
+
+    def _complete(self, node: SkipListNode, prefix_word: str, k: int) -> [WordFrequency]:
+        # Scan the run of words with the prefix at the bottom level from its
+        # first node, equal frequencies stay in alphabetical order
+        return heapq.nlargest(k, self._iter_run(node, prefix_word), key=lambda x: x.frequency)
+
+    def _iter_run(self, node: SkipListNode, prefix_word: str):
+        # Words starting with the prefix, from the first of them, in alphabetical order
+        while node and node.word_frequency.word.startswith(prefix_word):
+            yield node.word_frequency
+            node = node.next[0]
+
+    def _iter_words(self):
+        # Every word with its frequency, in alphabetical order
+        node = self.head.next[0]
+        while node:
+            yield node.word_frequency
+            node = node.next[0]
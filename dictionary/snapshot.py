@@ -0,0 +1,128 @@
+from dictionary.word_frequency import WordFrequency
+from contextlib import contextmanager
+from itertools import accumulate
+import gc
+import struct
+
+# ------------------------------------------------------------------------
+# Binary snapshot of a dictionary's words and frequencies
+#
+# Words are written in the order the dictionary keeps them, as
+# length-prefixed UTF-8 strings, with varint frequencies (7 bits per byte,
+# low bits first). Each kind of field is kept in its own column so that a
+# snapshot is read with one bulk read and mostly decoded by C-level bytes
+# operations instead of parsing and splitting line by line.
+#
+# Layout:
+#   header        magic, number of words, byte size of each column below
+#   lengths       varint per word, byte length of the word
+#   words         every word, UTF-8, back to back
+#   frequencies   varint per word
+# ------------------------------------------------------------------------
+
+MAGIC = b'WFSNAP01'
+_HEADER = struct.Struct('<8sqqqq')
+
+
+def write_snapshot(path: str, words_frequencies):
+    """
+    write words and frequencies to a snapshot file, in the given order
+    @param path: the snapshot file
+    @param words_frequencies: iterable of WordFrequency
+    @raise ValueError: when a frequency is negative, before the file is opened
+    """
+    lengths = bytearray()
+    words = []
+    frequencies = bytearray()
+
+    for word_freq in words_frequencies:
+        word = word_freq.word.encode()
+        _append_varint(lengths, len(word))
+        words.append(word)
+        # Varints only hold non-negative numbers
+        if word_freq.frequency < 0:
+            raise ValueError(f"cannot write the negative frequency {word_freq.frequency} of "
+                             f"'{word_freq.word}' to a snapshot")
+        _append_varint(frequencies, word_freq.frequency)
+
+    word_bytes = b''.join(words)
+    with open(path, 'wb') as snapshot_file:
+        snapshot_file.write(_HEADER.pack(MAGIC, len(words), len(lengths), len(word_bytes), len(frequencies)))
+        snapshot_file.write(lengths)
+        snapshot_file.write(word_bytes)
+        snapshot_file.write(frequencies)
+
+
+def read_snapshot(path: str) -> [WordFrequency]:
+    """
+    read back the words and frequencies of a snapshot file
+    @param path: the snapshot file
+    @return: list of (word, frequency), in the order they were written
+    """
+    with open(path, 'rb') as snapshot_file:
+        data = snapshot_file.read()
+
+    magic, count, lengths_size, words_size, frequencies_size = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError('not a dictionary snapshot')
+
+    position = _HEADER.size
+    lengths = _read_varints(data[position:position + lengths_size])
+    position += lengths_size
+    word_bytes = data[position:position + words_size]
+    position += words_size
+    frequencies = _read_varints(data[position:position + frequencies_size])
+
+    # Cut the words apart; ASCII text is decoded once and sliced as str
+    ends = list(accumulate(lengths))
+    starts = [0] + ends[:-1]
+    if word_bytes.isascii():
+        text = word_bytes.decode('ascii')
+        words = [text[start:end] for start, end in zip(starts, ends)]
+    else:
+        words = [word_bytes[start:end].decode() for start, end in zip(starts, ends)]
+
+    return list(map(WordFrequency, words, frequencies))
+
+
+@contextmanager
+def gc_paused():
+    """
+    pause the cyclic garbage collector around a bulk load. Creating many objects
+    otherwise triggers repeated full collections that walk every object already
+    alive, and the words, frequencies and nodes being loaded hold no cycles.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _append_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varints(data: bytes) -> [int]:
+    # Columns of small numbers are one byte per value and need no decoding
+    if data.isascii():
+        return list(data)
+
+    values = []
+    append = values.append
+    value = 0
+    shift = 0
+    for byte in data:
+        if byte < 0x80:
+            append(value | byte << shift)
+            value = 0
+            shift = 0
+        else:
+            value |= (byte - 0x80) << shift
+            shift += 7
+    return values
@@ -0,0 +1,112 @@
+from dictionary.word_frequency import WordFrequency
+from dictionary.trie_dictionary import TrieNode, TrieDictionary
+
+# ------------------------------------------------------------------------
+# Trie-based dictionary that caches the best completions at every node
+#
+# Each node keeps the k most frequent words of its subtree, so autocomplete
+# only has to walk down the prefix: O(len(prefix)) whatever the subtree size.
+# The caches are refreshed bottom-up along the path of an added/deleted word.
+# ------------------------------------------------------------------------
+
+
+# Trie node with a cache of the best completions below it
+class TopKTrieNode(TrieNode):
+
+    __slots__ = ('top_words',)
+
+    def __init__(self, frequency=None, is_last=False):
+        super().__init__(frequency, is_last)
+        self.top_words: [WordFrequency] = []        # k most frequent words in this subtree, most frequent first
+
+
+class TopKTrieDictionary(TrieDictionary):
+
+    node_class = TopKTrieNode
+
+    def __init__(self, k: int = 3, hash_index: bool = False):
+        # number of completions cached at each node
+        self.k = k
+        super().__init__(hash_index)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        if not super().add_word_frequency(word_frequency):
+            return False
+
+        word = word_frequency.word
+        path = self._traverse_path(word)
+
+        # Refresh the caches from the word's node up to the root. If the new word
+        # does not make it into a node's cache, it cannot make it into any ancestor's.
+        for depth in range(len(word), -1, -1):
+            top_words = path[depth].top_words
+            if len(top_words) == self.k and word_frequency.frequency < top_words[-1].frequency:
+                break
+            self._refresh_top_words(path[depth], word[:depth])
+
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        path = self._remove_word(word)
+        if path is None:
+            return False
+
+        # Refresh the caches that held the deleted word, they are always a
+        # contiguous run starting at the word's own node (or at the deepest node
+        # left on its path, when the nodes that led only to it were pruned)
+        for depth in range(len(path) - 1, -1, -1):
+            if not any(item.word == word for item in path[depth].top_words):
+                break
+            self._refresh_top_words(path[depth], word[:depth])
+
+        return True
+
+    def _complete(self, node: TopKTrieNode, word: str, k: int) -> [WordFrequency]:
+        # Deeper lists than the cache holds fall back to the best-first search
+        if k > self.k:
+            return super()._complete(node, word, k)
+
+        if not node:
+            return []
+
+        return node.top_words[:k]
+
+    def _finish_node(self, node: TopKTrieNode, word_prefix: str):
+        # Bulk builds and loads complete a subtree at a time: fill its cache then
+        self._refresh_top_words(node, word_prefix)
+
+    def _traverse_path(self, word: str) -> [TopKTrieNode]:
+        # Nodes visited from the root to the last letter of an existing word
+        current = self.root
+        path = [current]
+        for letter in word:
+            current = current.children[letter]
+            path.append(current)
+
+        return path
+
+    def _refresh_top_words(self, node: TopKTrieNode, word_prefix: str):
+        # The best k words of a subtree are among the node's own word and the
+        # best k words of each child. Candidates are listed in the same order as
+        # a depth-first walk, so the stable sort breaks ties the same way the
+        # plain trie does.
+        candidates = [WordFrequency(word_prefix, node.frequency)] if node.is_last else []
+        if not node.children:
+            node.top_words = candidates
+            return
+
+        for child_node in node.children.values():
+            candidates.extend(child_node.top_words)
+
+        candidates.sort(key=lambda x: x.frequency, reverse=True)
+        node.top_words = candidates[:self.k]
@@ -1,5 +1,8 @@
 from dictionary.base_dictionary import BaseDictionary
 from dictionary.word_frequency import WordFrequency
+from dictionary.snapshot import gc_paused, read_snapshot, write_snapshot
+import heapq
+import sys
 
 # ------------------------------------------------------------------------
 # This class is required TO BE IMPLEMENTED
@@ -10,43 +13,57 @@ from dictionary.word_frequency import WordFrequency
 # ------------------------------------------------------------------------
 
 
-# Class representing a node in the Trie
+# Class representing a node in the Trie. The letter of a node is the key under
+# which its parent stores it, so it is not repeated here, and leaves do not get
+# a children hashtable until they need one.
 class TrieNode:
 
-    def __init__(self, letter=None, frequency=None, is_last=False):
-        self.letter = letter            # letter stored at this node
+    __slots__ = ('frequency', 'is_last', 'max_frequency', 'children')
+
+    def __init__(self, frequency=None, is_last=False):
         self.frequency = frequency      # frequency of the word if this letter is the end of a word
         self.is_last = is_last          # True if this letter is the end of a word
-        self.children: dict[str, TrieNode] = {}     # a hashtable containing children nodes, key = letter, value = child node
+        self.max_frequency = 0          # highest frequency of any word in this subtree, 0 if there is none
+        self.children: dict[str, TrieNode] = None   # a hashtable containing children nodes, key = letter, value = child node, None for a leaf
 
 
 class TrieDictionary(BaseDictionary):
 
-    def __init__(self):
-        self.root = TrieNode()
+    # node type created for every letter, subclasses can swap in a richer node
+    node_class = TrieNode
+
+    # optional hook _finish_node(node, word_prefix), called by bulk builds once a
+    # node's subtree is complete
+    _finish_node = None
+
+    def __init__(self, hash_index: bool = False):
+        """
+        @param hash_index: also keep a word -> frequency hashtable, which answers exact
+            searches without walking the trie letter by letter
+        """
+        self.root = self.node_class()
+        self.version = 0        # bumped by every change, so that sessions know their nodes may be stale
+        # word -> frequency of every word in the trie, None when not kept
+        self.word_index: dict[str, int] = {} if hash_index else None
 
     def build_dictionary(self, words_frequencies: [WordFrequency]):
         """
         construct the data structure to store nodes
         @param words_frequencies: list of (word, frequency) to be stored
         """
-        for word_freq in words_frequencies:
-
-            # Starting from the root
-            current = self.root
-            word = word_freq.word
-
-            # Add letter in the word as a trie node if it does not exists in the trie
-            for letter in word:
-                if letter not in current.children:
-                    current.children[letter] = TrieNode(letter)
+        # Words already in the trie are rebuilt along with the new ones, listed
+        # first so that a repeated word keeps the new frequency
+        if self.root.children or self.root.is_last:
+            words_frequencies = list(self._iter_words()) + list(words_frequencies)
 
-                # Assign the current letter to its parent node
-                current = current.children[letter]
-
-            # Set the node containing the last letter 
-            current.is_last = True
-            current.frequency = word_freq.frequency
+        # Sort once, then build in a single pass that reuses the prefix each
+        # word shares with the previous one instead of walking down from the root.
+        # The new trie replaces the old one only once it is complete.
+        words_frequencies = sorted(words_frequencies, key=lambda wf: wf.word)
+        with gc_paused():
+            self.root = self._build_from_preorder(words_frequencies)
+        self._rebuild_word_index(words_frequencies)
+        self.version += 1
 
 
     def search(self, word: str) -> int:
@@ -55,6 +72,9 @@ class TrieDictionary(BaseDictionary):
         @param word: the word to be searched
         @return: frequency > 0 if found and 0 if NOT found
         """
+        if self.word_index is not None:
+            return self.word_index.get(word, 0)
+
         # traverse the trie to find the word
         node = self._traverse_word(word)
 
@@ -73,15 +93,22 @@ class TrieDictionary(BaseDictionary):
         @param word_frequency: (word, frequency) to be added
         :return: True whether succeeded, False when word is already in the dictionary
         """
+        word = word_frequency.word
+        if self.word_index is not None and word in self.word_index:
+            return False
+
         # Starting from the root
         current = self.root
-        word = word_frequency.word
+        path = [current]
 
         # Add letter in the word as a trie node if it does not exists in the trie
         for letter in word:
+            if current.children is None:
+                current.children = {}
             if letter not in current.children:
-                current.children[letter] = TrieNode(letter)
+                current.children[letter] = self.node_class()
             current = current.children[letter]
+            path.append(current)
 
         # Return false if found the word already exists in the trie
         if current.is_last:
@@ -90,6 +117,14 @@ class TrieDictionary(BaseDictionary):
         # Otherwise, add it to the trie, set the node containing the last letter
         current.is_last = True
         current.frequency = word_frequency.frequency
+
+        # Raise the subtree bounds along the path
+        for node in path:
+            if word_frequency.frequency > node.max_frequency:
+                node.max_frequency = word_frequency.frequency
+        if self.word_index is not None:
+            self.word_index[word] = word_frequency.frequency
+        self.version += 1
         return True
 
     def delete_word(self, word: str) -> bool:
@@ -98,42 +133,284 @@ class TrieDictionary(BaseDictionary):
         @param word: word to be deleted
         @return: whether succeeded, e.g. return False when point not found
         """
+        return self._remove_word(word) is not None
 
-        # traverse the trie to find the deleted word
-        node = self._traverse_word(word)
+    def compact(self) -> dict:
+        """
+        rebuild the trie into fresh nodes, laid out in depth-first order with children
+        tables sized to what they hold, dropping every node that leads to no word
+        @return: dict of nodes, live_nodes, dead_nodes, bytes_before, bytes_after, bytes_reclaimed
+        """
+        nodes, live_nodes, bytes_before = self._node_stats(self.root)
+
+        # The words are read back in depth-first order, which keeps the children
+        # of every node in the same order, and so the same answers to ties
+        with gc_paused():
+            self.root = self._build_from_preorder(self._iter_words())
+        self.version += 1
+
+        bytes_after = self._node_stats(self.root)[2]
+        return {
+            'nodes': nodes,
+            'live_nodes': live_nodes,
+            'dead_nodes': nodes - live_nodes,
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after,
+            'bytes_reclaimed': bytes_before - bytes_after,
+        }
+
+    def autocomplete(self, word: str, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have 'word' as a prefix
+        @param word: word to be autocompleted
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with prefix 'word'
+        """
 
-        # Delete the word if found and return true
-        if node and node.is_last:
-            node.is_last = False
-            return True
-        
-        # Return false if do not found it
-        return False
+        # traverse the trie to find the prefix word
+        return self._complete(self._traverse_word(word), word, k)
+
+    def search_many(self, words: [str]) -> [int]:
+        """
+        search for several words at once
+        @param words: the words to be searched
+        @return: the frequency of each word, in the same order, 0 for a word NOT found
+        """
+        if self.word_index is not None:
+            return [self.word_index.get(word, 0) for word in words]
 
+        found = {word: node.frequency for word, node in self._traverse_many(words) if node and node.is_last}
+        return [found.get(word, 0) for word in words]
 
-    def autocomplete(self, word: str) -> [WordFrequency]:
+    def autocomplete_many(self, prefixes: [str], k: int = 3) -> [[WordFrequency]]:
         """
-        return a list of 3 most-frequent words in the dictionary that have 'word' as a prefix
-        @param word: word to be autocompleted
-        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'word'
+        autocomplete several prefixes at once
+        @param prefixes: words to be autocompleted
+        @param k: maximum number of words to return for each prefix
+        @return: the autocomplete list of each prefix, in the same order
         """
+        completions = {word: self._complete(node, word, k) for word, node in self._traverse_many(prefixes)}
+        return [completions[word] for word in prefixes]
 
-        # traverse the trie to find the prefix word
-        node = self._traverse_word(word)
+    def autocomplete_fuzzy(self, word: str, max_edits: int = 1, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) words that start within max_edits edits (letters inserted, deleted
+        or replaced) of 'word', the closest first and, among equally close ones, the most frequent first
+        @param word: word to be autocompleted, possibly mistyped
+        @param max_edits: maximum number of edits between 'word' and the start of a returned word
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k words with their frequencies
+        """
+        # The same best-first search as _complete(), keyed by edits before
+        # frequency. A word is as close as the closest of its prefixes. Each
+        # subtree carries the row of edit distances between its word prefix and
+        # every prefix of 'word' (a Levenshtein DP row), and 'reached', the
+        # distance of the closest prefix seen on the way down. Rows never get a
+        # smaller minimum further down, so the words of a subtree are at least
+        # min(reached, min(row)) edits away: the key of a subtree is that bound
+        # and its highest frequency, and once reached <= min(row), every word
+        # below is exactly 'reached' edits away and the row is dropped.
+        # Entries: (edits, -frequency, path, is_subtree, word, node, row, reached)
+        root = self.root
+        if not root.max_frequency:
+            return []
+        # Distances above max_edits are all kept as 'limit', they make no difference
+        limit = max_edits + 1
+        row = [min(position, limit) for position in range(len(word) + 1)] if word else None
+        heap = [(0, -root.max_frequency, (), True, '', root, row, min(len(word), limit))]
+        autocomplete_list = []
+        word_letters = set(word)
+
+        while heap and len(autocomplete_list) < k:
+            edits, neg_frequency, path, is_subtree, word_prefix, current, row, reached = heapq.heappop(heap)
+
+            if not is_subtree:
+                autocomplete_list.append(WordFrequency(word_prefix, -neg_frequency))
+                continue
+
+            if current.is_last and reached <= max_edits:
+                heapq.heappush(heap, (reached, -current.frequency, path, False, word_prefix, None, None, reached))
+            if not current.children:
+                continue
+
+            # The children's rows: a prefix of 'word' whose length is more than
+            # max_edits away from theirs is too far whatever the letters, so
+            # only the band of positions around their depth is computed. A row
+            # only depends on the letter, and is the same for every letter that
+            # does not occur in 'word' (kept under None).
+            depth = len(word_prefix) + 1
+            first = max(1, depth - max_edits)
+            last = min(len(word), depth + max_edits)
+            next_rows = {}
+            for index, (letter, child_node) in enumerate(current.children.items()):
+                if not child_node.max_frequency:
+                    continue
+                if row is None:
+                    heapq.heappush(heap, (reached, -child_node.max_frequency, path + (index,), True,
+                                          word_prefix + letter, child_node, None, reached))
+                    continue
+
+                key = letter if letter in word_letters else None
+                if key not in next_rows:
+                    next_row = [limit] * len(row)
+                    if depth < limit:
+                        next_row[0] = depth
+                    for position in range(first, last + 1):
+                        distance = row[position - 1] + (key != word[position - 1])
+                        if row[position] < distance:
+                            distance = row[position] + 1
+                        if next_row[position - 1] < distance:
+                            distance = next_row[position - 1] + 1
+                        next_row[position] = distance if distance < limit else limit
+                    next_rows[key] = next_row, min(next_row)
+                next_row, lowest = next_rows[key]
+                child_reached = min(reached, next_row[-1])
+                if min(child_reached, lowest) > max_edits:
+                    continue
+                if child_reached <= lowest:
+                    heapq.heappush(heap, (child_reached, -child_node.max_frequency, path + (index,), True,
+                                          word_prefix + letter, child_node, None, child_reached))
+                else:
+                    heapq.heappush(heap, (lowest, -child_node.max_frequency, path + (index,), True,
+                                          word_prefix + letter, child_node, next_row, child_reached))
+
+        return autocomplete_list
+
+    def _complete(self, node: TrieNode, word: str, k: int) -> [WordFrequency]:
+        # k most-frequent words below the node reached by 'word'
 
         # If do not find the prefix word, return an empty array
-        if not node:
+        if not node or not node.max_frequency:
             return []
 
+        # Best-first search: the heap holds whole subtrees keyed by their bound and
+        # single words keyed by their frequency. A word popped from the heap beats
+        # everything still in it, so we can stop after k words. Ties are broken by
+        # the position in a depth-first walk (path of child indexes), the same
+        # order a full collect-and-stable-sort would give.
+        # Entries: (-frequency, path, is_subtree, word, node)
+        heap = [(-node.max_frequency, (), True, word, node)]
         autocomplete_list = []
 
-        # If found, run the function to get the words starting with that prefix
-        self._collect_autocomplete_words(node, word, autocomplete_list)
+        while heap and len(autocomplete_list) < k:
+            neg_frequency, path, is_subtree, word_prefix, current = heapq.heappop(heap)
+
+            if not is_subtree:
+                autocomplete_list.append(WordFrequency(word_prefix, -neg_frequency))
+                continue
+
+            # Expand the subtree into its own word and its children's subtrees
+            if current.is_last:
+                heapq.heappush(heap, (-current.frequency, path, False, word_prefix, None))
+            if not current.children:
+                continue
+            for index, (letter, child_node) in enumerate(current.children.items()):
+                if child_node.max_frequency:
+                    heapq.heappush(heap, (-child_node.max_frequency, path + (index,), True,
+                                          word_prefix + letter, child_node))
 
-        # Sort the possible words list in reverse order
-        autocomplete_list.sort(key=lambda x: x.frequency, reverse=True)
+        return autocomplete_list
 
-        return autocomplete_list[:3]
+    def save(self, path: str):
+        """
+        write the words and frequencies to a binary snapshot file
+        @param path: the snapshot file
+        """
+        write_snapshot(path, self._iter_words())
+
+    def load(self, path: str):
+        """
+        replace the dictionary with the words of a snapshot file written by save()
+        @param path: the snapshot file
+        """
+        words_frequencies = read_snapshot(path)
+        with gc_paused():
+            self.root = self._build_from_preorder(words_frequencies)
+        self._rebuild_word_index(words_frequencies)
+        self.version += 1
+
+    def session(self) -> 'TrieSession':
+        """
+        start a type-ahead session, which autocompletes a prefix typed a letter at a time
+        @return: the session, with an empty prefix
+        """
+        return TrieSession(self)
+
+    def _remove_word(self, word: str) -> [TrieNode]:
+        # Delete a word, returning the nodes left along its path (the root first),
+        # or None if the word is not in the dictionary
+        if self.word_index is not None and word not in self.word_index:
+            return None
+
+        # traverse the trie to find the deleted word, remembering the path
+        current = self.root
+        path = [current]
+        for letter in word:
+            if not current.children or letter not in current.children:
+                return None
+            current = current.children[letter]
+            path.append(current)
+
+        # Return None if do not found it
+        if not current.is_last:
+            return None
+
+        # Delete the word and the nodes that led only to it, then recompute the
+        # subtree bounds bottom-up, an ancestor whose bound does not change
+        # leaves the ones above it unchanged too
+        current.is_last = False
+        current.frequency = None
+        self._prune(path, word)
+        if self.word_index is not None:
+            del self.word_index[word]
+        self.version += 1
+        for node in reversed(path):
+            max_frequency = node.frequency if node.is_last else 0
+            for child_node in (node.children or {}).values():
+                if child_node.max_frequency > max_frequency:
+                    max_frequency = child_node.max_frequency
+            if max_frequency == node.max_frequency:
+                break
+            node.max_frequency = max_frequency
+        return path
+
+    def _rebuild_word_index(self, words_frequencies: [WordFrequency]):
+        # Index the words the trie was just built from, when kept; a repeated
+        # word keeps its last frequency, as in the trie
+        if self.word_index is not None:
+            self.word_index = {word_freq.word: word_freq.frequency for word_freq in words_frequencies}
+
+    def _prune(self, path: [TrieNode], word: str):
+        # Unlink the nodes at the end of the path along 'word' that neither end
+        # a word nor have children, popping them off the path
+        while len(path) > 1 and not path[-1].is_last and not path[-1].children:
+            path.pop()
+            parent = path[-1]
+            del parent.children[word[len(path) - 1]]
+            if not parent.children:
+                parent.children = None
+
+    def _node_stats(self, root: TrieNode) -> (int, int, int):
+        # Number of nodes of the trie, how many of them lead to a word (the
+        # root always counts as one), and the bytes taken by the nodes and their
+        # children tables. Nodes are listed in breadth-first order, so walking
+        # the list backwards reaches every node after all of its children.
+        nodes = [root]
+        parents = [-1]
+        size = 0
+        for index, node in enumerate(nodes):
+            size += sys.getsizeof(node)
+            if node.children is not None:
+                size += sys.getsizeof(node.children)
+                nodes.extend(node.children.values())
+                parents.extend([index] * len(node.children))
+
+        live = [node.is_last for node in nodes]
+        live[0] = True
+        for index in range(len(nodes) - 1, 0, -1):
+            if live[index]:
+                live[parents[index]] = True
+        return len(nodes), sum(live), size
 
     def _traverse_word(self, word: str) -> TrieNode:
         # Starting from the root
@@ -141,20 +418,142 @@ class TrieDictionary(BaseDictionary):
 
         # traverse the trie based on the letters in the word 
         for letter in word:
-            if letter not in current.children:
+            if not current.children or letter not in current.children:
                 return None
             current = current.children[letter]
 
         return current
 
-    def _collect_autocomplete_words(self, node: TrieNode, word_prefix: str, result_list: list):
-        # Base case: Append the word to the result list if facing a node is marked as
-        # the last node in a word
-        if node.is_last:
-            result_list.append(WordFrequency(word_prefix, node.frequency))
-
-        # Recursive calls: traverse along all the children of the prefix node to find
-        # all the words starting with that prefix
-        for letter, child_node in node.children.items():
-            self._collect_autocomplete_words(
-                child_node, word_prefix + letter, result_list)
+    def _traverse_many(self, words: [str]):
+        # Node reached by each distinct word (None if there is none), walking
+        # the words in sorted order so that each one starts from the nodes of
+        # the prefix it shares with the previous one instead of from the root
+        path = [self.root]
+        previous = ''
+        for word in sorted(set(words)):
+            common = 0
+            limit = min(len(word), len(previous), len(path) - 1)
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            del path[common + 1:]
+
+            current = path[-1]
+            for letter in word[common:]:
+                if not current.children or letter not in current.children:
+                    current = None
+                    break
+                current = current.children[letter]
+                path.append(current)
+
+            yield word, current
+            previous = word
+
+    def _iter_words(self):
+        # Every word with its frequency, in depth-first order (a node before its
+        # children, children in insertion order)
+        stack = [(self.root, '')]
+        while stack:
+            node, word_prefix = stack.pop()
+            if node.is_last:
+                yield WordFrequency(word_prefix, node.frequency)
+            if node.children:
+                for letter, child_node in reversed(node.children.items()):
+                    stack.append((child_node, word_prefix + letter))
+
+    def _build_from_preorder(self, words_frequencies: [WordFrequency]) -> TrieNode:
+        # Build a new trie from words listed in depth-first order, such as sorted
+        # words, and return its root. The nodes along the previous word are kept
+        # on a stack, so each word only creates the nodes past the prefix it
+        # shares with the previous one; nodes popped off the stack are complete.
+        root = self.node_class()
+        path = [root]
+        previous = ''
+
+        for word_freq in words_frequencies:
+            word = word_freq.word
+            common = 0
+            limit = min(len(word), len(previous))
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            self._close_path(path, previous, common)
+
+            current = path[-1]
+            for letter in word[common:]:
+                child_node = self.node_class()
+                if current.children is None:
+                    current.children = {}
+                current.children[letter] = child_node
+                path.append(child_node)
+                current = child_node
+
+            current.is_last = True
+            current.frequency = word_freq.frequency
+            current.max_frequency = word_freq.frequency
+            previous = word
+
+        self._close_path(path, previous, -1)
+        return root
+
+    def _close_path(self, path: [TrieNode], word: str, depth: int):
+        # Pop the nodes deeper than 'depth' off the stack built along 'word',
+        # passing each one's bound on to its parent
+        while len(path) > depth + 1:
+            node = path.pop()
+            if self._finish_node:
+                self._finish_node(node, word[:len(path)])
+            if path and node.max_frequency > path[-1].max_frequency:
+                path[-1].max_frequency = node.max_frequency
+
+
+# Type-ahead session over a trie. It keeps the node reached by each prefix
+# typed so far, so typing a letter is one child lookup from the last node and
+# backspace pops the stack, instead of walking the whole prefix from the root.
+class TrieSession:
+
+    def __init__(self, dictionary: TrieDictionary):
+        self.dictionary = dictionary
+        self.prefix = ''
+        self.nodes = [dictionary.root]      # node reached by each prefix of 'prefix', None once no word matches
+        self.version = dictionary.version
+
+    def append(self, letters: str):
+        """
+        type one or more letters at the end of the prefix
+        @param letters: letters typed
+        """
+        if self.version != self.dictionary.version:
+            self._sync()
+        node = self.nodes[-1]
+        for letter in letters:
+            if node is not None:
+                node = node.children.get(letter) if node.children else None
+            self.nodes.append(node)
+        self.prefix += letters
+
+    def backspace(self, count: int = 1):
+        """
+        remove letters from the end of the prefix
+        @param count: number of letters to remove, at most the length of the prefix
+        """
+        count = min(count, len(self.prefix))
+        if count:
+            del self.nodes[-count:]
+            self.prefix = self.prefix[:-count]
+
+    def autocomplete(self, k: int = 3) -> [WordFrequency]:
+        """
+        return a list of k (3 by default) most-frequent words in the dictionary that have the typed prefix
+        @param k: maximum number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with the typed prefix
+        """
+        if self.version != self.dictionary.version:
+            self._sync()
+        return self.dictionary._complete(self.nodes[-1], self.prefix, k)
+
+    def _sync(self):
+        # Walk the prefix again, the trie changed since the nodes were found
+        prefix = self.prefix
+        self.prefix = ''
+        self.nodes = [self.dictionary.root]
+        self.version = self.dictionary.version
+        self.append(prefix)
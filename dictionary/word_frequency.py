@@ -6,6 +6,8 @@
 
 # Class representing a word and its frequency
 class WordFrequency:
+    __slots__ = ('word', 'frequency')
+
     def __init__(self, word: str, frequency: int):
         self.word = word
         self.frequency = frequency
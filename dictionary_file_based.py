@@ -1,9 +1,21 @@
+import operator
 import sys
+from itertools import compress
 from dictionary.word_frequency import WordFrequency
 from dictionary.base_dictionary import BaseDictionary
 from dictionary.array_dictionary import ArrayDictionary
+from dictionary.compact_array_dictionary import CompactArrayDictionary
+from dictionary.buffered_array_dictionary import BufferedArrayDictionary
 from dictionary.linkedlist_dictionary import LinkedListDictionary
 from dictionary.trie_dictionary import TrieDictionary
+from dictionary.topk_trie_dictionary import TopKTrieDictionary
+from dictionary.radix_trie_dictionary import RadixTrieDictionary
+from dictionary.dawg_dictionary import DawgDictionary
+from dictionary.skiplist_dictionary import SkipListDictionary
+from dictionary.cached_dictionary import CachedDictionary
+from dictionary.concurrent_trie_dictionary import ConcurrentTrieDictionary
+from dictionary.double_array_trie_dictionary import DoubleArrayTrieDictionary
+from dictionary.loader import load_columns, load_words_frequencies
 
 
 # -------------------------------------------------------------------
@@ -24,10 +36,245 @@ def usage():
     # On Teaching servers, use 'python3'
     # On Windows, you may need to use 'python' instead of 'python3'
     print('python3 dictionary_file_based.py', '<approach> <data fileName> <command fileName> <output fileName>')
-    print('<approach> = <array | linkedlist | trie>')
+    print('<approach> = <array | linkedlist | trie | topktrie | compactarray | radixtrie | dawg | skiplist | concurrenttrie | doublearray | bufferedarray>')
+    print('with dawg, <data fileName> can also be an index built by build_dawg_index.py')
+    print('prefix an approach with cached- (e.g. cached-trie) to cache its autocomplete results')
+    print('prefix array, linkedlist, trie or topktrie with indexed- (e.g. indexed-trie, cached-indexed-trie) '
+          'to answer searches from a hash index')
     sys.exit(1)
 
 
+# characters of the command file read at a time, and number of output lines
+# collected before they are written at once
+READ_SIZE = 1 << 20
+BLOCK_LINES = 1 << 13
+
+
+def answer_queries(agent: BaseDictionary, commands: [str], words: [str], output: [str]):
+    """
+    answer a run of consecutive S and AC commands with one search_many() and one autocomplete_many() call
+    @param agent: the dictionary
+    @param commands: 'S' or 'AC', for each command in command file order
+    @param words: the word of each command
+    @param output: list the answers are appended to, in the same order
+    """
+    is_search = list(map('S'.__eq__, commands))
+    searches = list(compress(words, is_search))
+    prefixes = list(compress(words, map(operator.not_, is_search)))
+
+    # search
+    search_lines = [f"Found '{word}' with frequency {frequency}\n" if frequency > 0 else f"NOT Found '{word}'\n"
+                    for word, frequency in zip(searches, agent.search_many(searches))]
+    # check
+    autocomplete_lines = list(map(autocomplete_line, prefixes, agent.autocomplete_many(prefixes)))
+
+    # Put the two kinds of answers back in command order
+    if not autocomplete_lines:
+        output += search_lines
+    elif not search_lines:
+        output += autocomplete_lines
+    else:
+        search_lines = iter(search_lines)
+        autocomplete_lines = iter(autocomplete_lines)
+        output += [next(search_lines) if search else next(autocomplete_lines) for search in is_search]
+
+
+def autocomplete_line(prefix_word: str, list_words: [WordFrequency]) -> str:
+    """
+    the output line of an AC command
+    """
+    # A full list of 3 words, the usual answer, fills one template
+    if len(list_words) == 3:
+        first, second, third = list_words
+        return (f"Autocomplete for '{prefix_word}': [ {first.word}: {first.frequency}  "
+                f"{second.word}: {second.frequency}  {third.word}: {third.frequency}  ]\n")
+    return f"Autocomplete for '{prefix_word}': [ " + ''.join([f"{item.word}: {item.frequency}  " for item in list_words]) + ']\n'
+
+
+def add_word(agent: BaseDictionary, command_values: [str]) -> str:
+    """
+    execute an A command
+    @return: its output line
+    """
+    word = command_values[1]
+    if not agent.add_word_frequency(WordFrequency(word, int(command_values[2]))):
+        return f"Add '{word}' failed\n"
+    return f"Add '{word}' succeeded\n"
+
+
+def delete_word(agent: BaseDictionary, command_values: [str]) -> str:
+    """
+    execute a D command
+    @return: its output line
+    """
+    word = command_values[1]
+    if not agent.delete_word(word):
+        return f"Delete '{word}' failed\n"
+    return f"Delete '{word}' succeeded\n"
+
+
+# command -> function executing it and returning its output line; None for
+# S and AC, which are answered in batches by answer_queries()
+COMMANDS = {
+    'S': None,
+    'AC': None,
+    'A': add_word,
+    'D': delete_word,
+}
+
+# command -> number of values on its line, the command included
+COMMAND_LENGTHS = {'S': 2, 'AC': 2, 'A': 3, 'D': 2}
+
+
+def read_blocks(command_file):
+    """
+    text of a command file, a large block of whole lines at a time
+    """
+    while True:
+        block = command_file.read(READ_SIZE)
+        if not block:
+            return
+        yield block + command_file.readline()
+
+
+def split_queries(block: str) -> ([str], [str]):
+    """
+    the commands and the words of a block made of S and AC commands only
+    @return: None if the block has any other line
+    """
+    # One split of the whole block; it is only used if putting the tokens back
+    # together, two per line, gives back exactly the lines of the block
+    tokens = block.split()
+    lines = block.splitlines()
+    if len(tokens) != 2 * len(lines):
+        return None
+    commands = tokens[0::2]
+    words = tokens[1::2]
+    if not {'S', 'AC'}.issuperset(commands) or list(map(' '.join, zip(commands, words))) != lines:
+        return None
+    return commands, words
+
+
+def make_agent(approach: str, data_filename: str) -> BaseDictionary:
+    """
+    create the dictionary of an approach and populate it from the data file
+    @param approach: one of the approaches listed by usage(), possibly prefixed with cached- and/or indexed-
+    @param data_filename: data file (or, with dawg, index) to initialise the words & frequencies
+    @return: the dictionary, None if approach is not known
+    """
+    agent: BaseDictionary = None
+    cached = approach.startswith('cached-')
+    if cached:
+        approach = approach[len('cached-'):]
+    # only the approaches below that take hash_index can keep a word index
+    indexed = approach.startswith('indexed-')
+    if indexed:
+        approach = approach[len('indexed-'):]
+    if approach == 'array':
+        agent = ArrayDictionary(hash_index=indexed)
+    elif approach == 'linkedlist':
+        agent = LinkedListDictionary(hash_index=indexed)
+    elif approach == 'trie':
+        agent = TrieDictionary(hash_index=indexed)
+    elif approach == 'topktrie':
+        agent = TopKTrieDictionary(hash_index=indexed)
+    elif indexed:
+        return None
+    elif approach == 'compactarray':
+        agent = CompactArrayDictionary()
+    elif approach == 'radixtrie':
+        agent = RadixTrieDictionary()
+    elif approach == 'dawg':
+        agent = DawgDictionary()
+    elif approach == 'skiplist':
+        agent = SkipListDictionary()
+    elif approach == 'concurrenttrie':
+        agent = ConcurrentTrieDictionary()
+    elif approach == 'doublearray':
+        agent = DoubleArrayTrieDictionary()
+    elif approach == 'bufferedarray':
+        agent = BufferedArrayDictionary()
+    else:
+        return None
+
+    # a compiled DAWG index is served as is, without parsing or building
+    if isinstance(agent, DawgDictionary) and DawgDictionary.is_index_file(data_filename):
+        agent.load(data_filename)
+    # the columnar array takes the parsed columns directly
+    elif isinstance(agent, CompactArrayDictionary):
+        agent.build_from_columns(*load_columns(data_filename))
+    else:
+        words_frequencies_from_file = load_words_frequencies(data_filename)
+        agent.build_dictionary(words_frequencies_from_file)
+
+    if cached:
+        agent = CachedDictionary(agent)
+    return agent
+
+
+def process_commands(agent: BaseDictionary, blocks, output_file, error_file=None):
+    """
+    execute commands, in order, writing their results
+    @param agent: the dictionary
+    @param blocks: command text, in blocks of whole lines (e.g. from read_blocks())
+    @param output_file: where the results are written
+    @param error_file: where unknown commands are reported, standard output by default
+    """
+    # S and AC commands do not change the dictionary, so a run of them is
+    # answered as one batch once the next A or D command (or the end) comes,
+    # or once BLOCK_LINES of them are waiting. Output lines are collected and
+    # written BLOCK_LINES at a time
+    output = []
+    query_commands = []
+    query_words = []
+
+    def answer_pending():
+        # Answer the queries collected so far, and write the output once there is enough of it
+        if query_commands:
+            answer_queries(agent, query_commands, query_words, output)
+            query_commands.clear()
+            query_words.clear()
+        if len(output) >= BLOCK_LINES:
+            output_file.write(''.join(output))
+            output.clear()
+
+    # If a command fails, the output of the commands before it is still written
+    try:
+        for block in blocks:
+            block_queries = split_queries(block)
+            if block_queries is not None:
+                query_commands += block_queries[0]
+                query_words += block_queries[1]
+                if len(query_commands) >= BLOCK_LINES:
+                    answer_pending()
+                continue
+
+            for line in block.splitlines():
+                command_values = line.split()
+                if not command_values:
+                    continue
+                command = command_values[0]
+                if command not in COMMANDS or len(command_values) < COMMAND_LENGTHS[command]:
+                    print('Unknown command.', file=error_file)
+                    print(line, file=error_file)
+                    continue
+
+                execute = COMMANDS[command]
+                if execute is None:
+                    query_commands.append(command)
+                    query_words.append(command_values[1])
+                    if len(query_commands) >= BLOCK_LINES:
+                        answer_pending()
+                    continue
+
+                answer_pending()
+                output.append(execute(agent, command_values))
+
+        answer_pending()
+    finally:
+        output_file.write(''.join(output))
+
+
 if __name__ == '__main__':
     # Fetch the command line arguments
     args = sys.argv
@@ -36,34 +283,15 @@ if __name__ == '__main__':
         print('Incorrect number of arguments.')
         usage()
 
-    # initialise search agent
-    agent: BaseDictionary = None
-    if args[1] == 'array':
-        agent = ArrayDictionary()
-    elif args[1] == 'linkedlist':
-        agent = LinkedListDictionary()
-    elif args[1] == 'trie':
-        agent = TrieDictionary()
-    else:
-        print('Incorrect argument value.')
-        usage()
-
-    # read from data file to populate the initial set of points
-    data_filename = args[2]
-    words_frequencies_from_file = []
+    # initialise search agent, and read from data file to populate the initial set of points
     try:
-        data_file = open(data_filename, 'r')
-        for line in data_file:
-            values = line.split()
-            word = values[0]
-            frequency = int(values[1])
-            word_frequency = WordFrequency(word, frequency)  # each line contains a word and its frequency
-            words_frequencies_from_file.append(word_frequency)
-        data_file.close()
-        agent.build_dictionary(words_frequencies_from_file)
+        agent = make_agent(args[1], args[2])
     except FileNotFoundError as e:
         print("Data file doesn't exist.")
         usage()
+    if agent is None:
+        print('Incorrect argument value.')
+        usage()
 
     command_filename = args[3]
     output_filename = args[4]
@@ -71,50 +299,7 @@ if __name__ == '__main__':
     try:
         command_file = open(command_filename, 'r')
         output_file = open(output_filename, 'w')
-
-        for line in command_file:
-            command_values = line.split()
-            command = command_values[0]
-            # search
-            if command == 'S':
-                word = command_values[1]
-                search_result = agent.search(word)
-                if search_result > 0:
-                    output_file.write(f"Found '{word}' with frequency {search_result}\n")
-                else:
-                    output_file.write(f"NOT Found '{word}'\n")
-
-            # add
-            elif command == 'A':
-                word = command_values[1]
-                frequency = int(command_values[2])
-                word_frequency = WordFrequency(word, frequency)
-                if not agent.add_word_frequency(word_frequency):
-                    output_file.write(f"Add '{word}' failed\n")
-                else:
-                    output_file.write(f"Add '{word}' succeeded\n")
-
-            # delete
-            elif command == 'D':
-                word = command_values[1]
-                if not agent.delete_word(word):
-                    output_file.write(f"Delete '{word}' failed\n")
-                else:
-                    output_file.write(f"Delete '{word}' succeeded\n")
-
-            # check
-            elif command == 'AC':
-                word = command_values[1]
-                list_words = agent.autocomplete(word)
-                line = "Autocomplete for '" + word + "': [ "
-                for item in list_words:
-                    line = line + item.word + ": " + str(item.frequency) + "  "
-                output_file.write(line + ']\n')
-
-            else:
-                print('Unknown command.')
-                print(line)
-
+        process_commands(agent, read_blocks(command_file), output_file)
         output_file.close()
         command_file.close()
     except FileNotFoundError as e:
@@ -0,0 +1,386 @@
+import bisect
+import heapq
+import os
+import selectors
+import signal
+import socket
+import sys
+from multiprocessing import Pipe, Process
+from dictionary.word_frequency import WordFrequency
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.array_dictionary import ArrayDictionary
+from dictionary.trie_dictionary import TrieDictionary
+from dictionary.loader import load_words_frequencies
+
+
+# -------------------------------------------------------------------
+# Sharded dictionary server.
+#
+# The words are split into contiguous alphabetical ranges, one per worker
+# process, each holding its range in its own dictionary. Clients connect
+# to a Unix domain socket and send the command language of the command
+# files (S/A/D/AC, one per line), as many as they like without waiting:
+# every command gets exactly the line dictionary_file_based.py would
+# write for it, in the order the commands were sent.
+#
+# The main process routes commands and does no dictionary work. On each
+# round it takes every complete line from every client, sends each worker
+# its share as one batch, so that the workers run in parallel, and
+# collects the answers. A word belongs to exactly one shard; a prefix can
+# span several, whose top-k lists are merged.
+# -------------------------------------------------------------------
+
+APPROACHES = {
+    'trie': TrieDictionary,
+    'array': ArrayDictionary,
+}
+
+# number of completions returned by AC, as in file-based mode
+AUTOCOMPLETE_K = 3
+
+# bytes of unsent responses after which a client's commands are no longer read
+MAX_PENDING_OUTPUT = 1 << 20
+
+
+def usage():
+    """
+    Print help/usage message.
+    """
+    print('python3 dictionary_server.py', '<approach> <data fileName> <socket path> [number of workers]')
+    print('<approach> = <' + ' | '.join(APPROACHES) + '>')
+    sys.exit(1)
+
+
+class ShardMap:
+    """
+    which shard holds a word: shard i holds the words w with bounds[i - 1] <= w < bounds[i]
+    """
+
+    def __init__(self, bounds: [str]):
+        self.bounds = bounds
+
+    @classmethod
+    def split(cls, sorted_words: [str], num_shards: int) -> 'ShardMap':
+        """
+        bounds cutting sorted words into num_shards ranges of (nearly) equal size
+        """
+        size = len(sorted_words)
+        bounds = []
+        for shard in range(1, num_shards):
+            bound = sorted_words[shard * size // num_shards] if size else ''
+            if not bounds or bound > bounds[-1]:
+                bounds.append(bound)
+        return cls(bounds)
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.bounds) + 1
+
+    def shard_of(self, word: str) -> int:
+        return bisect.bisect_right(self.bounds, word)
+
+    def shards_of_prefix(self, prefix_word: str) -> range:
+        """
+        shards that can hold words starting with prefix_word, a contiguous run
+        """
+        successor = prefix_successor(prefix_word)
+        last = self.num_shards - 1 if successor is None else bisect.bisect_left(self.bounds, successor)
+        return range(self.shard_of(prefix_word), last + 1)
+
+
+def prefix_successor(prefix_word: str) -> str:
+    """
+    smallest string greater than every word starting with prefix_word, None if there is none
+    """
+    successor = prefix_word
+    while successor and successor[-1] == chr(sys.maxunicode):
+        successor = successor[:-1]
+    if not successor:
+        return None
+    return successor[:-1] + chr(ord(successor[-1]) + 1)
+
+
+def run_batch(agent: BaseDictionary, batch: [tuple]) -> list:
+    """
+    execute commands in order; runs of S and AC go through search_many() and autocomplete_many()
+    @param batch: list of ('S', word), ('A', word, frequency), ('D', word) or ('AC', word)
+    @return: per command, the frequency found, whether it succeeded, or the list of (word, frequency) completions
+    """
+    results = [None] * len(batch)
+    searches = []
+    completions = []
+
+    def answer_queries():
+        for (index, word), frequency in zip(searches, agent.search_many([word for _, word in searches])):
+            results[index] = frequency
+        for (index, word), autocomplete_list in zip(completions, agent.autocomplete_many(
+                [word for _, word in completions], AUTOCOMPLETE_K)):
+            results[index] = [(item.word, item.frequency) for item in autocomplete_list]
+        searches.clear()
+        completions.clear()
+
+    for index, command in enumerate(batch):
+        if command[0] == 'S':
+            searches.append((index, command[1]))
+        elif command[0] == 'AC':
+            completions.append((index, command[1]))
+        else:
+            answer_queries()
+            if command[0] == 'A':
+                results[index] = agent.add_word_frequency(WordFrequency(command[1], command[2]))
+            else:
+                results[index] = agent.delete_word(command[1])
+    answer_queries()
+    return results
+
+
+def serve_shard(approach: str, words_frequencies: [WordFrequency], connection):
+    """
+    worker process: build one shard, then execute the batches sent by the router until it sends None
+    """
+    agent = APPROACHES[approach]()
+    agent.build_dictionary(words_frequencies)
+    while True:
+        batch = connection.recv()
+        if batch is None:
+            break
+        connection.send(run_batch(agent, batch))
+    connection.close()
+
+
+def parse_command(line: str) -> tuple:
+    """
+    a command line as a tuple for run_batch(), None if it is not a valid command
+    """
+    command_values = line.split()
+    if len(command_values) == 2 and command_values[0] in ('S', 'D', 'AC'):
+        return command_values[0], command_values[1]
+    if len(command_values) == 3 and command_values[0] == 'A' and command_values[2].isdecimal():
+        return 'A', command_values[1], int(command_values[2])
+    return None
+
+
+def format_response(command: tuple, result) -> str:
+    """
+    the output line of a command, as written by dictionary_file_based.py
+    """
+    word = command[1]
+    if command[0] == 'S':
+        if result > 0:
+            return f"Found '{word}' with frequency {result}\n"
+        return f"NOT Found '{word}'\n"
+    if command[0] == 'A':
+        return f"Add '{word}' succeeded\n" if result else f"Add '{word}' failed\n"
+    if command[0] == 'D':
+        return f"Delete '{word}' succeeded\n" if result else f"Delete '{word}' failed\n"
+    return "Autocomplete for '" + word + "': [ " + ''.join(f"{w}: {f}  " for w, f in result) + ']\n'
+
+
+class ShardedServer:
+
+    def __init__(self, approach: str, words_frequencies: [WordFrequency], num_workers: int):
+        """
+        split the words and start one worker process per shard
+        """
+        words_frequencies = sorted(words_frequencies, key=lambda wf: wf.word)
+        self.shard_map = ShardMap.split([wf.word for wf in words_frequencies], num_workers)
+
+        shards = [[] for _ in range(self.shard_map.num_shards)]
+        for word_freq in words_frequencies:
+            shards[self.shard_map.shard_of(word_freq.word)].append(word_freq)
+
+        self.connections = []
+        self.workers = []
+        for shard in shards:
+            router_end, worker_end = Pipe()
+            worker = Process(target=serve_shard, args=(approach, shard, worker_end), daemon=True)
+            worker.start()
+            worker_end.close()
+            self.connections.append(router_end)
+            self.workers.append(worker)
+
+    def execute(self, lines: [str]) -> [str]:
+        """
+        run command lines, in order, on the shards
+        @param lines: command lines
+        @return: the output line of each command line
+        """
+        # Each shard gets its commands in their original order, which is all the
+        # ordering that matters: commands on different shards touch different words
+        batches = [[] for _ in self.connections]
+        commands = []
+        for line in lines:
+            command = parse_command(line)
+            commands.append(command)
+            if command is None:
+                continue
+            if command[0] == 'AC':
+                shards = self.shard_map.shards_of_prefix(command[1])
+            else:
+                shards = (self.shard_map.shard_of(command[1]),)
+            for shard in shards:
+                batches[shard].append(command)
+
+        # All workers run at once, then the answers are read back in the same order
+        for connection, batch in zip(self.connections, batches):
+            if batch:
+                connection.send(batch)
+        answers = [iter(connection.recv()) if batch else None
+                   for connection, batch in zip(self.connections, batches)]
+
+        responses = []
+        for line, command in zip(lines, commands):
+            if command is None:
+                responses.append(f"Unknown command '{line.strip()}'\n")
+            elif command[0] == 'AC':
+                # Shards are in word order and each list is best first, so a stable
+                # merge by frequency keeps ties in the order a single dictionary gives
+                shard_lists = [next(answers[shard]) for shard in self.shard_map.shards_of_prefix(command[1])]
+                merged = heapq.merge(*shard_lists, key=lambda item: -item[1])
+                responses.append(format_response(command, [item for _, item in zip(range(AUTOCOMPLETE_K), merged)]))
+            else:
+                responses.append(format_response(command, next(answers[self.shard_map.shard_of(command[1])])))
+        return responses
+
+    def serve(self, socket_path: str):
+        """
+        accept clients on a Unix domain socket until interrupted
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen()
+        listener.setblocking(False)
+
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ)
+        # client socket -> [bytes received after the last complete line, bytes waiting to be sent]
+        buffers = {}
+
+        try:
+            while True:
+                received = []
+                for key, events in selector.select():
+                    if key.fileobj is listener:
+                        client, _ = listener.accept()
+                        client.setblocking(False)
+                        buffers[client] = [b'', b'']
+                        selector.register(client, selectors.EVENT_READ)
+                        continue
+
+                    client = key.fileobj
+                    if events & selectors.EVENT_WRITE:
+                        self._flush(selector, client, buffers)
+                        # the client may have gone away meanwhile
+                        if client not in buffers:
+                            continue
+                    if events & selectors.EVENT_READ:
+                        try:
+                            data = client.recv(1 << 16)
+                        except (BrokenPipeError, ConnectionResetError):
+                            data = b''
+                        if not data:
+                            self._close(selector, client, buffers)
+                            continue
+                        data = buffers[client][0] + data
+                        end = data.rfind(b'\n') + 1
+                        buffers[client][0] = data[end:]
+                        if end:
+                            received.append((client, self._decode_lines(data[:end])))
+
+                if not received:
+                    continue
+
+                # One round for the lines of every client that sent some; lines
+                # that are not UTF-8 stay bytes and are answered here
+                lines = [line for _, client_lines in received for line in client_lines
+                         if isinstance(line, str) and line.strip()]
+                responses = iter(self.execute(lines))
+                for client, client_lines in received:
+                    output = ''.join(next(responses) if isinstance(line, str) else
+                                     f"Unknown command '{line.decode(errors='replace').strip()}'\n"
+                                     for line in client_lines if line.strip())
+                    buffers[client][1] += output.encode()
+                    self._flush(selector, client, buffers)
+        finally:
+            selector.close()
+            listener.close()
+            os.unlink(socket_path)
+
+    def close(self):
+        """
+        stop the workers
+        """
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+
+    @staticmethod
+    def _decode_lines(data: bytes) -> list:
+        # The command lines of complete input as str, except those that are
+        # not valid UTF-8, which stay bytes
+        try:
+            return data.decode().splitlines()
+        except UnicodeDecodeError:
+            lines = []
+            for line in data.splitlines():
+                try:
+                    lines.extend(line.decode().splitlines())
+                except UnicodeDecodeError:
+                    lines.append(line)
+            return lines
+
+    def _flush(self, selector, client: socket.socket, buffers: dict):
+        # Send what the socket takes now, and wait for it to be writable if anything is left
+        pending = buffers[client][1]
+        if pending:
+            try:
+                sent = client.send(pending)
+            except BlockingIOError:
+                sent = 0
+            except (BrokenPipeError, ConnectionResetError):
+                self._close(selector, client, buffers)
+                return
+            pending = pending[sent:]
+            buffers[client][1] = pending
+
+        # A client that does not read its responses is not read from either
+        events = selectors.EVENT_READ if len(pending) < MAX_PENDING_OUTPUT else 0
+        if pending:
+            events |= selectors.EVENT_WRITE
+        selector.modify(client, events)
+
+    def _close(self, selector, client: socket.socket, buffers: dict):
+        # Forget a client that closed its end or whose connection broke, with whatever it had pending
+        selector.unregister(client)
+        client.close()
+        del buffers[client]
+
+
+if __name__ == '__main__':
+    # Fetch the command line arguments
+    args = sys.argv
+
+    if len(args) not in (4, 5) or args[1] not in APPROACHES:
+        usage()
+    num_workers = int(args[4]) if len(args) == 5 else os.cpu_count()
+
+    try:
+        words_frequencies_from_file = load_words_frequencies(args[2])
+    except FileNotFoundError as e:
+        print("Data file doesn't exist.")
+        usage()
+
+    server = ShardedServer(args[1], words_frequencies_from_file, num_workers)
+    print(f"serving {len(words_frequencies_from_file)} words on {args[3]} with {len(server.workers)} workers")
+    # Stop cleanly on kill as well as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve(args[3])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,209 @@
+import asyncio
+import io
+import os
+import stat
+import sys
+from dictionary.base_dictionary import BaseDictionary
+from dictionary_file_based import make_agent, process_commands
+
+
+# -------------------------------------------------------------------
+# This is the entry point to run the program on command streams.
+# It uses the data file to initialise the set of words & frequencies,
+# like dictionary_file_based.py, then serves any number of command
+# streams at once from one asyncio event loop: standard input, files or
+# named pipes, and TCP clients on localhost. The output of a stream is
+# exactly what dictionary_file_based.py writes for the same commands
+# (while no other stream changes the words it looks at: all streams
+# share the one dictionary).
+#
+# Commands are taken as they arrive, a block at a time, and each block
+# is executed as a batch through process_commands(). The next block of a
+# stream is only read once its output has been taken by the consumer, so
+# a slow consumer holds back its own stream and nothing else.
+# -------------------------------------------------------------------
+
+# bytes of commands read from a stream at a time
+READ_SIZE = 1 << 16
+
+
+def usage():
+    """
+    Print help/usage message.
+    """
+    print('python3 dictionary_stream_based.py', '<approach> <data fileName> <stream> [<stream> ...]')
+    print('<approach> = any approach of dictionary_file_based.py')
+    print('<stream> = - (standard input to standard output)')
+    print('         | <command fileName>:<output fileName> (files or named pipes)')
+    print('         | <port> (each TCP client on localhost:<port> is a stream)')
+    sys.exit(1)
+
+
+class FileReader:
+    """
+    the StreamReader method used here, for a regular file, which is always ready
+    """
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    async def read(self, n: int) -> bytes:
+        return os.read(self.fd, n)
+
+
+class FileWriter:
+    """
+    the StreamWriter methods used here, for a regular file, which is always ready
+    """
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    def write(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+async def open_reader(fd: int):
+    """
+    reader for a file descriptor: pipes, terminals and sockets go through the event loop
+    """
+    if stat.S_ISREG(os.fstat(fd).st_mode):
+        return FileReader(fd)
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=READ_SIZE)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, 'rb', 0))
+    return reader
+
+
+async def open_writer(fd: int):
+    """
+    writer for a file descriptor: pipes, terminals and sockets go through the event loop
+    """
+    if stat.S_ISREG(os.fstat(fd).st_mode):
+        return FileWriter(fd)
+    loop = asyncio.get_running_loop()
+    # The protocol of a stream pair also does the flow control drain() waits on;
+    # its reader is never read, nothing comes back through a write pipe
+    reader = asyncio.StreamReader()
+    transport, protocol = await loop.connect_write_pipe(lambda: asyncio.StreamReaderProtocol(reader),
+                                                        os.fdopen(fd, 'wb', 0))
+    return asyncio.StreamWriter(transport, protocol, reader, loop)
+
+
+async def close_writer(writer):
+    # Wait for the consumer to take everything written, then close
+    if isinstance(writer, asyncio.StreamWriter):
+        writer.transport.set_write_buffer_limits(0)
+        await writer.drain()
+    writer.close()
+
+
+async def serve_stream(agent: BaseDictionary, reader, writer):
+    """
+    execute the commands of a stream until it ends, writing their results in order
+    @param agent: the dictionary
+    @param reader: where the commands come from
+    @param writer: where the results go
+    """
+    pending = b''
+    try:
+        while True:
+            data = await reader.read(READ_SIZE)
+            if data:
+                # Only complete lines are executed, the rest waits for more data
+                data = pending + data
+                end = data.rfind(b'\n') + 1
+                data, pending = data[:end], data[end:]
+            else:
+                # At the end, a last line without a newline is still a command
+                data, pending = pending, b''
+
+            if data:
+                output_file = io.StringIO()
+                failed = False
+                try:
+                    process_commands(agent, [data.decode(errors='replace')], output_file, sys.stderr)
+                except Exception as error:
+                    # A command that fails ends its own stream, after the output
+                    # of the commands before it; the other streams go on
+                    print('Stream stopped by a failed command:', repr(error), file=sys.stderr)
+                    failed = True
+                writer.write(output_file.getvalue().encode())
+                # This is the back-pressure: no more commands until the output is taken
+                await writer.drain()
+                if failed:
+                    break
+            elif not pending:
+                break
+        await close_writer(writer)
+    except (BrokenPipeError, ConnectionResetError):
+        # The consumer went away, there is no one left to answer
+        writer.close()
+
+
+async def serve(agent: BaseDictionary, streams: [str]):
+    """
+    serve all streams; returns when every one has ended, unless TCP clients are accepted
+    @param agent: the dictionary
+    @param streams: stream arguments, as described in usage()
+    """
+    tasks = []
+    servers = []
+    for stream in streams:
+        if stream == '-':
+            reader = await open_reader(sys.stdin.fileno())
+            writer = await open_writer(sys.stdout.fileno())
+        elif stream.isdigit():
+            servers.append(await asyncio.start_server(lambda reader, writer: serve_stream(agent, reader, writer),
+                                                      '127.0.0.1', int(stream), limit=READ_SIZE))
+            continue
+        else:
+            # Opening a named pipe waits for the other end, so it is done aside
+            command_filename, output_filename = stream.split(':', 1)
+            reader = await open_reader(await asyncio.to_thread(os.open, command_filename, os.O_RDONLY))
+            writer = await open_writer(await asyncio.to_thread(
+                os.open, output_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
+        tasks.append(asyncio.create_task(serve_stream(agent, reader, writer)))
+
+    await asyncio.gather(*tasks)
+    if servers:
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+
+
+if __name__ == '__main__':
+    # Fetch the command line arguments
+    args = sys.argv
+
+    if len(args) < 4:
+        print('Incorrect number of arguments.')
+        usage()
+    for stream in args[3:]:
+        if stream != '-' and not stream.isdigit() and ':' not in stream:
+            print('Incorrect stream argument:', stream)
+            usage()
+
+    # initialise search agent, and read from data file to populate the initial set of points
+    try:
+        agent = make_agent(args[1], args[2])
+    except FileNotFoundError as e:
+        print("Data file doesn't exist.")
+        usage()
+    if agent is None:
+        print('Incorrect argument value.')
+        usage()
+
+    try:
+        asyncio.run(serve(agent, args[3:]))
+    except FileNotFoundError as e:
+        print("Command file doesn't exist:", e.filename)
+        usage()
+    except KeyboardInterrupt:
+        pass
@@ -95,8 +95,14 @@ def main():
     lsInFile = remainArgs[3:]
 
     # check implementation
-    setValidImpl = set(["array", "linkedlist", "trie"])
-    if sImpl not in setValidImpl:
+    setValidImpl = set(["array", "linkedlist", "trie", "topktrie", "compactarray", "radixtrie", "dawg", "skiplist", "concurrenttrie", "doublearray", "bufferedarray"])
+    # any approach can be run behind the autocomplete cache
+    sBaseImpl = sImpl[len("cached-"):] if sImpl.startswith("cached-") else sImpl
+    # and the array, linked list and tries can keep a hash index for searches
+    setIndexedImpl = set(["array", "linkedlist", "trie", "topktrie"])
+    bIndexed = sBaseImpl.startswith("indexed-")
+    sBaseImpl = sBaseImpl[len("indexed-"):] if bIndexed else sBaseImpl
+    if sBaseImpl not in setValidImpl or (bIndexed and sBaseImpl not in setIndexedImpl):
         print(sImpl + " is not a valid implementation name.")
         sys.exit(1)
 
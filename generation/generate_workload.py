@@ -0,0 +1,243 @@
+import getopt
+import os
+import random
+import sys
+from collections import defaultdict
+from itertools import accumulate
+from dictionary.word_frequency import WordFrequency
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.loader import load_words_frequencies
+from dictionary_file_based import make_agent, process_commands, read_blocks
+
+# -------------------------------------------------------------------
+# Workload generator: writes a command file of any size against a data
+# file, and the matching .exp file, produced by running the commands on a
+# reference approach with the file-based command loop. The .exp file sits
+# next to the command file, as dictionary_test_script.py expects.
+#
+# Commands are drawn from a configurable mix:
+#   S        a word, popular ones more often, or (1 in 5) a word not there
+#   AC       a prefix: its length from the prefix length distribution,
+#            then a prefix of that length by Zipf popularity
+#   session  someone typing a word: AC on each prefix of a popular word,
+#            until the word is among the completions
+#   A        a new word (1 in 10: an existing one, which fails)
+#   D        an added word, or any word at all (1 in 10: a missing one)
+# Popularity follows Zipf's law over the ranks given by the dictionary
+# frequencies (for prefixes, the total frequency of their words): the
+# item of rank r is drawn with probability proportional to 1 / r^s.
+#
+# Approaches order completions of equal frequency differently, so AC
+# commands whose answer would depend on that are left out, which keeps
+# the .exp file right for every approach.
+#
+# Run from the repository root:
+#   python3 -m generation.generate_workload [-m mix] [-l prefix lengths] [-z exponent]
+#       [-s seed] [-r reference approach] <data fileName> <command fileName> <number of commands>
+# e.g. -m S=25,AC=40,session=20,A=10,D=5 -l 1=10,2=20,3=25,4=20,5=12,6=8,7=5
+# -------------------------------------------------------------------
+
+DEFAULT_MIX = {'S': 25, 'AC': 40, 'session': 20, 'A': 10, 'D': 5}
+DEFAULT_PREFIX_LENGTHS = {1: 10, 2: 20, 3: 25, 4: 20, 5: 12, 6: 8, 7: 5}
+DEFAULT_EXPONENT = 1.0
+
+# number of completions returned by AC, as in file-based mode
+AUTOCOMPLETE_K = 3
+
+# attempts at drawing an AC prefix with an unambiguous answer
+MAX_ATTEMPTS = 20
+
+# draws in a row that give no command line at all before generation gives up
+MAX_EMPTY_DRAWS = 1000
+
+
+class ZipfSampler:
+    """
+    draws items ranked by popularity, the item of rank r with probability proportional to 1 / r^exponent
+    """
+
+    def __init__(self, ranked_items: list, exponent: float, rng: random.Random):
+        self.items = ranked_items
+        self.cum_weights = list(accumulate(rank ** -exponent for rank in range(1, len(ranked_items) + 1)))
+        self.rng = rng
+
+    def sample(self):
+        return self.rng.choices(self.items, cum_weights=self.cum_weights)[0]
+
+
+class WorkloadGenerator:
+
+    def __init__(self, words_frequencies: [WordFrequency], model: BaseDictionary, mix: dict, prefix_lengths: dict,
+                 exponent: float, seed: int = 0):
+        """
+        @param words_frequencies: the words of the data file
+        @param model: a dictionary built from the same words, kept up to date with the generated A and D commands
+        @param mix: command kind -> weight
+        @param prefix_lengths: prefix length -> weight
+        @param exponent: exponent of the Zipf distributions
+        """
+        self.model = model
+        self.rng = random.Random(seed)
+        self.mix = mix
+        self.prefix_lengths = prefix_lengths
+
+        ranked = sorted(words_frequencies, key=lambda wf: -wf.frequency)
+        self.frequencies = [word_freq.frequency for word_freq in ranked]
+        self.words = ZipfSampler([word_freq.word for word_freq in ranked], exponent, self.rng)
+
+        # Prefixes of each length, ranked by the total frequency of their words
+        self.prefixes = {}
+        for length in prefix_lengths:
+            totals = defaultdict(int)
+            for word_freq in ranked:
+                if len(word_freq.word) >= length:
+                    totals[word_freq.word[:length]] += word_freq.frequency
+            self.prefixes[length] = ZipfSampler(sorted(totals, key=totals.get, reverse=True), exponent, self.rng)
+
+        # words added by the workload, which deletes go after first
+        self.added = []
+
+        # command kind -> method returning its command lines
+        self.commands = {
+            'S': self.search,
+            'AC': self.autocomplete,
+            'session': self.session,
+            'A': self.add,
+            'D': self.delete,
+        }
+
+    def generate(self, count: int):
+        """
+        command lines, count of them
+        @raise ValueError: when the mix keeps drawing commands left out for being ambiguous
+        """
+        kinds = list(self.mix)
+        weights = list(self.mix.values())
+        empty_draws = 0
+        while count > 0:
+            lines = self.commands[self.rng.choices(kinds, weights)[0]]()[:count]
+            # AC and session commands are all left out when ties decide their answers
+            empty_draws = 0 if lines else empty_draws + 1
+            if empty_draws == MAX_EMPTY_DRAWS:
+                raise ValueError(f"no command in {MAX_EMPTY_DRAWS} draws, the AC answers of this mix and "
+                                 "data file are decided by ties")
+            for line in lines:
+                yield line
+                count -= 1
+
+    def search(self) -> [str]:
+        word = self.words.sample()
+        if self.rng.random() < 0.2:
+            word = self._new_word(word)
+        return [f"S {word}\n"]
+
+    def autocomplete(self) -> [str]:
+        lengths = list(self.prefix_lengths)
+        weights = list(self.prefix_lengths.values())
+        for _ in range(MAX_ATTEMPTS):
+            prefix_word = self.prefixes[self.rng.choices(lengths, weights)[0]].sample()
+            if self._unambiguous(self.model.autocomplete(prefix_word, AUTOCOMPLETE_K + 1)):
+                return [f"AC {prefix_word}\n"]
+        return []
+
+    def session(self) -> [str]:
+        word = self.words.sample()
+        lines = []
+        for end in range(1, len(word) + 1):
+            prefix_word = word[:end]
+            autocomplete_list = self.model.autocomplete(prefix_word, AUTOCOMPLETE_K + 1)
+            if self._unambiguous(autocomplete_list):
+                lines.append(f"AC {prefix_word}\n")
+            if any(item.word == word for item in autocomplete_list[:AUTOCOMPLETE_K]):
+                break
+        return lines
+
+    def add(self) -> [str]:
+        word = self.words.sample()
+        if self.rng.random() >= 0.1:
+            word = self._new_word(word)
+        frequency = self.rng.choice(self.frequencies)
+        if self.model.add_word_frequency(WordFrequency(word, frequency)):
+            self.added.append(word)
+        return [f"A {word} {frequency}\n"]
+
+    def delete(self) -> [str]:
+        if self.added and self.rng.random() < 0.5:
+            word = self.added.pop(self.rng.randrange(len(self.added)))
+        else:
+            word = self.rng.choice(self.words.items)
+            if self.rng.random() < 0.1:
+                word = self._new_word(word)
+        self.model.delete_word(word)
+        return [f"D {word}\n"]
+
+    def _new_word(self, word: str) -> str:
+        # A word near an existing one that is not in the dictionary now
+        word += ''.join(self.rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(self.rng.randint(1, 3)))
+        while self.model.search(word):
+            word += self.rng.choice('abcdefghijklmnopqrstuvwxyz')
+        return word
+
+    def _unambiguous(self, autocomplete_list: [WordFrequency]) -> bool:
+        # Whether every approach gives the same answer to an AC command, from its
+        # k + 1 best completions: no equal frequencies among those that decide the top k
+        return all(a.frequency != b.frequency for a, b in zip(autocomplete_list, autocomplete_list[1:]))
+
+
+def parse_weights(argument: str, key_type=str) -> dict:
+    """
+    'key=weight,key=weight' as a dict
+    """
+    weights = {}
+    for item in argument.split(','):
+        key, weight = item.split('=')
+        weights[key_type(key)] = float(weight)
+    return weights
+
+
+def usage():
+    print('python3 -m generation.generate_workload', '[-m mix] [-l prefix lengths] [-z exponent] [-s seed] '
+          '[-r reference approach] <data fileName> <command fileName> <number of commands>')
+    print('<mix> = comma-separated kind=weight, kinds S, AC, session, A and D (default ' +
+          ','.join(f"{kind}={weight}" for kind, weight in DEFAULT_MIX.items()) + ')')
+    print('<prefix lengths> = comma-separated length=weight (default ' +
+          ','.join(f"{length}={weight}" for length, weight in DEFAULT_PREFIX_LENGTHS.items()) + ')')
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    try:
+        options, arguments = getopt.gnu_getopt(sys.argv[1:], 'm:l:z:s:r:')
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+    options = dict(options)
+    if len(arguments) != 3:
+        usage()
+    data_filename, command_filename, num_commands = arguments[0], arguments[1], int(arguments[2])
+
+    mix = parse_weights(options['-m']) if '-m' in options else DEFAULT_MIX
+    prefix_lengths = parse_weights(options['-l'], int) if '-l' in options else DEFAULT_PREFIX_LENGTHS
+    exponent = float(options.get('-z', DEFAULT_EXPONENT))
+    seed = int(options.get('-s', 0))
+    reference = options.get('-r', 'trie')
+    if any(kind not in DEFAULT_MIX for kind in mix):
+        usage()
+
+    model = make_agent(reference, data_filename)
+    if model is None:
+        print('Incorrect reference approach.')
+        usage()
+    generator = WorkloadGenerator(load_words_frequencies(data_filename), model, mix, prefix_lengths, exponent, seed)
+    try:
+        with open(command_filename, 'w') as command_file:
+            command_file.writelines(generator.generate(num_commands))
+    except ValueError as err:
+        print(err)
+        sys.exit(1)
+
+    # The expected output is what the file-based mode writes with the reference approach
+    expected_filename = os.path.splitext(command_filename)[0] + '.exp'
+    with open(command_filename, 'r') as command_file, open(expected_filename, 'w') as expected_file:
+        process_commands(make_agent(reference, data_filename), read_blocks(command_file), expected_file)
+    print(f"{num_commands} commands written to {command_filename}, expected output to {expected_filename}")
@@ -21,6 +21,62 @@ python3 dictionary_test_script.py -v ./ array data10k.txt test10k.in
 python3 dictionary_test_script.py -v ./ array data50k.txt test50k.in
 python3 dictionary_test_script.py -v ./ array data100k.txt test100k.in
 
+python3 dictionary_test_script.py -v ./ topktrie data500.txt test500.in
+python3 dictionary_test_script.py -v ./ topktrie data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ topktrie data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ topktrie data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ topktrie data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ topktrie data100k.txt test100k.in
+
+python3 dictionary_test_script.py -v ./ compactarray data500.txt test500.in
+python3 dictionary_test_script.py -v ./ compactarray data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ compactarray data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ compactarray data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ compactarray data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ compactarray data100k.txt test100k.in
+
+python3 dictionary_test_script.py -v ./ radixtrie data500.txt test500.in
+python3 dictionary_test_script.py -v ./ radixtrie data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ radixtrie data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ radixtrie data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ radixtrie data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ radixtrie data100k.txt test100k.in
+
+python3 dictionary_test_script.py -v ./ dawg data500.txt test500.in
+python3 dictionary_test_script.py -v ./ dawg data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ dawg data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ dawg data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ dawg data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ dawg data100k.txt test100k.in
+
+python3 dictionary_test_script.py -v ./ skiplist data500.txt test500.in
+python3 dictionary_test_script.py -v ./ skiplist data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ skiplist data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ skiplist data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ skiplist data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ skiplist data100k.txt test100k.in
+
+python3 dictionary_test_script.py -v ./ concurrenttrie data500.txt test500.in
+python3 dictionary_test_script.py -v ./ concurrenttrie data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ concurrenttrie data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ concurrenttrie data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ concurrenttrie data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ concurrenttrie data100k.txt test100k.in
+
+python3 dictionary_test_script.py -v ./ doublearray data500.txt test500.in
+python3 dictionary_test_script.py -v ./ doublearray data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ doublearray data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ doublearray data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ doublearray data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ doublearray data100k.txt test100k.in
+
+python3 dictionary_test_script.py -v ./ bufferedarray data500.txt test500.in
+python3 dictionary_test_script.py -v ./ bufferedarray data1k.txt test1k.in
+python3 dictionary_test_script.py -v ./ bufferedarray data5k.txt test5k.in
+python3 dictionary_test_script.py -v ./ bufferedarray data10k.txt test10k.in
+python3 dictionary_test_script.py -v ./ bufferedarray data50k.txt test50k.in
+python3 dictionary_test_script.py -v ./ bufferedarray data100k.txt test100k.in
+
 # default tests
 python3 dictionary_test_script.py -v ./ linkedlist sampleData.txt test1.in test2.in
 python3 dictionary_test_script.py -v ./ linkedlist sampleDataToy.txt testToy.in
@@ -29,4 +85,43 @@ python3 dictionary_test_script.py -v ./ trie sampleData.txt test1.in test2.in
 python3 dictionary_test_script.py -v ./ trie sampleDataToy.txt testToy.in
 
 python3 dictionary_test_script.py -v ./ array sampleData.txt test1.in test2.in
-python3 dictionary_test_script.py -v ./ array sampleDataToy.txt testToy.in
\ No newline at end of file
+python3 dictionary_test_script.py -v ./ array sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ topktrie sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ topktrie sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ compactarray sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ compactarray sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ radixtrie sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ radixtrie sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ dawg sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ dawg sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ skiplist sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ skiplist sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ cached-trie sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ cached-trie sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ cached-array sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ cached-array sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ indexed-array sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ indexed-array sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ indexed-linkedlist sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ indexed-linkedlist sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ cached-indexed-trie sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ cached-indexed-trie sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ concurrenttrie sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ concurrenttrie sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ doublearray sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ doublearray sampleDataToy.txt testToy.in
+
+python3 dictionary_test_script.py -v ./ bufferedarray sampleData.txt test1.in test2.in
+python3 dictionary_test_script.py -v ./ bufferedarray sampleDataToy.txt testToy.in